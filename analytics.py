@@ -0,0 +1,762 @@
+"""Headless analytics engine for the ODI dashboards.
+
+Every query takes a loaded :class:`DatasetBundle` plus plain parameters and
+returns a compact result table, with no Streamlit calls.  Results are memoised
+per (dataset version, parameters), so ``app.py``, ``visuals.py`` and batch jobs
+can all call the same functions cheaply.  Returned frames are shared between
+callers and must be treated as read-only.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import results
+import streaming
+
+# --- Dataset files ---
+DATA_FILES = {
+    'bowling': 'bowling_clean.csv',
+    'fow': 'fow_clean.csv',
+    'partnership': 'partnership_clean.csv',
+    'player_info': 'player_info_clean.csv',
+    'matches': 'cleaned_odi_match_summary.csv',
+    'match_dates': 'cleaned_odi_match_summary.csv',
+    'players': 'cleaned_odi_player_summary.csv',
+    'bowling_summary': 'Final_bowling_summary_final.csv',
+}
+APP_TABLES = ('bowling', 'fow', 'partnership', 'player_info', 'players', 'bowling_summary', 'match_dates')
+MATCH_TABLES = ('matches', 'player_info')
+
+# Columns each table is projected to on load (None keeps every column) and
+# row filters applied chunk by chunk while streaming
+TABLE_COLUMNS = {
+    'bowling': ['Match ID', 'team', 'opposition', 'bowler id', 'overs', 'conceded', 'wickets', 'economy'],
+    'fow': ['Match ID', 'innings', 'team', 'player', 'wicket', 'over', 'runs'],
+    'partnership': ['Match ID', 'team', 'player1', 'player2', 'partnership runs', 'partnership balls', 'for wicket'],
+    'player_info': ['player_id', 'player_name', 'batting_style', 'bowling_style'],
+    'matches': None,
+    'match_dates': ['Match ID', 'Match Date'],
+    'players': ['player_name', 'innings_batted', 'runs', 'balls', 'strike_rate', 'bat_avg', 'wickets', 'runs_conceded', 'overs'],
+    'bowling_summary': ['player_name', 'total_runs', 'total_overs', 'wickets'],
+}
+TABLE_FILTERS = {
+    # Some exported bowling rows carry ids in the team columns
+    'bowling': (streaming.non_numeric('team'), streaming.non_numeric('opposition')),
+}
+VERSION_FILE = 'DATASET_VERSION'
+# Aggregates maintained by ingest.py: a snapshot plus one delta line per ingested match
+AGGREGATES_FILE = 'aggregates.json'
+DELTA_LOG_FILE = 'aggregates.log.jsonl'
+AGGREGATE_SECTIONS = ('players', 'teams', 'pairs', 'phases', 'h2h')
+
+# --- Match phases (name, first over, last over) ---
+DEATH_OVERS_PHASES = (
+    ('Powerplay (1-10)', 1, 10),
+    ('Middle (11-40)', 11, 40),
+    ('Death (40-50)', 40, 50),
+)
+MATCH_PHASES = (
+    ('Powerplay (1-10)', 1, 10),
+    ('Middle Overs (11-40)', 11, 40),
+    ('Death Overs (41-50)', 41, 50),
+)
+
+MEMO_SIZE = 256
+WICKETS = 10
+
+
+@dataclass(frozen=True, eq=False)
+class DatasetBundle:
+    """The loaded, merged dashboard tables plus a version tag for caching."""
+    version: str
+    bowling: Optional[pd.DataFrame] = None
+    fow: Optional[pd.DataFrame] = None
+    partnership: Optional[pd.DataFrame] = None
+    player_info: Optional[pd.DataFrame] = None
+    matches: Optional[pd.DataFrame] = None
+    match_dates: Optional[pd.DataFrame] = None
+    players: Optional[pd.DataFrame] = None
+    bowling_summary: Optional[pd.DataFrame] = None
+    # Wickets and runs conceded per (team, opposition) from the maintained aggregates
+    h2h_totals: Optional[pd.DataFrame] = None
+
+
+def dataset_version(paths):
+    """Hash file names, sizes and modification times into a short version tag.
+
+    Missing files are skipped so the tag can be computed before loading.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def _table_paths(data_dir, tables):
+    paths = {name: os.path.join(data_dir, DATA_FILES[name]) for name in tables}
+    if 'bowling' in tables or 'fow' in tables or 'partnership' in tables:
+        paths.setdefault('player_info', os.path.join(data_dir, DATA_FILES['player_info']))
+    return paths
+
+
+def current_version(data_dir='.', tables=APP_TABLES):
+    """Version tag of the tables on disk, including the ingest counter file.
+
+    Cheap enough to call on every rerun, so dashboards can key their cached
+    bundle on it and pick up newly ingested matches.  Bundles with bowling
+    rows also hash the maintained aggregate files, which they read.
+    """
+    paths = list(_table_paths(data_dir, tables).values()) + [os.path.join(data_dir, VERSION_FILE)]
+    if 'bowling' in tables:
+        paths += [os.path.join(data_dir, AGGREGATES_FILE), os.path.join(data_dir, DELTA_LOG_FILE)]
+    return dataset_version(paths)
+
+
+# --- Maintained aggregates ---
+def apply_delta(aggregates, delta):
+    """Add ``delta`` into ``aggregates`` in place."""
+    for section in AGGREGATE_SECTIONS:
+        target = aggregates.setdefault(section, {})
+        for key, values in delta[section].items():
+            entry = target.setdefault(key, {})
+            for column, value in values.items():
+                entry[column] = entry.get(column, 0.0) + value
+    aggregates.setdefault('matches', []).extend(delta['matches'])
+    return aggregates
+
+
+def load_aggregates(data_dir='.'):
+    """Aggregate snapshot with every logged delta replayed on top."""
+    try:
+        with open(os.path.join(data_dir, AGGREGATES_FILE)) as fh:
+            aggregates = json.load(fh)
+    except FileNotFoundError:
+        aggregates = {}
+    log_path = os.path.join(data_dir, DELTA_LOG_FILE)
+    if os.path.exists(log_path):
+        with open(log_path) as fh:
+            for line in fh:
+                if line.strip():
+                    apply_delta(aggregates, json.loads(line))
+    return aggregates
+
+
+def _h2h_totals(data_dir, bowling, match_dates):
+    """The aggregates' (team, opposition) totals, or None unless they cover exactly these rows.
+
+    Aggregates left over from other tables (an ``etl.py`` rerun without
+    ``ingest.py --rebuild``) disagree on the matches or the wickets taken.
+    """
+    aggregates = load_aggregates(data_dir)
+    section = aggregates.get('h2h')
+    if not section or set(aggregates.get('matches', ())) != set(match_dates['Match ID'].dropna().astype(int)):
+        return None
+    sides = [key.split('|', 1) for key in section]
+    totals = pd.DataFrame({
+        'team': [team for team, _ in sides],
+        'opposition': [opposition for _, opposition in sides],
+        'wickets': [entry.get('wickets', 0.0) for entry in section.values()],
+        'conceded': [entry.get('conceded', 0.0) for entry in section.values()],
+    })
+    if totals['wickets'].sum() != bowling['wickets'].sum():
+        return None
+    return totals.astype({'wickets': bowling['wickets'].dtype, 'conceded': bowling['conceded'].dtype})
+
+
+def _attach_names(df, player_info, id_column, name_column):
+    names = player_info.drop_duplicates('player_id').set_index('player_id')['player_name']
+    df[name_column] = df[id_column].map(names)
+    return df
+
+
+def load_bundle(data_dir='.', tables=APP_TABLES):
+    """Read and merge the requested tables into a DatasetBundle.
+
+    Raises FileNotFoundError if any of the requested files are missing.
+    """
+    paths = _table_paths(data_dir, tables)
+    frames = {
+        name: streaming.read_csv(path, TABLE_COLUMNS[name], TABLE_FILTERS.get(name, ()))
+        for name, path in paths.items()
+    }
+
+    player_info = frames.get('player_info')
+    bowling = frames.get('bowling')
+    if bowling is not None:
+        bowling = _attach_names(bowling, player_info, 'bowler id', 'player_name')
+
+    partnership = frames.get('partnership')
+    if partnership is not None:
+        partnership = _attach_names(partnership, player_info, 'player1', 'player1_name')
+        partnership = _attach_names(partnership, player_info, 'player2', 'player2_name')
+
+    fow = frames.get('fow')
+    if fow is not None:
+        fow = _attach_names(fow, player_info, 'player', 'player_name')
+
+    matches = frames.get('matches')
+    if matches is not None:
+        matches['Match Date'] = pd.to_datetime(matches['Match Date'], errors='coerce')
+        matches['year'] = matches['Match Date'].dt.year
+        # Summaries built before the result columns existed are parsed on load
+        if 'result_type' not in matches:
+            matches = matches.join(results.parse_results(matches['Match Result Text']))
+        matches['result_type'] = pd.Categorical(matches['result_type'], categories=results.RESULT_TYPES)
+        if player_info is not None:
+            matches = _attach_names(matches, player_info, 'MOM Player', 'mom_name')
+
+    match_dates = frames.get('match_dates')
+    if match_dates is not None:
+        match_dates['Match Date'] = pd.to_datetime(match_dates['Match Date'], errors='coerce')
+
+    h2h_totals = None
+    if bowling is not None and match_dates is not None:
+        h2h_totals = _h2h_totals(data_dir, bowling, match_dates)
+
+    return DatasetBundle(
+        version=current_version(data_dir, tables),
+        bowling=bowling,
+        fow=fow,
+        partnership=partnership,
+        player_info=player_info,
+        matches=matches,
+        match_dates=match_dates,
+        players=frames.get('players'),
+        bowling_summary=frames.get('bowling_summary'),
+        h2h_totals=h2h_totals,
+    )
+
+
+# --- Memoisation ---
+def _freeze(value):
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def memoize(func):
+    """Cache results per (bundle version, arguments) in a bounded LRU."""
+    cache = OrderedDict()
+    lock = threading.Lock()
+
+    @wraps(func)
+    def wrapper(bundle, *args):
+        key = (bundle.version,) + _freeze(args)
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        result = func(bundle, *args)
+        with lock:
+            cache[key] = result
+            if len(cache) > MEMO_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    def prime(bundle, args, result):
+        """Seed the cache, e.g. with results restored from a snapshot."""
+        with lock:
+            cache[(bundle.version,) + _freeze(tuple(args))] = result
+
+    wrapper.cache_clear = cache.clear
+    wrapper.prime = prime
+    return wrapper
+
+
+# --- Incremental engines ---
+def match_digests(frame: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    """Per Match ID, one hash of ``columns`` over all of that match's rows.
+
+    Engines that extend a copy of their last build keep the digests of the
+    matches they applied; a corrected, added or removed row of an applied
+    match changes its digest.
+    """
+    rows = pd.util.hash_pandas_object(frame[list(columns)], index=False)
+    return rows.groupby(frame['Match ID'].to_numpy()).sum()
+
+
+def applied_unchanged(applied: Optional[pd.Series], digests: pd.Series) -> bool:
+    """Whether every match in ``applied`` is still in ``digests`` with the same rows.
+
+    Only then may an engine built from ``applied`` be extended with the
+    remaining matches; otherwise it has to be rebuilt from scratch.
+    """
+    if applied is None or not applied.index.isin(digests.index).all():
+        return False
+    return bool((digests.loc[applied.index].to_numpy() == applied.to_numpy()).all())
+
+
+# --- Overview ---
+@memoize
+def overview(bundle: DatasetBundle) -> dict:
+    """Headline counts shown in the sidebar."""
+    partnership = bundle.partnership
+    return {
+        'matches': int(bundle.bowling['Match ID'].nunique()),
+        'players': int(pd.concat([partnership['player1_name'], partnership['player2_name']]).nunique()),
+        'wickets': int(bundle.bowling['wickets'].sum()),
+    }
+
+
+# --- Players ---
+@memoize
+def bowler_list(bundle: DatasetBundle) -> list:
+    """Sorted names of every bowler with at least one wicket."""
+    total_wickets = bundle.bowling.groupby('player_name')['wickets'].sum()
+    return sorted(total_wickets[total_wickets > 0].index)
+
+
+@memoize
+def bowler_vs_opposition(bundle: DatasetBundle, bowler: str) -> pd.DataFrame:
+    """Wickets taken by ``bowler`` against each opposition."""
+    bowling = bundle.bowling
+    rows = bowling[bowling['player_name'] == bowler]
+    return rows.groupby('opposition')['wickets'].sum().reset_index()
+
+
+@memoize
+def bowler_economy(bundle: DatasetBundle, bowler: str) -> pd.DataFrame:
+    """Per-spell economy rates for ``bowler``."""
+    bowling = bundle.bowling
+    return bowling.loc[bowling['player_name'] == bowler, ['economy']].reset_index(drop=True)
+
+
+def batsman_list(bundle: DatasetBundle) -> list:
+    """Sorted names of every player seen in a partnership or dismissal."""
+    return dismissal_matrix(bundle).players
+
+
+def wicket_label(w_num):
+    w_num = int(w_num)
+    if w_num == 1: return "1st Wicket"
+    if w_num == 2: return "2nd Wicket"
+    if w_num == 3: return "3rd Wicket"
+    return f"{w_num}th Wicket"
+
+
+WICKET_LABELS = np.array([wicket_label(w) for w in range(1, WICKETS + 1)])
+
+
+@dataclass(frozen=True, eq=False)
+class DismissalMatrix:
+    """Dismissal counts by wicket number for every batsman.
+
+    ``counts[i, w - 1]`` is how often ``players[i]`` fell at wicket ``w``.
+    ``players`` is sorted and covers everyone in a partnership or dismissal,
+    so it doubles as the batsman selector list.
+    """
+    players: list
+    counts: np.ndarray
+    index: dict
+
+    def row(self, player: str) -> np.ndarray:
+        """Counts for ``player``; all zeros for an unknown name."""
+        i = self.index.get(player)
+        if i is None:
+            return np.zeros(WICKETS, dtype=self.counts.dtype)
+        return self.counts[i]
+
+
+@memoize
+def dismissal_matrix(bundle: DatasetBundle) -> DismissalMatrix:
+    """Build the players x 10 dismissal matrix in one vectorised pass over FOW.
+
+    Rows whose wicket is not a whole number from 1 to 10 are ignored.
+    """
+    partnership, fow = bundle.partnership, bundle.fow
+    players = np.array(sorted(pd.concat([
+        partnership['player1_name'],
+        partnership['player2_name'],
+        fow['player_name'],
+    ]).dropna().unique()), dtype=object)
+
+    wicket = fow['wicket'].to_numpy()
+    valid = fow['player_name'].notna().to_numpy() & (wicket >= 1) & (wicket <= WICKETS) & (wicket == np.round(wicket))
+    rows = np.searchsorted(players, fow['player_name'].to_numpy()[valid])
+    cells = rows * WICKETS + wicket[valid].astype(np.int64) - 1
+    counts = np.bincount(cells, minlength=len(players) * WICKETS).astype(np.int32).reshape(-1, WICKETS)
+    names = players.tolist()
+    return DismissalMatrix(names, counts, {name: i for i, name in enumerate(names)})
+
+
+def dismissal_positions(bundle: DatasetBundle, batsman: str) -> pd.DataFrame:
+    """How often ``batsman`` fell at each wicket, most frequent first."""
+    row = dismissal_matrix(bundle).row(batsman)
+    wickets = np.flatnonzero(row)
+    wickets = wickets[np.argsort(-row[wickets], kind='stable')]
+    counts = row[wickets]
+    total = counts.sum()
+    return pd.DataFrame({
+        'wicket': wickets + 1,
+        'count': counts,
+        'wicket_label': WICKET_LABELS[wickets],
+        'percentage': (counts / total * 100).round(1) if total else np.zeros(len(counts)),
+    })
+
+
+@memoize
+def dismissal_profiles(bundle: DatasetBundle, batsmen: Sequence[str]) -> pd.DataFrame:
+    """Share of each batsman's dismissals at every wicket, in percent.
+
+    One row per batsman with a ``dismissals`` total followed by a column per
+    wicket label, for comparing batting-position profiles.
+    """
+    matrix = dismissal_matrix(bundle)
+    counts = np.array([matrix.row(b) for b in batsmen], dtype=float).reshape(-1, WICKETS)
+    totals = counts.sum(axis=1)
+    shares = np.divide(counts * 100, totals[:, None], out=np.zeros_like(counts), where=totals[:, None] > 0)
+    profiles = pd.DataFrame(shares.round(1), index=pd.Index(list(batsmen), name='batsman'), columns=WICKET_LABELS)
+    profiles.insert(0, 'dismissals', totals.astype(int))
+    return profiles
+
+
+@memoize
+def top_partners(bundle: DatasetBundle, batsman: str, n: int = 10) -> pd.DataFrame:
+    """Partners with the most combined partnership runs alongside ``batsman``."""
+    partnership = bundle.partnership
+    is_first = partnership['player1_name'] == batsman
+    rows = partnership[is_first | (partnership['player2_name'] == batsman)]
+    partner_name = np.where(is_first[rows.index], rows['player2_name'], rows['player1_name'])
+    totals = rows['partnership runs'].groupby(partner_name).sum()
+    totals.index.name = 'partner_name'
+    return totals.sort_values(ascending=False).head(n).reset_index()
+
+
+# --- Teams ---
+@memoize
+def team_list(bundle: DatasetBundle) -> list:
+    return sorted(bundle.bowling['team'].unique())
+
+
+@memoize
+def wickets_by_team(bundle: DatasetBundle, teams: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Total wickets taken per team, optionally restricted to ``teams``."""
+    bowling = bundle.bowling if bundle.h2h_totals is None else bundle.h2h_totals
+    if teams is not None:
+        bowling = bowling[bowling['team'].isin(teams)]
+    return bowling.groupby('team')['wickets'].sum().reset_index()
+
+
+@memoize
+def average_partnership(bundle: DatasetBundle, teams: Sequence[str]) -> pd.DataFrame:
+    """Mean partnership runs per team for the selected ``teams``."""
+    partnership = bundle.partnership
+    result = partnership[partnership['team'].isin(teams)].groupby('team')['partnership runs'].mean().reset_index()
+    result['partnership runs'] = result['partnership runs'].round(2)
+    return result
+
+
+@memoize
+def phase_stats(bundle: DatasetBundle, phases=DEATH_OVERS_PHASES) -> pd.DataFrame:
+    """Wickets, mean economy and runs conceded per team for each match phase."""
+    bowling = bundle.bowling
+    frames = []
+    for phase_name, start, end in phases:
+        stats = bowling[bowling['overs'].between(start, end)].groupby('team').agg(
+            wickets=('wickets', 'sum'),
+            economy=('economy', 'mean'),
+            conceded=('conceded', 'sum'),
+        ).reset_index()
+        stats['phase'] = phase_name
+        frames.append(stats)
+    return pd.concat(frames, ignore_index=True)
+
+
+@memoize
+def team_phase_stats(bundle: DatasetBundle, team: str) -> pd.DataFrame:
+    """Phase breakdown (powerplay, middle, death) for a single bowling team."""
+    bowling = bundle.bowling
+    team_bowling = bowling[bowling['team'] == team]
+    phase = pd.cut(
+        team_bowling['overs'],
+        bins=[0, 10, 40, 50],
+        labels=['Powerplay (1-10)', 'Middle Overs (11-40)', 'Death Overs (41-50)'],
+    )
+    return team_bowling.groupby(phase, observed=False).agg(
+        wickets=('wickets', 'sum'),
+        economy=('economy', 'mean'),
+        conceded=('conceded', 'sum'),
+        overs=('overs', 'count'),
+    ).rename_axis('phase').reset_index()
+
+
+@memoize
+def h2h_opponents(bundle: DatasetBundle, team: str) -> list:
+    """Every team that ``team`` has bowled against or faced."""
+    bowling = bundle.bowling if bundle.h2h_totals is None else bundle.h2h_totals
+    opponents = pd.concat([
+        bowling.loc[bowling['team'] == team, 'opposition'],
+        bowling.loc[bowling['opposition'] == team, 'team'],
+    ]).unique()
+    return sorted(opponents)
+
+
+@memoize
+def h2h(bundle: DatasetBundle, team1: str, team2: str) -> pd.DataFrame:
+    """Wickets each side took in matches between ``team1`` and ``team2``."""
+    bowling = bundle.bowling if bundle.h2h_totals is None else bundle.h2h_totals
+    mask = (((bowling['team'] == team1) & (bowling['opposition'] == team2))
+            | ((bowling['team'] == team2) & (bowling['opposition'] == team1)))
+    wickets = bowling[mask].groupby('team')['wickets'].sum()
+    return wickets.reindex([team1, team2], fill_value=0).rename_axis('team').reset_index()
+
+
+# --- Matches ---
+@memoize
+def match_ids(bundle: DatasetBundle) -> list:
+    """Matches with both bowling and FOW records inside 50 overs."""
+    valid_bowling = bundle.bowling.loc[bundle.bowling['overs'] <= 50, 'Match ID'].unique()
+    valid_fow = bundle.fow.loc[bundle.fow['over'] <= 50, 'Match ID'].unique()
+    return sorted(np.intersect1d(valid_bowling, valid_fow).tolist())
+
+
+@memoize
+def match_worm(bundle: DatasetBundle, match_id) -> pd.DataFrame:
+    """Runs and cumulative score per over (1-50) for each batting team."""
+    bowling = bundle.bowling
+    match_bowling = bowling[bowling['Match ID'] == match_id]
+    over_number = (match_bowling['overs'].astype(int) + 1).rename('over_number')
+    runs = match_bowling.groupby([over_number, 'opposition'])['conceded'].sum().unstack('opposition')
+    teams = sorted(match_bowling['opposition'].unique())
+    runs = runs.reindex(index=pd.RangeIndex(1, 51, name='over_number'), columns=teams).fillna(0).astype(int)
+    worm = runs.melt(ignore_index=False, var_name='batting_team', value_name='runs').reset_index()
+    worm['cumulative_score'] = worm.groupby('batting_team', sort=False)['runs'].cumsum()
+    return worm
+
+
+@memoize
+def match_wickets(bundle: DatasetBundle, match_id) -> pd.DataFrame:
+    """Fall-of-wicket rows for a match with an integer over column for plotting."""
+    fow = bundle.fow
+    rows = fow[fow['Match ID'] == match_id].copy()
+    rows['over_int'] = rows['over'].astype(float).astype(int) + 1
+    return rows
+
+
+@memoize
+def match_partnerships(bundle: DatasetBundle, match_id) -> pd.DataFrame:
+    partnership = bundle.partnership
+    return partnership[partnership['Match ID'] == match_id].sort_values(by='for wicket')
+
+
+@memoize
+def match_bowler_summary(bundle: DatasetBundle, match_id) -> pd.DataFrame:
+    """Overs, wickets, runs and economy per bowler in a match."""
+    bowling = bundle.bowling
+    return bowling[bowling['Match ID'] == match_id].groupby(['team', 'player_name']).agg(
+        Overs=('overs', 'max'),
+        Wickets=('wickets', 'sum'),
+        Conceded=('conceded', 'sum'),
+        Economy=('economy', 'first'),
+    ).reset_index().sort_values('Wickets', ascending=False)
+
+
+# --- Fall of wickets ---
+COLLAPSE_WICKETS = 4
+COLLAPSE_RUNS = 30
+
+
+def _over_balls(over):
+    """Balls bowled from over notation (12.3 is 12 overs and 3 balls); NaN past 50 overs."""
+    over = np.where(over <= 50, over, np.nan)
+    whole = np.floor(over)
+    return whole * 6 + np.round((over - whole) * 10)
+
+
+@memoize
+def fow_metrics(bundle: DatasetBundle, k: int = COLLAPSE_WICKETS, n: int = COLLAPSE_RUNS) -> pd.DataFrame:
+    """FOW sorted by (match, innings, wicket) with per-wicket derived columns.
+
+    Each metric compares a wicket with the previous one in the same innings,
+    or with the start of the innings for the first wicket:
+    ``runs_added`` (the stand), ``balls`` and ``overs_consumed``, and
+    ``stand_rate`` in runs per over.  ``collapse_runs`` is the runs scored
+    while the last ``k`` wickets fell, and ``collapse`` marks windows of
+    ``n`` runs or fewer.  Rows with an invalid or repeated wicket number
+    keep NaN metrics, as does a metric whose earlier wicket was not recorded.
+    """
+    fow = bundle.fow.sort_values(['Match ID', 'innings', 'wicket'], kind='stable')
+    wicket = fow['wicket'].to_numpy()
+    valid = (wicket >= 1) & (wicket <= WICKETS) & (wicket == np.round(wicket))
+    valid &= ~fow.duplicated(['Match ID', 'innings', 'wicket']).to_numpy()
+    rows = fow[valid]
+
+    match, innings = rows['Match ID'].to_numpy(), rows['innings'].to_numpy()
+    starts = np.ones(len(rows), dtype=bool)
+    starts[1:] = (match[1:] != match[:-1]) | (innings[1:] != innings[:-1])
+    wicket = rows['wicket'].to_numpy().astype(np.int64)
+    # Strictly increasing (innings, wicket) keys, so wicket w - lag is one searchsorted away
+    keys = (np.cumsum(starts) - 1) * (WICKETS + 1) + wicket
+
+    def before(values, lag):
+        """``values`` at wicket ``lag`` earlier: 0 at the innings start, NaN if not recorded."""
+        target = keys - lag
+        found = np.minimum(np.searchsorted(keys, target), len(keys) - 1)
+        earlier = np.where(keys[found] == target, values[found], np.nan)
+        return np.where(wicket == lag, 0.0, np.where(wicket > lag, earlier, np.nan))
+
+    runs = rows['runs'].to_numpy(dtype=float)
+    balls = _over_balls(rows['over'].to_numpy(dtype=float))
+    runs_added = runs - before(runs, 1)
+    balls_consumed = balls - before(balls, 1)
+    collapse_runs = runs - before(runs, k)
+
+    metrics = pd.DataFrame({
+        'balls': balls,
+        'runs_added': runs_added,
+        'overs_consumed': balls_consumed / 6,
+        'stand_rate': np.divide(runs_added * 6, balls_consumed, out=np.full(len(rows), np.nan), where=balls_consumed > 0),
+        'collapse_runs': collapse_runs,
+    }, index=rows.index)
+    fow = fow.join(metrics)
+    fow['collapse'] = (fow['collapse_runs'] <= n).to_numpy()
+    return fow
+
+
+@memoize
+def biggest_collapses(bundle: DatasetBundle, top: int = 10, k: int = COLLAPSE_WICKETS) -> pd.DataFrame:
+    """The ``top`` innings whose cheapest run of ``k`` wickets cost the fewest runs."""
+    metrics = fow_metrics(bundle, k).dropna(subset=['collapse_runs'])
+    worst = metrics.loc[metrics.groupby(['Match ID', 'innings'])['collapse_runs'].idxmin()]
+    worst = worst.sort_values(['collapse_runs', 'wicket'], ascending=[True, False]).head(top)
+    wicket = worst['wicket'].astype(int)
+    start_runs = (worst['runs'] - worst['collapse_runs']).astype(int)
+    return pd.DataFrame({
+        'Match ID': worst['Match ID'].to_numpy(),
+        'team': worst['team'].to_numpy(),
+        'innings': worst['innings'].to_numpy(),
+        'wickets': [f"{w - k + 1}-{w}" for w in wicket],
+        'from': [f"{r}/{w - k}" for r, w in zip(start_runs, wicket)],
+        'to': [f"{int(r)}/{w}" for r, w in zip(worst['runs'], wicket)],
+        'runs': worst['collapse_runs'].astype(int).to_numpy(),
+    })
+
+
+@memoize
+def average_stand_by_wicket(bundle: DatasetBundle, teams: Sequence[str]) -> pd.DataFrame:
+    """Mean runs added and run rate per wicket for each of ``teams``."""
+    metrics = fow_metrics(bundle)
+    rows = metrics[metrics['team'].isin(teams) & metrics['runs_added'].notna()]
+    stands = rows.groupby(['team', 'wicket']).agg(
+        average_stand=('runs_added', 'mean'),
+        run_rate=('stand_rate', 'mean'),
+        stands=('runs_added', 'size'),
+    ).round(2).reset_index()
+    stands['wicket'] = stands['wicket'].astype(int)
+    stands['wicket_label'] = WICKET_LABELS[stands['wicket'] - 1]
+    return stands
+
+
+# --- Partnerships ---
+@memoize
+def top_partnerships(bundle: DatasetBundle, n: int) -> pd.DataFrame:
+    """The ``n`` highest individual partnerships with a readable pair label."""
+    top = bundle.partnership.nlargest(n, 'partnership runs').dropna(subset=['player1_name', 'player2_name'])
+    top = top.assign(pair=top['player1_name'] + " & " + top['player2_name'])
+    return top[['pair', 'partnership runs', 'team', 'for wicket']]
+
+
+@memoize
+def prolific_pairs(bundle: DatasetBundle, n: int) -> pd.DataFrame:
+    """The ``n`` batting pairs with the most combined partnership runs."""
+    rows = bundle.partnership.dropna(subset=['player1_name', 'player2_name'])
+    swap = rows['player1_name'] > rows['player2_name']
+    first = rows['player1_name'].where(~swap, rows['player2_name'])
+    second = rows['player2_name'].where(~swap, rows['player1_name'])
+    totals = rows['partnership runs'].groupby([first, second]).sum().nlargest(n)
+    return pd.DataFrame({
+        'pair': [f"{a} & {b}" for a, b in totals.index],
+        'partnership runs': totals.to_numpy(),
+    })
+
+
+@memoize
+def partnership_pace(bundle: DatasetBundle, teams: Sequence[str]) -> pd.DataFrame:
+    """Partnerships with at least one ball faced for ``teams``, with run rate per 100 balls."""
+    partnership = bundle.partnership
+    rows = partnership[(partnership['partnership balls'] > 0) & partnership['team'].isin(teams)].copy()
+    rows['run_rate'] = rows['partnership runs'] / rows['partnership balls'] * 100
+    return rows
+
+
+# --- Match summary ---
+@memoize
+def match_filter_options(bundle: DatasetBundle) -> dict:
+    """Sorted years, teams and venues available for the sidebar filters."""
+    matches = bundle.matches
+    teams = pd.concat([matches['Team1 Name'], matches['Team2 Name'], matches['Match Winner']])
+    return {
+        'years': sorted(matches['year'].dropna().unique()),
+        'teams': sorted(teams.dropna().unique()),
+        'venues': sorted(matches['Match Venue (Stadium)'].dropna().unique()),
+    }
+
+
+@memoize
+def filter_matches(bundle: DatasetBundle, years=None, teams=None, venues=None) -> pd.DataFrame:
+    """Matches in ``years`` at ``venues`` involving any of ``teams``; None means no filter."""
+    matches = bundle.matches
+    mask = np.ones(len(matches), dtype=bool)
+    if years is not None:
+        mask &= matches['year'].isin(years).to_numpy()
+    if teams is not None:
+        mask &= (matches['Team1 Name'].isin(teams)
+                 | matches['Team2 Name'].isin(teams)
+                 | matches['Match Winner'].isin(teams)).to_numpy()
+    if venues is not None:
+        mask &= matches['Match Venue (Stadium)'].isin(venues).to_numpy()
+    return matches[mask]
+
+
+@memoize
+def matches_per_year(bundle: DatasetBundle, years=None, teams=None, venues=None) -> pd.DataFrame:
+    """Number of distinct matches per year after applying the sidebar filters."""
+    filtered = filter_matches(bundle, years, teams, venues)
+    return filtered.groupby('year')['Match ID'].nunique().reset_index()
+
+
+@memoize
+def result_breakdown(bundle: DatasetBundle, years=None, teams=None, venues=None) -> pd.DataFrame:
+    """Matches per result type (runs, wickets, tie, ...) and how many used D/L or DLS."""
+    filtered = filter_matches(bundle, years, teams, venues)
+    grouped = filtered.groupby('result_type', observed=False)
+    return pd.DataFrame({'matches': grouped.size(), 'dls': grouped['dls'].sum()}).reset_index()
+
+
+@memoize
+def margin_summary(bundle: DatasetBundle, by='team', unit='runs', years=None, teams=None, venues=None) -> pd.DataFrame:
+    """Winning margins of ``unit`` ('runs' or 'wickets') wins per team, venue or era."""
+    filtered = filter_matches(bundle, years, teams, venues)
+    wins = filtered[filtered['result_type'] == unit]
+    if by == 'team':
+        groups = wins['result_winner']
+    elif by == 'venue':
+        groups = wins['Match Venue (Stadium)']
+    else:
+        groups = (wins['year'] // 10 * 10).astype('Int64').astype(str) + 's'
+    grouped = wins.groupby(groups.rename(by))
+    margin = grouped[f"margin_{unit}"]
+    summary = pd.DataFrame({
+        'matches': margin.size(),
+        'median': margin.median(),
+        'mean': margin.mean().round(1),
+        'max': margin.max(),
+        'dls': grouped['dls'].sum(),
+    })
+    if by == 'era':
+        return summary.reset_index()
+    return summary.sort_values('matches', ascending=False).reset_index()
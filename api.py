@@ -0,0 +1,223 @@
+"""Local JSON API over the dashboard aggregations.
+
+Serves the same numbers as the dashboards to other tools, from the same
+warm-up snapshots::
+
+    python api.py --port 8502
+    curl 'http://127.0.0.1:8502/h2h?team1=India&team2=Australia'
+
+Every response body is memoised per (dataset version, endpoint, parameters)
+as encoded JSON with a content-hash ``ETag``.  A request whose
+``If-None-Match`` matches gets an empty 304; results that did not change
+across a dataset version keep their ETag.  The dataset version is checked at
+most every ``VERSION_CHECK_SECONDS``, and a new version is loaded on the next
+request after it.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import leaderboards
+import warmup
+from analytics import DatasetBundle, memoize
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+VERSION_CHECK_SECONDS = 1.0
+MAX_ROWS = 1000
+
+
+# --- Parameters ---
+def _text(query, name):
+    values = query.get(name)
+    if not values or not values[-1]:
+        raise ValueError(f"missing parameter '{name}'")
+    return values[-1]
+
+
+def _count(query, name, default):
+    value = query.get(name, [str(default)])[-1]
+    try:
+        n = int(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer, got {value!r}") from None
+    if not 1 <= n <= MAX_ROWS:
+        raise ValueError(f"'{name}' must be between 1 and {MAX_ROWS}")
+    return n
+
+
+def _filter(query, name, convert=str):
+    """A repeated parameter as a sorted tuple, or None when absent (no filter)."""
+    if name not in query:
+        return None
+    try:
+        return tuple(sorted({convert(value) for value in query[name]}))
+    except ValueError:
+        raise ValueError(f"invalid value for '{name}'") from None
+
+
+# Path -> (dashboard whose bundle it reads, query -> arguments, query function)
+ENDPOINTS = {
+    '/bowlers': ('app', lambda q: (), analytics.bowler_list),
+    '/teams': ('app', lambda q: (), analytics.team_list),
+    '/bowler-vs-opposition': ('app', lambda q: (_text(q, 'bowler'),), analytics.bowler_vs_opposition),
+    '/h2h': ('app', lambda q: (_text(q, 'team1'), _text(q, 'team2')), analytics.h2h),
+    '/top-partnerships': ('app', lambda q: (_count(q, 'n', 10),), leaderboards.top_partnerships),
+    '/matches-per-year': (
+        'visuals',
+        lambda q: (_filter(q, 'year', int), _filter(q, 'team'), _filter(q, 'venue')),
+        analytics.matches_per_year,
+    ),
+}
+
+
+# --- Responses ---
+def _plain(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+def encode(result):
+    """JSON bytes for a query result; frames become a list of row objects."""
+    if isinstance(result, pd.DataFrame):
+        return result.to_json(orient='records').encode()
+    return json.dumps(result, default=_plain).encode()
+
+
+@memoize
+def response(bundle: DatasetBundle, path: str, args: tuple):
+    """``(body, etag)`` for one endpoint call, encoded once per dataset version."""
+    _, _, query = ENDPOINTS[path]
+    body = encode(query(bundle, *args))
+    return body, f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def etag_matches(header, etag):
+    """True when an ``If-None-Match`` header covers ``etag`` (weak comparison)."""
+    if header is None:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f"W/{etag}" in tags
+
+
+class Datasets:
+    """The current bundle per dashboard, reloaded when the files on disk change."""
+
+    def __init__(self, data_dir='.'):
+        self.data_dir = data_dir
+        self.bundles = {}
+        self.checked = {}
+        self.lock = threading.Lock()
+
+    def get(self, dashboard):
+        bundle = self.bundles.get(dashboard)
+        now = time.monotonic()
+        if bundle is not None and now - self.checked.get(dashboard, 0.0) < VERSION_CHECK_SECONDS:
+            return bundle
+        with self.lock:
+            bundle = self.bundles.get(dashboard)
+            tables = warmup.DASHBOARDS[dashboard][0]
+            if bundle is None or bundle.version != analytics.current_version(self.data_dir, tables):
+                bundle = self.bundles[dashboard] = warmup.load_or_build(dashboard, self.data_dir)
+            self.checked[dashboard] = time.monotonic()
+        return bundle
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'CrickalyticsAPI/1'
+    # Headers and body are separate writes; with Nagle on, keep-alive clients
+    # wait out the peer's delayed ACK (~40ms) on every response
+    disable_nagle_algorithm = True
+    datasets = None
+    quiet = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/':
+            self._send_json(200, {'endpoints': sorted(ENDPOINTS)})
+            return
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            self._send_json(404, {'error': f"unknown endpoint '{url.path}'"})
+            return
+
+        dashboard, parse, _ = endpoint
+        try:
+            args = parse(parse_qs(url.query))
+        except ValueError as exc:
+            self._send_json(400, {'error': str(exc)})
+            return
+        try:
+            bundle = self.datasets.get(dashboard)
+        except FileNotFoundError as exc:
+            self._send_json(503, {'error': f"data files not found: {exc.filename}"})
+            return
+
+        body, etag = response(bundle, url.path, args)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'X-Dataset-Version': bundle.version}
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self._send(304, b'', headers)
+        else:
+            self._send(200, body, headers)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), {})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, data_dir='.', quiet=True):
+    """A threaded server bound to ``(host, port)``; port 0 picks a free one."""
+    handler = type('BoundHandler', (Handler,), {'datasets': Datasets(data_dir), 'quiet': quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard aggregations as JSON.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.data_dir, quiet=not args.verbose)
+    # Load both bundles up front so the first requests are not slow
+    for dashboard in {dashboard for dashboard, _, _ in ENDPOINTS.values()}:
+        server.RequestHandlerClass.datasets.get(dashboard)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
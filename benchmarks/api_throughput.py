@@ -0,0 +1,151 @@
+"""Throughput of the local JSON API (``api.py``).
+
+Starts the service in a subprocess (or uses ``--url``), discovers bowlers and
+teams through it, then drives a mix of endpoint calls from concurrent
+keep-alive clients in three phases:
+
+* ``first``      every URL once, computed and encoded by the service
+* ``cached``     the same URLs repeatedly, served from the response cache
+* ``revalidate`` the same URLs with ``If-None-Match``, answered with 304s
+
+and prints requests per second plus median and 99th percentile latency.
+
+    python benchmarks/api_throughput.py
+    python benchmarks/api_throughput.py --clients 8 --requests 5000 --data-dir /path/to/data
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_service(data_dir):
+    """Run ``api.py`` on a free port; returns the process and its base URL."""
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'api.py'), '--port', '0', '--data-dir', data_dir],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith('Serving on '):
+        proc.kill()
+        raise RuntimeError("api.py did not start; see its output above")
+    return proc, line.split()[-1]
+
+
+def get_json(base, path):
+    url = urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port)
+    conn.request('GET', path)
+    reply = conn.getresponse()
+    body = reply.read()
+    conn.close()
+    if reply.status != 200:
+        raise RuntimeError(f"GET {path} returned {reply.status}: {body[:200]!r}")
+    return json.loads(body)
+
+
+def workload(base, size):
+    """About ``size`` distinct request paths spread over every endpoint."""
+    bowlers = get_json(base, '/bowlers')[:size]
+    teams = get_json(base, '/teams')
+    pairs = list(itertools.islice(itertools.permutations(teams, 2), size))
+    paths = [f"/bowler-vs-opposition?{urlencode({'bowler': b})}" for b in bowlers]
+    paths += [f"/h2h?{urlencode({'team1': a, 'team2': b})}" for a, b in pairs]
+    paths += [f"/top-partnerships?n={n}" for n in (5, 10, 25, 50)]
+    paths += [f"/matches-per-year?{urlencode({'team': t})}" for t in teams[:size]]
+    paths += ['/matches-per-year', '/bowlers', '/teams']
+    return paths
+
+
+def run(base, paths, clients, total, revalidate=None):
+    """Issue ``total`` requests over ``paths`` from ``clients`` threads.
+
+    Returns ``(seconds, latencies, statuses)``.  With ``revalidate`` (path ->
+    ETag) every request carries ``If-None-Match``.
+    """
+    url = urlsplit(base)
+    latencies = np.empty(total)
+    statuses = np.empty(total, dtype=int)
+    counter = itertools.count()
+
+    def client():
+        conn = http.client.HTTPConnection(url.hostname, url.port)
+        while True:
+            i = next(counter)
+            if i >= total:
+                break
+            path = paths[i % len(paths)]
+            headers = {'If-None-Match': revalidate[path]} if revalidate else {}
+            start = time.perf_counter()
+            conn.request('GET', path, headers=headers)
+            reply = conn.getresponse()
+            reply.read()
+            latencies[i] = time.perf_counter() - start
+            statuses[i] = reply.status
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, statuses
+
+
+def etags(base, paths):
+    url = urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port)
+    tags = {}
+    for path in paths:
+        conn.request('GET', path)
+        reply = conn.getresponse()
+        reply.read()
+        tags[path] = reply.getheader('ETag')
+    conn.close()
+    return tags
+
+
+def report(phase, seconds, latencies, statuses):
+    codes = ', '.join(f"{code}: {count}" for code, count in zip(*np.unique(statuses, return_counts=True)))
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"  {phase:<10} {len(latencies) / seconds:9.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms   ({codes})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure requests per second against api.py.")
+    parser.add_argument('--url', help="base URL of a running service (default: start one)")
+    parser.add_argument('--data-dir', default=ROOT, help="data directory for the started service")
+    parser.add_argument('--clients', type=int, default=4, help="concurrent keep-alive connections")
+    parser.add_argument('--requests', type=int, default=2000, help="requests per cached/revalidate phase")
+    parser.add_argument('--paths', type=int, default=50, help="distinct parameter values per endpoint")
+    args = parser.parse_args()
+
+    proc = None
+    base = args.url
+    if base is None:
+        proc, base = start_service(os.path.abspath(args.data_dir))
+    try:
+        paths = workload(base, args.paths)
+        print(f"{base}: {len(paths)} distinct requests, {args.clients} clients")
+        report('first', *run(base, paths, args.clients, len(paths)))
+        report('cached', *run(base, paths, args.clients, args.requests))
+        report('revalidate', *run(base, paths, args.clients, args.requests, etags(base, paths)))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
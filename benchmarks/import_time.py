@@ -0,0 +1,119 @@
+"""Import-time report and budget check for the dashboard entry points.
+
+For each entry point, the module-level imports are read from its source and
+run in a fresh interpreter under ``python -X importtime``.  The report lists
+the cumulative milliseconds of each of those imports, best of ``--repeat``
+runs.  The script exits non-zero when an entry point goes over its budget,
+or when a module that should only load with the view that needs it (see
+``DEFERRED``) is imported at startup.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 1500 visuals.py
+"""
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> startup budget in milliseconds (the ODI_IMPORT_BUDGET_MS
+# environment variable overrides it for every entry point)
+BUDGET_MS = {
+    'app.py': 1500,
+    'visuals.py': 1500,
+}
+
+# Heavy modules each entry point must only import inside the view using them.
+# plotly.graph_objects is absent because streamlit itself imports it.
+DEFERRED = {
+    'app.py': ('matplotlib', 'seaborn', 'streamlit_echarts', 'plotly.express'),
+    'visuals.py': ('matplotlib', 'seaborn', 'plotly.express'),
+}
+
+_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def startup_imports(path):
+    """Modules imported at the top level of ``path``, in source order."""
+    with open(path, encoding='utf-8') as fh:
+        tree = ast.parse(fh.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure(modules):
+    """``({module: cumulative ms}, set of every module loaded)`` for one cold run."""
+    code = ''.join(f"import {name}\n" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    timings, loaded = {}, set()
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        loaded.add(name)
+        # Top-level entries are the statements themselves; the first import
+        # of a module is the only one that appears and costs anything
+        if not indent and name in modules:
+            timings[name] = int(cumulative) / 1000
+    return timings, loaded
+
+
+def report(entry, repeat):
+    """Best-of-``repeat`` timings for ``entry`` plus the modules it loaded."""
+    modules = startup_imports(os.path.join(ROOT, entry))
+    best, loaded = {}, set()
+    for _ in range(repeat):
+        timings, loaded = measure(modules)
+        for name in modules:
+            ms = timings.get(name, 0.0)
+            best[name] = min(best.get(name, ms), ms)
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report and check dashboard import times.")
+    parser.add_argument('entries', nargs='*', metavar='ENTRY', help=f"any of {', '.join(BUDGET_MS)} (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per entry point; the fastest is kept")
+    parser.add_argument('--budget-ms', type=float, default=os.environ.get('ODI_IMPORT_BUDGET_MS'))
+    args = parser.parse_args()
+    unknown = set(args.entries) - set(BUDGET_MS)
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(sorted(unknown))}")
+
+    failures = []
+    for entry in args.entries or BUDGET_MS:
+        budget = float(args.budget_ms or BUDGET_MS[entry])
+        timings, loaded = report(entry, args.repeat)
+        total = sum(timings.values())
+        print(f"\n{entry}")
+        for name, ms in sorted(timings.items(), key=lambda item: -item[1]):
+            print(f"  {ms:9.1f} ms  {name}")
+        print(f"  {total:9.1f} ms  total (budget {budget:.0f} ms)")
+
+        if total > budget:
+            failures.append(f"{entry}: {total:.0f} ms is over the {budget:.0f} ms budget")
+        eager = [name for name in DEFERRED[entry] if name in loaded]
+        if eager:
+            failures.append(f"{entry}: imports {', '.join(eager)} at startup")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
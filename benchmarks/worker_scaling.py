@@ -0,0 +1,134 @@
+"""Rerun throughput with N threads in one process versus N worker processes.
+
+A "rerun" is the query work of ``team_analysis_tab`` for a random team
+selection, computed cold (the memo caches are bypassed).  ``threads`` runs N
+concurrent sessions the way a single Streamlit process does, sharing one
+GIL.  ``workers`` runs N processes that each map the shared snapshot, as
+``serve.py`` workers do.  For the worker runs, the mean private and shared
+resident memory per worker is read from ``/proc/self/smaps_rollup``.
+
+    python benchmarks/worker_scaling.py
+    python benchmarks/worker_scaling.py --workers 1 2 4 8 --seconds 10 --data-dir /path/to/data
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analytics
+import warmup
+
+
+def rerun(bundle, teams, rng):
+    """The Team Analysis queries for one random selection, bypassing the memo caches."""
+    selected = tuple(sorted(rng.sample(teams, min(5, len(teams)))))
+    team = rng.choice(teams)
+    analytics.wickets_by_team.__wrapped__(bundle, selected)
+    analytics.average_partnership.__wrapped__(bundle, selected)
+    analytics.phase_stats.__wrapped__(bundle)
+    analytics.team_phase_stats.__wrapped__(bundle, team)
+    opponents = analytics.h2h_opponents.__wrapped__(bundle, team)
+    if opponents:
+        analytics.h2h.__wrapped__(bundle, team, rng.choice(opponents))
+
+
+def session(bundle, seconds, seed):
+    """Reruns completed in ``seconds``."""
+    teams = analytics.team_list(bundle)
+    rng = random.Random(seed)
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        rerun(bundle, teams, rng)
+        count += 1
+    return count
+
+
+def memory_mb():
+    """(private, shared) resident MB of this process, or (nan, nan) off Linux."""
+    try:
+        with open('/proc/self/smaps_rollup') as fh:
+            fields = dict(line.split(':', 1) for line in fh if ':' in line)
+    except OSError:
+        return float('nan'), float('nan')
+
+    def kb(name):
+        return int(fields.get(name, '0 kB').split()[0])
+
+    return ((kb('Private_Clean') + kb('Private_Dirty')) / 1024,
+            (kb('Shared_Clean') + kb('Shared_Dirty')) / 1024)
+
+
+def _worker(data_dir, seconds, seed, ready, go, results):
+    bundle = warmup.load_or_build('app', data_dir)
+    analytics.team_list(bundle)
+    ready.put(None)
+    go.wait()
+    count = session(bundle, seconds, seed)
+    results.put((count, *memory_mb()))
+
+
+def run_threads(bundle, n, seconds):
+    counts = [0] * n
+
+    def target(i):
+        counts[i] = session(bundle, seconds, i)
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds, None
+
+
+def run_workers(data_dir, n, seconds):
+    # spawn, so each worker attaches to the snapshot like a fresh server process
+    context = multiprocessing.get_context('spawn')
+    ready, results, go = context.Queue(), context.Queue(), context.Event()
+    procs = [context.Process(target=_worker, args=(data_dir, seconds, i, ready, go, results)) for i in range(n)]
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        ready.get()
+    go.set()
+    rows = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    total = sum(count for count, _, _ in rows)
+    private = sum(row[1] for row in rows) / n
+    shared = sum(row[2] for row in rows) / n
+    return total / seconds, (private, shared)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare rerun throughput of threads and worker processes.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seconds', type=float, default=5.0, help="measurement time per run")
+    parser.add_argument('--data-dir', default=ROOT)
+    args = parser.parse_args()
+
+    data_dir = os.path.abspath(args.data_dir)
+    bundle = warmup.load_or_build('app', data_dir)
+    print(f"{os.cpu_count()} CPUs, {args.seconds:.0f}s per run")
+    print(f"  {'mode':<8} {'N':>3} {'reruns/s':>9} {'speedup':>8} {'private MB':>11} {'shared MB':>10}")
+    for mode in ('threads', 'workers'):
+        base = None
+        for n in args.workers:
+            if mode == 'threads':
+                rate, memory = run_threads(bundle, n, args.seconds)
+            else:
+                rate, memory = run_workers(data_dir, n, args.seconds)
+            base = base or rate
+            memory_cols = f"{memory[0]:11.0f} {memory[1]:10.0f}" if memory else f"{'':11} {'':10}"
+            print(f"  {mode:<8} {n:3d} {rate:9.1f} {rate / base:7.2f}x {memory_cols}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Browser-side cross-filtering over a compact, dictionary-encoded dataset.
+
+The builders here return a self-contained HTML page for
+``streamlit.components.v1.html``.  The page embeds the data once: each
+string dimension is sent as a sorted dictionary plus one integer code per
+row (-1 when missing), and scores as plain integers.  Linked ECharts views
+then filter and re-aggregate in the browser.  Clicking a bar toggles a
+filter and redraws the other charts, and none of it reruns the script.
+
+* :func:`match_explorer` is one row per match (year, both teams, winner,
+  venue, both scores) for the Visualizations page.
+* :func:`team_comparison` is pre-aggregated per team (wickets, partnership
+  runs and stands) for the Team Analysis comparison.
+
+ECharts is loaded from ``ECHARTS_URL``.
+"""
+import json
+
+import pandas as pd
+
+from analytics import DatasetBundle, memoize
+from payloads import PALETTE
+
+ECHARTS_URL = "https://cdn.jsdelivr.net/npm/echarts@5/dist/echarts.min.js"
+EXPLORER_HEIGHT = 900
+TEAM_COMPARISON_HEIGHT = 960
+TOP_BARS = 15
+HIGHLIGHT = "#d62728"
+
+_STYLE = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 0; color: #31333F; }
+.bar { display: flex; gap: 12px; align-items: center; flex-wrap: wrap; margin-bottom: 8px; }
+.count { font-weight: bold; font-size: 1.1rem; }
+.filters { color: #555; font-size: 0.9rem; flex: 1; }
+button { border: 1px solid #ccc; background: #fff; border-radius: 6px; padding: 4px 10px; cursor: pointer; }
+.grid { display: grid; grid-template-columns: 1fr 1fr; gap: 8px; }
+.chart { height: 410px; }
+.teams { display: flex; flex-wrap: wrap; gap: 4px 14px; margin-bottom: 8px; font-size: 0.9rem; }
+"""
+
+
+def _json(value):
+    """Compact JSON that is safe inside a <script> element."""
+    return json.dumps(value, separators=(',', ':')).replace('</', '<\\/')
+
+
+def _page(body, script, data):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><style>{_STYLE}</style>"
+            f"<script src='{ECHARTS_URL}'></script></head><body>{body}"
+            f"<script>const D = {_json(data)};\n{script}</script></body></html>")
+
+
+def _encode(values):
+    """Sorted dictionary and per-row codes (-1 for missing) for ``values``."""
+    codes, labels = pd.factorize(pd.Series(values, dtype=object), sort=True)
+    return codes.tolist(), [str(label) for label in labels]
+
+
+def _scores(values):
+    return pd.to_numeric(values, errors='coerce').fillna(-1).astype(int).tolist()
+
+
+# --- Match explorer (visuals.py) ---
+@memoize
+def match_columns(bundle: DatasetBundle) -> dict:
+    """One entry per match: dictionary-encoded year, teams, winner and venue, plus scores."""
+    matches = bundle.matches
+    n = len(matches)
+    teams = pd.concat([matches['Team1 Name'], matches['Team2 Name'], matches['Match Winner']], ignore_index=True)
+    team_codes, team_labels = _encode(teams)
+    year_codes, years = _encode(matches['year'].astype('Int64').astype(object).where(matches['year'].notna()))
+    venue_codes, venues = _encode(matches['Match Venue (Stadium)'])
+    return {
+        'dictionaries': {'year': years, 'team': team_labels, 'venue': venues},
+        'columns': {
+            'year': year_codes,
+            'team1': team_codes[:n],
+            'team2': team_codes[n:2 * n],
+            'winner': team_codes[2 * n:],
+            'venue': venue_codes,
+            'runs1': _scores(matches['Team1 Runs Scored']),
+            'runs2': _scores(matches['Team2 Runs Scored']),
+        },
+    }
+
+
+_EXPLORER_BODY = """
+<div class="bar"><span class="count" id="count"></span><span class="filters" id="filters"></span>
+<button id="reset">Reset filters</button></div>
+<div class="grid">
+<div class="chart" id="year"></div><div class="chart" id="score"></div>
+<div class="chart" id="team"></div><div class="chart" id="venue"></div>
+</div>
+"""
+
+_EXPLORER_SCRIPT = """
+const C = D.columns, N = C.year.length, TOP = %(top)d;
+const BASE = %(base)s, HIGHLIGHT = %(highlight)s;
+const filters = {year: new Set(), team: new Set(), venue: new Set()};
+
+// A row passes every active filter except the one on dimension ``skip``
+function keep(i, skip) {
+  if (skip !== 'year' && filters.year.size && !filters.year.has(C.year[i])) return false;
+  if (skip !== 'venue' && filters.venue.size && !filters.venue.has(C.venue[i])) return false;
+  if (skip !== 'team' && filters.team.size && !(filters.team.has(C.team1[i])
+      || filters.team.has(C.team2[i]) || filters.team.has(C.winner[i]))) return false;
+  return true;
+}
+function tally(codes, size, skip) {
+  const out = new Int32Array(size);
+  for (let i = 0; i < N; i++) if (codes[i] >= 0 && keep(i, skip)) out[codes[i]]++;
+  return out;
+}
+function rows(counts, dim, top) {
+  let out = [];
+  counts.forEach((v, code) => { if (v > 0) out.push([D.dictionaries[dim][code], v, code]); });
+  if (top) out = out.sort((a, b) => b[1] - a[1]).slice(0, top);
+  return [['name', 'value', 'code'], ...out];
+}
+function bar(el, title, dim, horizontal) {
+  const chart = echarts.init(document.getElementById(el));
+  const category = {type: 'category', axisLabel: horizontal ? {width: 160, overflow: 'truncate'} : {rotate: 45}};
+  const value = {type: 'value'};
+  chart.setOption({
+    title: {text: title, left: 'center', textStyle: {fontSize: 14}},
+    tooltip: {trigger: 'item'},
+    grid: {left: '3%%', right: '4%%', bottom: '3%%', containLabel: true},
+    dataset: {source: []},
+    xAxis: horizontal ? value : category,
+    yAxis: horizontal ? Object.assign({inverse: true}, category) : value,
+    series: [{type: 'bar', encode: horizontal ? {x: 'value', y: 'name'} : {x: 'name', y: 'value'},
+              itemStyle: {color: p => filters[dim].has(p.data[2]) ? HIGHLIGHT : BASE}}],
+  });
+  chart.on('click', p => {
+    const code = p.data[2];
+    filters[dim].has(code) ? filters[dim].delete(code) : filters[dim].add(code);
+    render();
+  });
+  return chart;
+}
+
+const years = bar('year', 'Matches per Year', 'year', false);
+const teams = bar('team', 'Wins by Team (top ' + TOP + ')', 'team', true);
+const venues = bar('venue', 'Matches by Venue (top ' + TOP + ')', 'venue', true);
+const scores = echarts.init(document.getElementById('score'));
+scores.setOption({
+  title: {text: 'Average First-Innings Score', left: 'center', textStyle: {fontSize: 14}},
+  tooltip: {trigger: 'axis'},
+  grid: {left: '3%%', right: '4%%', bottom: '3%%', containLabel: true},
+  dataset: {source: []},
+  xAxis: {type: 'category'}, yAxis: {type: 'value', scale: true},
+  series: [{type: 'line', smooth: true, encode: {x: 'name', y: 'value'}, itemStyle: {color: BASE}}],
+});
+
+function render() {
+  years.setOption({dataset: {source: rows(tally(C.year, D.dictionaries.year.length, 'year'), 'year', 0)}});
+  teams.setOption({dataset: {source: rows(tally(C.winner, D.dictionaries.team.length, 'team'), 'team', TOP)}});
+  venues.setOption({dataset: {source: rows(tally(C.venue, D.dictionaries.venue.length, 'venue'), 'venue', TOP)}});
+
+  const total = new Float64Array(D.dictionaries.year.length), innings = new Int32Array(total.length);
+  let matches = 0;
+  for (let i = 0; i < N; i++) {
+    if (!keep(i, null)) continue;
+    matches++;
+    if (C.year[i] >= 0 && C.runs1[i] >= 0) { total[C.year[i]] += C.runs1[i]; innings[C.year[i]]++; }
+  }
+  const averages = [['name', 'value']];
+  innings.forEach((n, code) => { if (n) averages.push([D.dictionaries.year[code], Math.round(total[code] / n * 10) / 10]); });
+  scores.setOption({dataset: {source: averages}});
+
+  document.getElementById('count').textContent = matches + ' matches';
+  document.getElementById('filters').textContent = ['year', 'team', 'venue']
+    .filter(dim => filters[dim].size)
+    .map(dim => dim + ': ' + [...filters[dim]].map(code => D.dictionaries[dim][code]).join(', '))
+    .join('  ·  ') || 'Click any bar to filter the other charts';
+}
+document.getElementById('reset').onclick = () => { Object.values(filters).forEach(f => f.clear()); render(); };
+window.addEventListener('resize', () => [years, teams, venues, scores].forEach(c => c.resize()));
+render();
+"""
+
+
+@memoize
+def match_explorer(bundle: DatasetBundle) -> str:
+    """Linked matches-per-year, first-innings score, wins and venue views over every match."""
+    script = _EXPLORER_SCRIPT % {'top': TOP_BARS, 'base': _json(PALETTE[0]), 'highlight': _json(HIGHLIGHT)}
+    return _page(_EXPLORER_BODY, script, match_columns(bundle))
+
+
+# --- Team comparison (app.py) ---
+@memoize
+def team_columns(bundle: DatasetBundle) -> dict:
+    """Per team: wickets taken, partnership runs and number of partnerships."""
+    teams = pd.Index(sorted(set(bundle.bowling['team'].dropna()) | set(bundle.partnership['team'].dropna())))
+    wickets = bundle.bowling.groupby('team')['wickets'].sum().reindex(teams, fill_value=0)
+    stands = bundle.partnership.groupby('team')['partnership runs'].agg(['sum', 'count']).reindex(teams, fill_value=0)
+    return {
+        'teams': teams.tolist(),
+        'wickets': wickets.astype(int).tolist(),
+        'runs': stands['sum'].astype(int).tolist(),
+        'stands': stands['count'].astype(int).tolist(),
+    }
+
+
+_TEAM_BODY = """
+<div class="teams" id="picker"></div>
+<div class="chart" id="wickets"></div>
+<div class="chart" id="partnership"></div>
+"""
+
+_TEAM_SCRIPT = """
+const PALETTE = %(palette)s;
+const selected = new Set(%(selected)s.map(name => D.teams.indexOf(name)).filter(i => i >= 0));
+const picker = document.getElementById('picker');
+D.teams.forEach((name, i) => {
+  const label = document.createElement('label');
+  const box = document.createElement('input');
+  box.type = 'checkbox'; box.checked = selected.has(i);
+  box.onchange = () => { box.checked ? selected.add(i) : selected.delete(i); render(); };
+  label.append(box, ' ' + name);
+  picker.append(label);
+});
+
+function bar(el, title, yName) {
+  const chart = echarts.init(document.getElementById(el));
+  chart.setOption({
+    title: {text: title, left: 'center', textStyle: {fontSize: 16, fontWeight: 'bold'}},
+    tooltip: {trigger: 'axis', axisPointer: {type: 'shadow'}},
+    dataset: {source: []},
+    xAxis: {type: 'category', axisLabel: {rotate: 45}},
+    yAxis: {type: 'value', name: yName},
+    series: [{type: 'bar', encode: {x: 'name', y: 'value'}, colorBy: 'data',
+              label: {show: true, position: 'top', formatter: '{@value}'}}],
+    grid: {left: '3%%', right: '4%%', bottom: '15%%', containLabel: true},
+  });
+  return chart;
+}
+const wickets = bar('wickets', 'Total Wickets Taken (Selected Teams)', 'Wickets');
+const partnership = bar('partnership', 'Average Partnership Runs by Team', 'Average Runs');
+
+function render() {
+  const chosen = [...selected].sort((a, b) => a - b);
+  const colors = chosen.map((_, k) => PALETTE[k %% PALETTE.length]);
+  wickets.setOption({color: colors, dataset: {source: [['name', 'value'], ...chosen.map(i => [D.teams[i], D.wickets[i]])]}});
+  partnership.setOption({color: colors, dataset: {source: [['name', 'value'], ...chosen.map(
+    i => [D.teams[i], D.stands[i] ? Math.round(D.runs[i] / D.stands[i] * 100) / 100 : 0])]}});
+}
+window.addEventListener('resize', () => [wickets, partnership].forEach(c => c.resize()));
+render();
+"""
+
+
+@memoize
+def team_comparison(bundle: DatasetBundle, selected=()) -> str:
+    """Wickets and average partnership for teams ticked in the page, starting from ``selected``."""
+    script = _TEAM_SCRIPT % {'palette': _json(PALETTE), 'selected': _json(list(selected))}
+    return _page(_TEAM_BODY, script, team_columns(bundle))
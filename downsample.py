@@ -0,0 +1,106 @@
+"""Server-side aggregation for charts that would otherwise ship every row.
+
+When a trace has more points than the point budget, it is reduced before it
+reaches Plotly: scatters become hexagonal-bin counts and box plots become a
+precomputed quantile summary plus their Tukey outliers.  Below the budget,
+or once the user zooms to a window that fits in it, the raw rows are used.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import analytics
+from analytics import memoize
+
+POINT_BUDGET = int(os.environ.get('ODI_POINT_BUDGET', 2000))
+HEX_GRIDSIZE = 40
+
+
+def hexbin(x, y, gridsize=HEX_GRIDSIZE, extent=None):
+    """Count points per hexagonal cell; returns cell centres and counts.
+
+    Uses the two offset rectangular lattices of a hex grid and assigns each
+    point to the nearer centre, as matplotlib's ``hexbin`` does.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if not len(x):
+        return pd.DataFrame({'x': [], 'y': [], 'count': []})
+    xmin, xmax, ymin, ymax = extent or (x.min(), x.max(), y.min(), y.max())
+    sx = (xmax - xmin) / gridsize or 1.0
+    sy = (ymax - ymin) / (gridsize / np.sqrt(3)) or 1.0
+    ix = (x - xmin) / sx
+    iy = (y - ymin) / sy
+    ix1, iy1 = np.round(ix), np.round(iy)
+    ix2, iy2 = np.floor(ix), np.floor(iy)
+    first = (ix - ix1) ** 2 + 3 * (iy - iy1) ** 2 < (ix - ix2 - 0.5) ** 2 + 3 * (iy - iy2 - 0.5) ** 2
+    cx = np.where(first, ix1, ix2 + 0.5) * sx + xmin
+    cy = np.where(first, iy1, iy2 + 0.5) * sy + ymin
+    centres, counts = np.unique(np.column_stack([cx, cy]), axis=0, return_counts=True)
+    return pd.DataFrame({'x': centres[:, 0], 'y': centres[:, 1], 'count': counts})
+
+
+def box_summary(values):
+    """Quartiles, Tukey fences and outliers of ``values`` for a precomputed box.
+
+    Returns None when ``values`` has no non-NaN value; callers must check.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': min(inside.min(), q1),
+        'upperfence': max(inside.max(), q3),
+        'mean': values.mean(),
+        'outliers': values[(values < inside.min()) | (values > inside.max())],
+        'count': len(values),
+    }
+
+
+def _in_window(df, x, y, x_range, y_range):
+    mask = np.ones(len(df), dtype=bool)
+    if x_range is not None:
+        mask &= df[x].between(*x_range).to_numpy()
+    if y_range is not None:
+        mask &= df[y].between(*y_range).to_numpy()
+    return df[mask]
+
+
+@memoize
+def partnership_pace_view(bundle, teams, x_range=None, y_range=None, budget=POINT_BUDGET):
+    """Partnership pace rows, or per-team hex bins when over ``budget``.
+
+    Returns ``(mode, table, total)`` where ``mode`` is ``'points'`` or
+    ``'bins'`` and ``total`` is the number of partnerships in the window.
+    """
+    rows = _in_window(analytics.partnership_pace(bundle, teams),
+                      'partnership balls', 'partnership runs', x_range, y_range)
+    if len(rows) <= budget:
+        return 'points', rows, len(rows)
+    extent = (
+        rows['partnership balls'].min(), rows['partnership balls'].max(),
+        rows['partnership runs'].min(), rows['partnership runs'].max(),
+    )
+    bins = []
+    for team, team_rows in rows.groupby('team'):
+        cells = hexbin(team_rows['partnership balls'], team_rows['partnership runs'], extent=extent)
+        bins.append(cells.assign(team=team))
+    binned = pd.concat(bins, ignore_index=True).rename(columns={'x': 'partnership balls', 'y': 'partnership runs'})
+    return 'bins', binned, len(rows)
+
+
+@memoize
+def economy_view(bundle, bowler, budget=POINT_BUDGET):
+    """Economy rows for ``bowler``, or a quantile summary (None if empty) when over ``budget``."""
+    rows = analytics.bowler_economy(bundle, bowler)
+    if len(rows) <= budget:
+        return 'points', rows
+    return 'summary', box_summary(rows['economy'])
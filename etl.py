@@ -0,0 +1,364 @@
+"""Offline pipeline that rebuilds every derived CSV from the raw ODI inputs.
+
+Stages are declared with their input and output files, run in dependency
+order, and independent stages run side by side in a process pool.  A stage
+is skipped when the content hashes of its inputs match the last successful
+run recorded in ``.etl_manifest.json`` and its outputs still exist.
+
+Usage::
+
+    python etl.py                  # rebuild whatever is stale
+    python etl.py --force          # rebuild everything
+    python etl.py --only fow_clean --workers 2
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import results
+from streaming import GroupNunique, GroupSum, aggregate, stream_csv
+
+MANIFEST = '.etl_manifest.json'
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    func: object
+    inputs: tuple
+    outputs: tuple
+
+
+# --- Helpers ---
+def _path(data_dir, name):
+    return os.path.join(data_dir, name)
+
+
+def _write_csv(df, path):
+    """Write to a temporary file first so readers never see a partial CSV."""
+    tmp = path + '.tmp'
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _write_chunks(chunks, path):
+    """Stream chunks into ``path`` without holding the whole table in memory."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', newline='') as fh:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(fh, index=False, header=i == 0)
+    os.replace(tmp, path)
+
+
+def _player_names(data_dir):
+    info = pd.read_csv(_path(data_dir, 'player_info_clean.csv'), usecols=['player_id', 'player_name', 'bowling_style'])
+    return info.drop_duplicates('player_id').set_index('player_id')
+
+
+def _overs_to_balls(overs):
+    """Convert cricket overs notation (``12.3`` = 12 overs, 3 balls) to balls."""
+    whole = np.floor(overs)
+    return whole * 6 + np.round((overs - whole) * 10)
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# --- Stages ---
+def build_fow_clean(data_dir):
+    """fow_clean.csv: raw fall-of-wicket rows with integer player ids."""
+    columns = ['Match ID', 'innings', 'team', 'player', 'wicket', 'over', 'runs']
+    chunks = (chunk.assign(player=chunk['player'].fillna(0).astype('int64'))
+              for chunk in stream_csv(_path(data_dir, 'odi_Fow_new.csv'), columns))
+    _write_chunks(chunks, _path(data_dir, 'fow_clean.csv'))
+
+
+def build_player_info_clean(data_dir):
+    """player_info_clean.csv: player register with missing fields filled."""
+    info = pd.read_csv(_path(data_dir, 'odi_players_info_new.csv'))
+    info = info.fillna({
+        'dob': '1900-01-01',
+        'batting_style': 'Unknown',
+        'bowling_style': 'Unknown',
+        'country_id': 0,
+    })
+    info['country_id'] = info['country_id'].astype('int64')
+    _write_csv(info, _path(data_dir, 'player_info_clean.csv'))
+
+
+def build_bowling_clean(data_dir):
+    """bowling_clean.csv: raw bowling figures without the exported index column."""
+    chunks = (chunk.drop(columns=['Unnamed: 0'], errors='ignore')
+              for chunk in stream_csv(_path(data_dir, 'odi_Bowling_new.csv')))
+    _write_chunks(chunks, _path(data_dir, 'bowling_clean.csv'))
+
+
+def build_partnership_clean(data_dir):
+    """partnership_clean.csv: raw partnerships without the exported index column."""
+    chunks = (chunk.drop(columns=['Unnamed: 0'], errors='ignore')
+              for chunk in stream_csv(_path(data_dir, 'odi_Patnership_new.csv')))
+    _write_chunks(chunks, _path(data_dir, 'partnership_clean.csv'))
+
+
+def build_match_summary(data_dir):
+    """cleaned_odi_match_summary.csv: match summary with MOM names replaced by player ids.
+
+    Also adds the parsed result columns, and lists result texts that do not
+    parse in unparsed_results.csv.
+    """
+    matches = pd.read_csv(_path(data_dir, 'Final_match_summary.csv'))
+    info = pd.read_csv(_path(data_dir, 'player_info_clean.csv'), usecols=['player_id', 'player_name'])
+    ids = info.drop_duplicates('player_name').set_index('player_name')['player_id']
+    matches['MOM Player'] = matches['MOM Player'].map(ids).fillna(0).astype(float)
+    matches = matches.join(results.parse_results(matches['Match Result Text']))
+    _write_csv(matches, _path(data_dir, 'cleaned_odi_match_summary.csv'))
+
+    bad = results.unparsed(matches['Match Result Text'])
+    _write_csv(matches.loc[bad.index, ['Match ID', 'Match Result Text']], _path(data_dir, 'unparsed_results.csv'))
+
+
+def build_team_summary(data_dir):
+    """cleaned_odi_team_summary.csv: one block of Team1 rows followed by one of Team2 rows."""
+    matches = pd.read_csv(_path(data_dir, 'Final_match_summary.csv'))
+    shared = ['Match ID', 'Match Date', 'Series Name']
+    venue = ['Match Winner', 'Match Venue (Stadium)', 'Match Venue (City)', 'Match Venue (Country)']
+    team1 = matches[shared + ['Team1 Name', 'Team1 Runs Scored', 'Team1 Wickets Fell'] + venue].rename(columns={
+        'Team1 Name': 'team1 name',
+        'Team1 Runs Scored': 'team1 runs_scored',
+        'Team1 Wickets Fell': 'team1 wickets_lost',
+    })
+    team2 = matches[shared + venue + ['Team2 Name', 'Team2 Runs Scored', 'Team2 Wickets Fell']].rename(columns={
+        'Team2 Name': 'team2 name',
+        'Team2 Runs Scored': ' Team2 runs_scored',
+        'Team2 Wickets Fell': 'Team2 wickets_lost',
+    })
+    columns = shared + ['team1 name', 'team1 runs_scored', 'team1 wickets_lost'] + venue \
+        + ['team2 name', ' Team2 runs_scored', 'Team2 wickets_lost']
+    teams = pd.concat([team1, team2], ignore_index=True)[columns]
+    _write_csv(teams, _path(data_dir, 'cleaned_odi_team_summary.csv'))
+
+
+def build_bowling_summary(data_dir):
+    """Final_bowling_summary_final.csv: career bowling totals per player."""
+    chunks = (chunk.assign(balls=_overs_to_balls(chunk['overs']))
+              for chunk in stream_csv(_path(data_dir, 'bowling_clean.csv'),
+                                      ['innings', 'bowler id', 'overs', 'conceded', 'wickets']))
+    totals, innings = aggregate(
+        chunks,
+        GroupSum('bowler id', ['overs', 'balls', 'conceded', 'wickets']),
+        GroupNunique('bowler id', 'innings'),
+    )
+    totals['innings_bowled'] = innings
+
+    players = _player_names(data_dir)
+    summary = pd.DataFrame({
+        'player_id': totals.index.astype(float),
+        'player_name': players['player_name'].reindex(totals.index).to_numpy(),
+        'bowling_style': players['bowling_style'].reindex(totals.index).to_numpy(),
+        'innings_bowled': totals['innings_bowled'].to_numpy(),
+        'total_overs': totals['overs'].to_numpy(),
+        'total_balls': totals['balls'].to_numpy(),
+        'total_runs': totals['conceded'].to_numpy(),
+        'economy': (totals['conceded'] / totals['overs'].replace(0, np.nan)).fillna(0).to_numpy(),
+        'wickets': totals['wickets'].to_numpy(),
+    })
+    summary = summary.dropna(subset=['player_name']).sort_values('player_name')
+    _write_csv(summary, _path(data_dir, 'Final_bowling_summary_final.csv'))
+
+
+def build_batting_summary(data_dir):
+    """player_batting_summary.csv: career batting totals per player.
+
+    Expects ``odi_batting_new.csv`` with ``Match ID``, ``batsman`` (player id),
+    ``runs``, ``balls``, ``fours`` and ``sixes`` columns.
+    """
+    chunks = (chunk.assign(innings=1)
+              for chunk in stream_csv(_path(data_dir, 'odi_batting_new.csv'),
+                                      ['Match ID', 'batsman', 'runs', 'balls', 'fours', 'sixes']))
+    totals, matches = aggregate(
+        chunks,
+        GroupSum('batsman', ['innings', 'runs', 'balls', 'fours', 'sixes']),
+        GroupNunique('batsman', 'Match ID'),
+    )
+    totals['matches'] = matches
+    totals['player_name'] = _player_names(data_dir)['player_name'].reindex(totals.index)
+    totals = totals.dropna(subset=['player_name']).groupby('player_name').sum()
+
+    summary = pd.DataFrame({
+        'matches_bat': totals['matches'],
+        'innings_batted': totals['innings'],
+        'runs': totals['runs'],
+        'balls': totals['balls'],
+        'fours': totals['fours'],
+        'sixes': totals['sixes'],
+        'bat_avg': totals['runs'] / totals['innings'],
+        'strike_rate': (totals['runs'] / totals['balls'].replace(0, np.nan) * 100).fillna(0),
+    }).rename_axis('player_name').reset_index()
+    _write_csv(summary[[*summary.columns[1:], 'player_name']], _path(data_dir, 'player_batting_summary.csv'))
+
+
+def build_player_summary(data_dir):
+    """cleaned_odi_player_summary.csv: batting summary joined with bowling career totals."""
+    batting = pd.read_csv(_path(data_dir, 'player_batting_summary.csv'))
+    chunks = stream_csv(_path(data_dir, 'bowling_clean.csv'),
+                        ['Match ID', 'innings', 'bowler id', 'overs', 'conceded', 'wickets'])
+    totals, matches, innings = aggregate(
+        chunks,
+        GroupSum('bowler id', ['wickets', 'conceded', 'overs']),
+        GroupNunique('bowler id', 'Match ID'),
+        GroupNunique('bowler id', ['Match ID', 'innings']),
+    )
+    totals['matches_bowl'] = matches
+    totals['innings_bowled'] = innings
+    totals['player_name'] = _player_names(data_dir)['player_name'].reindex(totals.index)
+    bowling = totals.dropna(subset=['player_name']).groupby('player_name').sum().rename(columns={'conceded': 'runs_conceded'})
+
+    bowling_columns = ['matches_bowl', 'innings_bowled', 'wickets', 'runs_conceded', 'overs']
+    summary = batting.drop(columns='player_name').join(bowling[bowling_columns].reindex(batting['player_name']).reset_index(drop=True))
+    summary['player_name'] = batting['player_name']
+    _write_csv(summary, _path(data_dir, 'cleaned_odi_player_summary.csv'))
+
+
+STAGES = (
+    Stage('fow_clean', build_fow_clean, ('odi_Fow_new.csv',), ('fow_clean.csv',)),
+    Stage('player_info_clean', build_player_info_clean, ('odi_players_info_new.csv',), ('player_info_clean.csv',)),
+    Stage('bowling_clean', build_bowling_clean, ('odi_Bowling_new.csv',), ('bowling_clean.csv',)),
+    Stage('partnership_clean', build_partnership_clean, ('odi_Patnership_new.csv',), ('partnership_clean.csv',)),
+    Stage('match_summary', build_match_summary, ('Final_match_summary.csv', 'player_info_clean.csv'),
+          ('cleaned_odi_match_summary.csv', 'unparsed_results.csv')),
+    Stage('team_summary', build_team_summary, ('Final_match_summary.csv',), ('cleaned_odi_team_summary.csv',)),
+    Stage('bowling_summary', build_bowling_summary, ('bowling_clean.csv', 'player_info_clean.csv'),
+          ('Final_bowling_summary_final.csv',)),
+    Stage('batting_summary', build_batting_summary, ('odi_batting_new.csv', 'player_info_clean.csv'),
+          ('player_batting_summary.csv',)),
+    Stage('player_summary', build_player_summary,
+          ('player_batting_summary.csv', 'bowling_clean.csv', 'player_info_clean.csv'),
+          ('cleaned_odi_player_summary.csv',)),
+)
+
+
+# --- Scheduling ---
+def dependencies(stages):
+    """Map each stage name to the stages producing one of its inputs."""
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    return {
+        stage.name: {producers[i] for i in stage.inputs if i in producers}
+        for stage in stages
+    }
+
+
+def topological_order(stages):
+    deps = dependencies(stages)
+    order, done = [], set()
+    while len(order) < len(stages):
+        ready = [s for s in stages if s.name not in done and deps[s.name] <= done]
+        if not ready:
+            raise ValueError("ETL stages contain a dependency cycle")
+        order.extend(ready)
+        done.update(s.name for s in ready)
+    return order
+
+
+def _load_manifest(data_dir):
+    try:
+        with open(_path(data_dir, MANIFEST)) as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(data_dir, manifest):
+    tmp = _path(data_dir, MANIFEST + '.tmp')
+    with open(tmp, 'w') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp, _path(data_dir, MANIFEST))
+
+
+def _fingerprint(data_dir, stage):
+    return {name: file_hash(_path(data_dir, name)) for name in stage.inputs}
+
+
+def _run_stage(stage, data_dir):
+    start = time.perf_counter()
+    stage.func(data_dir)
+    return time.perf_counter() - start
+
+
+def run_pipeline(data_dir='.', workers=None, force=False, only=None):
+    """Run every stale stage and return ``{stage name: status}``."""
+    stages = topological_order(STAGES)
+    if only:
+        stages = [s for s in stages if s.name in only]
+    deps = dependencies(stages)
+    manifest = _load_manifest(data_dir)
+    status, pending, running = {}, list(stages), {}
+
+    def settle(stage):
+        # Decide whether ``stage`` can be skipped; returns True when it must run.
+        missing = [i for i in stage.inputs if not os.path.exists(_path(data_dir, i))]
+        if missing:
+            status[stage.name] = f"skipped (missing {', '.join(missing)})"
+            return False
+        fingerprint = _fingerprint(data_dir, stage)
+        outputs_exist = all(os.path.exists(_path(data_dir, o)) for o in stage.outputs)
+        if not force and outputs_exist and manifest.get(stage.name) == fingerprint:
+            status[stage.name] = "up to date"
+            return False
+        return True
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for stage in list(pending):
+                if not deps[stage.name] <= set(status):
+                    continue
+                pending.remove(stage)
+                failed = [d for d in deps[stage.name] if status[d].startswith('failed')]
+                if failed:
+                    status[stage.name] = f"skipped ({', '.join(failed)} failed)"
+                elif settle(stage):
+                    running[pool.submit(_run_stage, stage, data_dir)] = stage
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except Exception as exc:
+                    status[stage.name] = f"failed ({exc})"
+                    continue
+                manifest[stage.name] = _fingerprint(data_dir, stage)
+                status[stage.name] = f"built in {elapsed:.2f}s"
+                _save_manifest(data_dir, manifest)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the derived ODI summary CSVs.")
+    parser.add_argument('--data-dir', default='.', help="directory holding the raw and derived CSVs")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="rebuild even if inputs are unchanged")
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help="run only these stages")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    status = run_pipeline(args.data_dir, args.workers, args.force, args.only)
+    for name, result in status.items():
+        print(f"{name:20s} {result}")
+    print(f"Finished in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Size-bounded cache of serialised figures keyed by dataset version.
+
+Figures that depend only on the dataset (never on widgets) are built once
+per dataset version, stored as their Plotly/ECharts JSON, and handed back to
+every later rerun and session.  Entries are evicted least-recently-used once
+the stored JSON exceeds ``max_bytes``.  Entries restored from JSON alone are
+decoded back into figures on their first ``get``, so loading a snapshot does
+not import Plotly.
+"""
+import json
+import threading
+from collections import OrderedDict
+
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def _decode(text, kind):
+    if kind == 'echarts':
+        return json.loads(text)
+    import plotly.io as pio
+
+    return pio.from_json(text, skip_invalid=True)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, name, version):
+        """Return the cached figure for ``(name, version)`` or None."""
+        with self._lock:
+            entry = self._entries.get((name, version))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((name, version))
+            self.hits += 1
+            if entry['figure'] is None:
+                entry['figure'] = _decode(entry['json'], entry['kind'])
+            return entry['figure']
+
+    def get_json(self, name, version):
+        """Return the serialised JSON text for ``(name, version)`` or None."""
+        with self._lock:
+            entry = self._entries.get((name, version))
+            if entry is None:
+                return None
+            self._entries.move_to_end((name, version))
+            return entry['json']
+
+    def put(self, name, version, figure):
+        """Serialise ``figure`` (a Plotly figure or an ECharts option dict) and store it."""
+        if isinstance(figure, dict):
+            text, kind = json.dumps(figure), 'echarts'
+        else:
+            text, kind = figure.to_json(), 'plotly'
+        self.put_json(name, version, text, kind, figure)
+        return figure
+
+    def put_json(self, name, version, text, kind, figure=None):
+        """Store already-serialised JSON, e.g. from an on-disk snapshot."""
+        with self._lock:
+            old = self._entries.pop((name, version), None)
+            if old is not None:
+                self.bytes -= len(old['json'])
+            self._entries[(name, version)] = {'json': text, 'kind': kind, 'figure': figure}
+            self.bytes += len(text)
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted['json'])
+
+    def get_or_build(self, name, version, build, *args):
+        """Cached figure for ``(name, version)``, calling ``build(*args)`` on a miss."""
+        figure = self.get(name, version)
+        if figure is None:
+            figure = self.put(name, version, build(*args))
+        return figure
+
+    def items(self):
+        """``(name, version, kind, json)`` for every entry, oldest first."""
+        with self._lock:
+            return [(name, version, e['kind'], e['json']) for (name, version), e in self._entries.items()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+# One cache per process, shared by every session and rerun
+DEFAULT_CACHE = FigureCache()
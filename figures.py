@@ -0,0 +1,212 @@
+"""Plotly figure builders for the dashboards and the batch reports.
+
+The dataset-only (selection-independent) figures never depend on widget
+state, so ``app.py`` and ``visuals.py`` fetch them through
+:mod:`figure_cache` instead of rebuilding them each rerun.  The per-team and
+per-player builders take the selection as arguments and are shared by
+``app.py`` and :mod:`reports`.  Plotly Express is imported inside each
+builder, so importing this module (as ``warmup`` and both dashboards do at
+startup) does not pay for it.
+"""
+import analytics
+from figure_cache import DEFAULT_CACHE
+
+
+def wickets_map(bundle):
+    """World choropleth of total wickets taken by each country."""
+    import plotly.express as px
+
+    total_wickets_map = analytics.wickets_by_team(bundle)
+
+    fig_map = px.choropleth(
+        total_wickets_map,
+        locations='team',
+        locationmode='country names',
+        color='wickets',
+        hover_name='team',
+        color_continuous_scale=px.colors.sequential.Plasma,
+        title='Total Wickets Taken by Country'
+    )
+
+    # Increase the size and enhance the appearance
+    fig_map.update_layout(
+        height=600,  # Increased height
+        geo=dict(
+            showframe=False,
+            showcoastlines=True,
+            projection_type='equirectangular'
+        ),
+        margin={"r":0,"t":50,"l":0,"b":0},
+        title_font_size=20,
+        title_x=0.5  # Center the title
+    )
+
+    # Improve the color scale with better formatting
+    fig_map.update_coloraxes(
+        colorbar=dict(
+            title="Wickets",
+            thickness=15,
+            len=0.75,
+            x=0.02,
+            y=0.5
+        )
+    )
+    return fig_map
+
+
+def create_death_overs_analysis(bundle):
+    """Analyze death overs (40-50) performance"""
+    import plotly.express as px
+
+    # Team performance by phase
+    phase_comparison = analytics.phase_stats(bundle, analytics.DEATH_OVERS_PHASES)
+
+    # Create the visualization
+    fig = px.bar(
+        phase_comparison,
+        x='team',
+        y='economy',
+        color='phase',
+        barmode='group',
+        title='Team Economy Rate by Match Phase',
+        hover_data=['wickets', 'conceded'],
+        labels={'economy': 'Economy Rate', 'team': 'Team'}
+    )
+    fig.update_layout(
+        xaxis_tickangle=45,
+        height=500,
+        showlegend=True
+    )
+    return fig
+
+
+def wickets_by_phase(bundle):
+    """Grouped bars of wickets per team in powerplay, middle and death overs."""
+    import plotly.express as px
+
+    phase_wickets_df = analytics.phase_stats(bundle, analytics.MATCH_PHASES)
+    fig_wickets_phase = px.bar(
+        phase_wickets_df,
+        x='team',
+        y='wickets',
+        color='phase',
+        barmode='group',
+        title='Wickets Taken by Team in Different Match Phases',
+        labels={'wickets': 'Total Wickets', 'team': 'Team'}
+    )
+    fig_wickets_phase.update_layout(xaxis_tickangle=45, height=500)
+    return fig_wickets_phase
+
+
+def matches_per_year(bundle, years=None, teams=None, venues=None):
+    """Bar chart of distinct matches per year after the sidebar filters."""
+    import plotly.express as px
+
+    table = analytics.matches_per_year(bundle, years, teams, venues)
+    fig = px.bar(
+        table,
+        x="year",
+        y="Match ID",
+        labels={"year": "Year", "Match ID": "Number of Matches"},
+        title="Matches per Year",
+        color="Match ID",  # optional for a color scale
+        text="Match ID"    # show values on bars
+    )
+
+    fig.update_traces(textposition="outside")  # place labels outside bars
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Number of Matches",
+        bargap=0.2
+    )
+    return fig
+
+
+def team_phase_wickets(bundle, team):
+    """Donut of ``team``'s wickets in each match phase."""
+    import plotly.express as px
+
+    return px.pie(
+        analytics.team_phase_stats(bundle, team),
+        values='wickets',
+        names='phase',
+        title=f'{team} - Wickets Distribution by Phase',
+        hole=0.4
+    )
+
+
+def team_phase_economy(bundle, team):
+    """Bars of ``team``'s economy rate in each match phase."""
+    import plotly.express as px
+
+    return px.bar(
+        analytics.team_phase_stats(bundle, team),
+        x='phase',
+        y='economy',
+        title=f'{team} - Economy Rate by Phase',
+        color='economy',
+        color_continuous_scale='RdYlGn_r'
+    )
+
+
+def bowler_vs_opposition(bundle, bowler):
+    """Bars of ``bowler``'s wickets against each opposition."""
+    import plotly.express as px
+
+    return px.bar(analytics.bowler_vs_opposition(bundle, bowler), x='opposition', y='wickets',
+                  title=f"{bowler}'s Wickets vs Opposition", color_discrete_sequence=px.colors.sequential.Aggrnyl)
+
+
+def top_partners(bundle, batsman, n=10):
+    """Bars of the runs ``batsman`` added with each of their top ``n`` partners."""
+    import plotly.express as px
+
+    return px.bar(analytics.top_partners(bundle, batsman, n), x='partner_name', y='partnership runs',
+                  title=f"Total Partnership Runs with {batsman}", color_discrete_sequence=px.colors.sequential.ice)
+
+
+def match_filter_defaults(bundle):
+    """The Visualizations sidebar's initial selection: every year and team, the first ten venues."""
+    options = analytics.match_filter_options(bundle)
+    return tuple(options['years']), tuple(options['teams']), tuple(options['venues'][:10])
+
+
+def default_matches_per_year(bundle):
+    """Matches per year for the sidebar's initial selection."""
+    return matches_per_year(bundle, *match_filter_defaults(bundle))
+
+
+# Static figures per dashboard: name -> builder taking only the bundle
+APP_STATIC = {
+    'wickets_map': wickets_map,
+    'death_overs': create_death_overs_analysis,
+    'wickets_by_phase': wickets_by_phase,
+}
+VISUALS_STATIC = {
+    'matches_per_year': default_matches_per_year,
+}
+
+
+def static_figure(name, bundle, cache=DEFAULT_CACHE):
+    """The cached figure for a registered static chart, built on first use."""
+    builders = {**APP_STATIC, **VISUALS_STATIC}
+    return cache.get_or_build(name, bundle.version, builders[name], bundle)
+
+
+def filtered_matches_per_year(bundle, years, teams, venues, cache=DEFAULT_CACHE):
+    """Matches-per-year chart for a sidebar selection, cached per dataset version.
+
+    The selection is keyed as sorted tuples, so the same filters picked in any
+    order share one entry; the initial selection is the warmed static figure.
+    """
+    selection = tuple(tuple(sorted(set(selected))) for selected in (years, teams, venues))
+    if selection == match_filter_defaults(bundle):
+        return static_figure('matches_per_year', bundle, cache)
+    return cache.get_or_build(('matches_per_year', *selection), bundle.version, matches_per_year, bundle, *selection)
+
+
+def warm(bundle, builders, cache=DEFAULT_CACHE):
+    """Build every figure in ``builders`` not yet cached for this version."""
+    for name, build in builders.items():
+        if (name, bundle.version) not in cache:
+            cache.put(name, bundle.version, build(bundle))
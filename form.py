@@ -0,0 +1,177 @@
+"""Rolling player form over time, from the per-match bowling and batting rows.
+
+Match dates are joined onto every bowling spell and batting innings once,
+and each role's appearances are sorted by player, then date.  One grouped
+pass stores, for every appearance, the player's running totals of each
+measure, so a player is a contiguous slice of a few numpy arrays.  A window
+ending at any appearance (the last N innings, or the last N months) is the
+difference of two running totals: the default window is computed for every
+player at build time, and a player's form chart for any window is a slice
+plus a subtraction, never a regroup of the source rows.
+
+Per-match batting scores are not in the data, so batting form uses the runs
+added in the stands a batsman was part of, and their dismissals.
+"""
+import numpy as np
+import pandas as pd
+
+from analytics import DatasetBundle, _over_balls, memoize
+
+ROLES = ('bowling', 'batting')
+WINDOW_UNITS = ('innings', 'months')
+DEFAULT_WINDOW = ('innings', 10)
+
+# Measures summed per appearance
+MEASURES = {
+    'bowling': ['innings', 'balls', 'conceded', 'wickets'],
+    'batting': ['innings', 'stand_runs', 'stand_balls', 'dismissals'],
+}
+# Rolling rates: name -> (numerator, denominator, scale)
+RATES = {
+    'bowling': {'economy': ('conceded', 'balls', 6), 'average': ('conceded', 'wickets', 1),
+                'strike_rate': ('balls', 'wickets', 1)},
+    'batting': {'runs_per_innings': ('stand_runs', 'innings', 1), 'stand_strike_rate': ('stand_runs', 'stand_balls', 100)},
+}
+METRICS = {role: [m for m in MEASURES[role] if m != 'innings'] + list(RATES[role]) for role in ROLES}
+
+# Player code stride in the (player, day) search keys; wider than any date range in days
+_KEY_SPAN = 1 << 20
+
+
+def _months_before(dates, n):
+    """The same day ``n`` months before each of ``dates``, clipped to the month's end."""
+    month = dates.astype('datetime64[M]')
+    offset = dates - month.astype('datetime64[D]')
+    target = month - n
+    length = (target + 1).astype('datetime64[D]') - target.astype('datetime64[D]')
+    return target.astype('datetime64[D]') + np.minimum(offset, length - 1)
+
+
+def _window_sums(running, positions, first, lo):
+    """Totals over rows ``lo``..``positions`` from running totals that restart at ``first``."""
+    earlier = running[np.maximum(lo - 1, 0)]
+    return running[positions] - np.where((lo > first)[:, None], earlier, 0)
+
+
+class FormSeries:
+    """One role's appearances, contiguous per player and in date order."""
+
+    def __init__(self, role, frame, window=DEFAULT_WINDOW):
+        measures = MEASURES[role]
+        frame = frame.dropna(subset=['player', 'date']).sort_values(['player', 'date', 'Match ID'], kind='stable')
+        codes, names = pd.factorize(frame['player'])
+        self.role = role
+        self.players = {name: i for i, name in enumerate(names)}
+        self.codes = codes.astype(np.int32)
+        counts = np.bincount(self.codes, minlength=len(names))
+        self.starts = np.concatenate([[0], np.cumsum(counts)])
+        self.dates = frame['date'].to_numpy().astype('datetime64[D]')
+        self.match_ids = frame['Match ID'].to_numpy()
+
+        values = frame[measures].fillna(0).to_numpy(dtype=np.float64)
+        totals = np.cumsum(values, axis=0)
+        before = np.vstack([np.zeros((1, len(measures))), totals])[self.starts[:-1]]
+        # Integral counts, so float32 running totals stay exact
+        self.running = (totals - np.repeat(before, counts, axis=0)).astype(np.float32)
+        self.window = window
+        self.rolling = self.window_sums(*window)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def names(self):
+        return sorted(self.players)
+
+    def window_sums(self, unit, n):
+        """Window totals ending at every appearance of every player, in one pass."""
+        positions = np.arange(len(self.codes))
+        first = self.starts[self.codes]
+        if unit == 'innings':
+            lo = np.maximum(first, positions - (n - 1))
+        else:
+            days = self.dates.astype(np.int64)
+            keys = self.codes * _KEY_SPAN + days
+            cutoff = self.codes * _KEY_SPAN + _months_before(self.dates, n).astype(np.int64)
+            lo = np.searchsorted(keys, cutoff, side='right')
+        return _window_sums(self.running, positions, first, lo)
+
+    def player(self, name, unit=DEFAULT_WINDOW[0], n=DEFAULT_WINDOW[1]) -> pd.DataFrame:
+        """``name``'s rolling form at each appearance; an empty frame for an unknown player."""
+        code = self.players.get(name)
+        start, stop = (0, 0) if code is None else self.starts[code:code + 2]
+        if (unit, n) == self.window:
+            sums = self.rolling[start:stop]
+        else:
+            positions = np.arange(stop - start)
+            dates = self.dates[start:stop]
+            if unit == 'innings':
+                lo = np.maximum(positions - (n - 1), 0)
+            else:
+                lo = np.searchsorted(dates, _months_before(dates, n), side='right')
+            sums = _window_sums(self.running[start:stop], positions, 0, lo)
+        return self._table(self.dates[start:stop], self.match_ids[start:stop], sums)
+
+    def _table(self, dates, match_ids, sums):
+        table = pd.DataFrame(sums.astype(np.float64), columns=MEASURES[self.role])
+        table.insert(0, 'date', dates)
+        table.insert(1, 'Match ID', match_ids)
+        for rate, (numerator, denominator, scale) in RATES[self.role].items():
+            below = table[denominator]
+            table[rate] = (table[numerator] * scale / below.where(below > 0)).round(2)
+        return table
+
+
+def _dated(frame, match_dates):
+    dates = match_dates.dropna(subset=['Match Date']).drop_duplicates('Match ID').set_index('Match ID')['Match Date']
+    return frame.assign(date=frame['Match ID'].map(dates))
+
+
+def bowling_appearances(bundle: DatasetBundle) -> pd.DataFrame:
+    """One row per bowling spell: player, match, date and the bowling measures."""
+    bowling = bundle.bowling
+    spells = pd.DataFrame({
+        'Match ID': bowling['Match ID'],
+        'player': bowling['player_name'],
+        'innings': 1,
+        'balls': _over_balls(bowling['overs'].to_numpy(dtype=float)),
+        'conceded': bowling['conceded'],
+        'wickets': bowling['wickets'],
+    })
+    return _dated(spells, bundle.match_dates)
+
+
+def batting_appearances(bundle: DatasetBundle) -> pd.DataFrame:
+    """One row per batting innings: stand runs and balls from partnerships, dismissals from FOW."""
+    partnership = bundle.partnership
+    stands = pd.concat([
+        partnership[['Match ID', name, 'partnership runs', 'partnership balls']].set_axis(
+            ['Match ID', 'player', 'stand_runs', 'stand_balls'], axis=1)
+        for name in ('player1_name', 'player2_name')
+    ])
+    stands = stands.groupby(['Match ID', 'player'])[['stand_runs', 'stand_balls']].sum()
+    dismissals = bundle.fow.groupby(['Match ID', 'player_name']).size().rename('dismissals')
+    dismissals.index.names = ['Match ID', 'player']
+    innings = stands.join(dismissals, how='outer').reset_index().assign(innings=1)
+    return _dated(innings, bundle.match_dates)
+
+
+@memoize
+def form_engine(bundle: DatasetBundle) -> dict:
+    """role -> FormSeries for the bundle's bowling and batting appearances."""
+    return {
+        'bowling': FormSeries('bowling', bowling_appearances(bundle)),
+        'batting': FormSeries('batting', batting_appearances(bundle)),
+    }
+
+
+@memoize
+def form_players(bundle: DatasetBundle, role: str) -> list:
+    """Sorted names of every player with at least one dated appearance in ``role``."""
+    return form_engine(bundle)[role].names()
+
+
+@memoize
+def player_form(bundle: DatasetBundle, role: str, player: str,
+                unit: str = DEFAULT_WINDOW[0], n: int = DEFAULT_WINDOW[1]) -> pd.DataFrame:
+    """``player``'s rolling ``role`` form over the last ``n`` innings or months, by date."""
+    return form_engine(bundle)[role].player(player, unit, n)
@@ -0,0 +1,290 @@
+"""Incremental ingestion of newly played matches.
+
+``append_match`` takes one match's summary row plus its bowling, FOW and
+partnership rows (and optionally batting rows), and
+
+* appends them to the clean tables and, when present, the raw exports, so a
+  later ``etl.py`` run reproduces the same state;
+* updates the career totals in ``Final_bowling_summary_final.csv`` and
+  ``player_batting_summary.csv`` for the players in the match only;
+* folds the match into the player, team, pair, phase and head-to-head
+  aggregates by appending one delta line to ``aggregates.log.jsonl``, which
+  :func:`analytics.load_bundle` replays to serve the head-to-head and
+  wickets-per-team views without regrouping the bowling rows;
+* bumps ``DATASET_VERSION`` so running dashboards reload on their next rerun.
+
+Apart from a duplicate check on the match summary's ``Match ID`` column and
+rewriting the two per-player career files, nothing reads the match history,
+so the cost grows with the size of the match rather than the size of the
+archive.  ``python ingest.py --rebuild`` recomputes the aggregate
+snapshot from the full tables and truncates the delta log.
+
+Usage::
+
+    python ingest.py match.json     # keys: match, bowling, fow, partnership, batting
+    python ingest.py --rebuild
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import results
+
+# Tables a match is appended to: clean file and the raw export it is built from
+APPEND_TARGETS = {
+    'bowling': ('bowling_clean.csv', 'odi_Bowling_new.csv'),
+    'fow': ('fow_clean.csv', 'odi_Fow_new.csv'),
+    'partnership': ('partnership_clean.csv', 'odi_Patnership_new.csv'),
+    'batting': ('odi_batting_new.csv',),
+}
+
+
+# --- Aggregate deltas ---
+def _key(*parts):
+    return '|'.join(str(p) for p in parts)
+
+
+def _player_key(player_id):
+    return str(int(player_id))
+
+
+def _records(frame, key_func):
+    """Turn a grouped-and-summed frame into ``{key: {column: number}}``."""
+    out = {}
+    for index, values in zip(frame.index, frame.to_dict('records')):
+        key = key_func(*index) if isinstance(index, tuple) else key_func(index)
+        out[key] = {k: float(v) for k, v in values.items()}
+    return out
+
+
+def compute_delta(match_rows, bowling, fow, partnership):
+    """Aggregate increments for any set of matches.
+
+    The same grouped sums serve a single new match and a full rebuild, so the
+    incremental and from-scratch aggregates cannot drift apart.
+    """
+    delta = {name: {} for name in analytics.AGGREGATE_SECTIONS}
+    delta['matches'] = sorted(int(m) for m in match_rows['Match ID'].unique())
+
+    # The rows analytics.load_bundle keeps, so the aggregates match the bundle
+    for predicate in analytics.TABLE_FILTERS['bowling']:
+        bowling = bowling[predicate.mask(bowling)]
+    spells = bowling.assign(spells=1)
+    stats = spells.groupby('bowler id')[['wickets', 'conceded', 'overs', 'spells']].sum()
+    delta['players'] = _records(stats, _player_key)
+    for player, count in fow.groupby('player').size().items():
+        delta['players'].setdefault(_player_key(player), {})['dismissals'] = float(count)
+
+    teams = pd.concat([
+        pd.DataFrame({'team': match_rows['Team1 Name'], 'matches': 1}),
+        pd.DataFrame({'team': match_rows['Team2 Name'], 'matches': 1}),
+    ]).dropna().groupby('team').sum()
+    teams['wins'] = match_rows['Match Winner'].value_counts()
+    teams = teams.join(spells.groupby('team')[['wickets', 'conceded']].sum(), how='outer')
+    delta['teams'] = _records(teams.fillna(0), _key)
+
+    pairs = partnership.dropna(subset=['player1', 'player2'])
+    first = np.minimum(pairs['player1'], pairs['player2']).astype('int64')
+    second = np.maximum(pairs['player1'], pairs['player2']).astype('int64')
+    pair_stats = pairs.assign(partnerships=1).groupby([first, second])[
+        ['partnership runs', 'partnership balls', 'partnerships']].sum()
+    delta['pairs'] = _records(pair_stats, _key)
+
+    for phase_name, start, end in analytics.MATCH_PHASES:
+        in_phase = spells[spells['overs'].between(start, end)]
+        stats = in_phase.groupby('team')[['wickets', 'conceded', 'economy', 'spells']].sum()
+        delta['phases'].update(_records(stats, lambda team: _key(team, phase_name)))
+
+    h2h = spells.groupby(['team', 'opposition'])[['wickets', 'conceded']].sum()
+    delta['h2h'] = _records(h2h, _key)
+    return delta
+
+
+def rebuild_aggregates(data_dir='.'):
+    """Recompute the aggregate snapshot from the full tables and clear the log."""
+    bundle = analytics.load_bundle(data_dir, analytics.APP_TABLES + ('matches',))
+    aggregates = analytics.apply_delta({}, compute_delta(bundle.matches, bundle.bowling, bundle.fow, bundle.partnership))
+    tmp = os.path.join(data_dir, analytics.AGGREGATES_FILE + '.tmp')
+    with open(tmp, 'w') as fh:
+        json.dump(aggregates, fh)
+    os.replace(tmp, os.path.join(data_dir, analytics.AGGREGATES_FILE))
+    open(os.path.join(data_dir, analytics.DELTA_LOG_FILE), 'w').close()
+    return aggregates
+
+
+# --- Table appends ---
+def _append_rows(path, rows):
+    """Append ``rows`` in the file's own column order; missing columns stay empty."""
+    columns = pd.read_csv(path, nrows=0).columns
+    rows.reindex(columns=columns).to_csv(path, mode='a', header=False, index=False)
+
+
+def _append_match_summary(data_dir, match_rows):
+    _append_rows(os.path.join(data_dir, 'Final_match_summary.csv'), match_rows)
+
+    info = pd.read_csv(os.path.join(data_dir, 'player_info_clean.csv'), usecols=['player_id', 'player_name'])
+    ids = info.drop_duplicates('player_name').set_index('player_name')['player_id']
+    cleaned = match_rows.assign(**{'MOM Player': match_rows['MOM Player'].map(ids).fillna(0).astype(float)})
+    cleaned = cleaned.join(results.parse_results(cleaned['Match Result Text']))
+    _append_rows(os.path.join(data_dir, 'cleaned_odi_match_summary.csv'), cleaned)
+
+    shared = ['Match ID', 'Match Date', 'Series Name', 'Match Winner',
+              'Match Venue (Stadium)', 'Match Venue (City)', 'Match Venue (Country)']
+    team_rows = pd.concat([
+        match_rows[shared].assign(**{
+            'team1 name': match_rows['Team1 Name'],
+            'team1 runs_scored': match_rows['Team1 Runs Scored'],
+            'team1 wickets_lost': match_rows['Team1 Wickets Fell'],
+        }),
+        match_rows[shared].assign(**{
+            'team2 name': match_rows['Team2 Name'],
+            ' Team2 runs_scored': match_rows['Team2 Runs Scored'],
+            'Team2 wickets_lost': match_rows['Team2 Wickets Fell'],
+        }),
+    ])
+    _append_rows(os.path.join(data_dir, 'cleaned_odi_team_summary.csv'), team_rows)
+
+
+def _write_csv(df, path):
+    tmp = path + '.tmp'
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _update_bowling_summary(data_dir, bowling):
+    """Add one match's figures to the career bowling totals of its bowlers."""
+    path = os.path.join(data_dir, 'Final_bowling_summary_final.csv')
+    summary = pd.read_csv(path).set_index('player_id')
+    balls = np.floor(bowling['overs']) * 6 + np.round((bowling['overs'] % 1) * 10)
+    match = bowling.assign(balls=balls).groupby('bowler id').agg(
+        total_overs=('overs', 'sum'),
+        total_balls=('balls', 'sum'),
+        total_runs=('conceded', 'sum'),
+        wickets=('wickets', 'sum'),
+        innings_bowled=('innings', 'nunique'),
+    )
+    match.index = match.index.astype(float)
+
+    new_ids = match.index.difference(summary.index)
+    if len(new_ids):
+        info = pd.read_csv(os.path.join(data_dir, 'player_info_clean.csv')).drop_duplicates('player_id')
+        info = info.set_index(info['player_id'].astype(float))
+        summary = pd.concat([summary, pd.DataFrame({
+            'player_name': info['player_name'].reindex(new_ids),
+            'bowling_style': info['bowling_style'].reindex(new_ids),
+            'innings_bowled': 0, 'total_overs': 0.0, 'total_balls': 0.0,
+            'total_runs': 0.0, 'economy': 0.0, 'wickets': 0.0,
+        }, index=new_ids)])
+
+    rows = match.index
+    for column in ['total_overs', 'total_balls', 'total_runs', 'wickets']:
+        summary.loc[rows, column] += match[column]
+    summary.loc[rows, 'innings_bowled'] = np.maximum(summary.loc[rows, 'innings_bowled'], match['innings_bowled'])
+    overs = summary.loc[rows, 'total_overs']
+    summary.loc[rows, 'economy'] = (summary.loc[rows, 'total_runs'] / overs.where(overs > 0)).fillna(0)
+    _write_csv(summary.rename_axis('player_id').reset_index(), path)
+
+
+def _update_batting_summary(data_dir, batting):
+    """Add one match's innings to the career batting totals of its batsmen."""
+    path = os.path.join(data_dir, 'player_batting_summary.csv')
+    summary = pd.read_csv(path).set_index('player_name')
+    info = pd.read_csv(os.path.join(data_dir, 'player_info_clean.csv'), usecols=['player_id', 'player_name'])
+    names = info.drop_duplicates('player_id').set_index('player_id')['player_name']
+    match = batting.assign(innings_batted=1, player_name=batting['batsman'].map(names)).dropna(subset=['player_name'])
+    match = match.groupby('player_name')[['innings_batted', 'runs', 'balls', 'fours', 'sixes']].sum()
+    match['matches_bat'] = 1
+
+    summary = summary.reindex(summary.index.union(match.index))
+    rows = match.index
+    for column in ['matches_bat', 'innings_batted', 'runs', 'balls', 'fours', 'sixes']:
+        summary.loc[rows, column] = summary.loc[rows, column].fillna(0) + match[column]
+    summary.loc[rows, 'bat_avg'] = summary.loc[rows, 'runs'] / summary.loc[rows, 'innings_batted']
+    balls = summary.loc[rows, 'balls']
+    summary.loc[rows, 'strike_rate'] = (summary.loc[rows, 'runs'] / balls.where(balls > 0) * 100).fillna(0)
+    summary = summary.reset_index()
+    _write_csv(summary[[*summary.columns[1:], 'player_name']], path)
+
+
+def bump_version(data_dir='.'):
+    """Increment the ingest counter that analytics.current_version hashes."""
+    path = os.path.join(data_dir, analytics.VERSION_FILE)
+    try:
+        with open(path) as fh:
+            version = int(fh.read().strip() or 0)
+    except FileNotFoundError:
+        version = 0
+    with open(path, 'w') as fh:
+        fh.write(f"{version + 1}\n")
+    return version + 1
+
+
+def append_match(match, bowling, fow, partnership, batting=None, data_dir='.'):
+    """Ingest one newly played match and return the new dataset version number.
+
+    ``match`` is a single match-summary row (dict or one-row DataFrame); the
+    other arguments are DataFrames or lists of dicts in the raw table layout.
+    """
+    match_rows = pd.DataFrame([match]) if isinstance(match, dict) else pd.DataFrame(match)
+    if len(match_rows) != 1:
+        raise ValueError("append_match expects exactly one match-summary row")
+    match_id = int(match_rows['Match ID'].iloc[0])
+    tables = {
+        'bowling': pd.DataFrame(bowling),
+        'fow': pd.DataFrame(fow),
+        'partnership': pd.DataFrame(partnership),
+    }
+    if batting is not None:
+        tables['batting'] = pd.DataFrame(batting)
+    for name, rows in tables.items():
+        if len(rows) and (rows['Match ID'] != match_id).any():
+            raise ValueError(f"{name} rows belong to a different match than {match_id}")
+
+    known = pd.read_csv(os.path.join(data_dir, 'Final_match_summary.csv'), usecols=['Match ID'])['Match ID']
+    if (known == match_id).any():
+        raise ValueError(f"Match {match_id} is already in the dataset")
+
+    for name, rows in tables.items():
+        for filename in APPEND_TARGETS[name]:
+            path = os.path.join(data_dir, filename)
+            if os.path.exists(path) and len(rows):
+                _append_rows(path, rows)
+    _append_match_summary(data_dir, match_rows)
+    _update_bowling_summary(data_dir, tables['bowling'])
+    if batting is not None:
+        _update_batting_summary(data_dir, tables['batting'])
+
+    delta = compute_delta(match_rows, tables['bowling'], tables['fow'], tables['partnership'])
+    with open(os.path.join(data_dir, analytics.DELTA_LOG_FILE), 'a') as fh:
+        fh.write(json.dumps(delta) + "\n")
+    return bump_version(data_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a newly played ODI into the dataset.")
+    parser.add_argument('match_file', nargs='?', help="JSON file with match, bowling, fow, partnership (and batting) rows")
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--rebuild', action='store_true', help="recompute the aggregate snapshot from scratch")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        aggregates = rebuild_aggregates(args.data_dir)
+        print(f"Rebuilt aggregates for {len(aggregates['matches'])} matches")
+    if args.match_file:
+        with open(args.match_file) as fh:
+            payload = json.load(fh)
+        version = append_match(
+            payload['match'], payload['bowling'], payload['fow'], payload['partnership'],
+            payload.get('batting'), data_dir=args.data_dir,
+        )
+        print(f"Ingested match {payload['match']['Match ID']}; dataset version {version}")
+    if not (args.rebuild or args.match_file):
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""Incrementally maintained top-k leaderboards.
+
+A leaderboard is one metric within one scope: every match (``'all'``), or
+one team, opposition or year.  Each is a bounded :class:`TopK` built once
+per dataset and then extended with the rows of newly ingested matches, the
+way :func:`ratings.team_ratings` extends its engine.  Each update is
+O(log k), and reading a board returns a cached, best-first tuple.
+
+Metrics:
+
+* ``wickets``: bowlers by total wickets (scopes: team, opposition, year);
+* ``partnerships``: individual stands by runs (team, opposition, year);
+* ``pairs``: batting pairs by combined stand runs (team, year);
+* ``team_runs``: teams by total runs scored (opposition, year).
+
+Scores only grow, so a key that drops out of an aggregate board can only
+re-enter it when its own total grows, which is when it is re-checked.  That
+holds because corrections are never patched in: the last engine is only
+extended while every match it applied has the same rows in every source
+table, and is rebuilt from scratch otherwise.
+"""
+import heapq
+import threading
+from functools import total_ordering
+
+import pandas as pd
+
+import analytics
+from analytics import DatasetBundle, applied_unchanged, match_digests, memoize
+
+LEADERBOARD_SIZE = 50
+SCOPES = ('all', 'team', 'opposition', 'year')
+SCOPE_LABELS = {'all': 'All matches', 'team': 'For team', 'opposition': 'Against', 'year': 'In year'}
+METRIC_SCOPES = {
+    'wickets': ('all', 'team', 'opposition', 'year'),
+    'partnerships': ('all', 'team', 'opposition', 'year'),
+    'pairs': ('all', 'team', 'year'),
+    'team_runs': ('all', 'opposition', 'year'),
+}
+# Source table of each metric
+METRIC_SOURCES = {'wickets': 'bowling', 'partnerships': 'partnership', 'pairs': 'partnership', 'team_runs': 'matches'}
+# metric -> (key column, score column) of its view
+VIEW_COLUMNS = {
+    'wickets': ('bowler', 'wickets'),
+    'partnerships': ('pair', 'partnership runs'),
+    'pairs': ('pair', 'partnership runs'),
+    'team_runs': ('team', 'runs'),
+}
+# Columns read from each source table; an edit to any of them for an applied
+# match means the engine is rebuilt
+SOURCE_COLUMNS = {
+    'bowling': ['Match ID', 'player_name', 'wickets', 'team', 'opposition'],
+    'partnership': ['Match ID', 'player1_name', 'player2_name', 'partnership runs', 'team', 'for wicket'],
+    'matches': ['Match ID', 'Team1 Name', 'Team2 Name', 'Team1 Runs Scored', 'Team2 Runs Scored', 'year'],
+    'match_dates': ['Match ID', 'Match Date'],
+}
+# Compact a heap once it holds this many entries per live member
+STALE_FACTOR = 4
+
+
+@total_ordering
+class _Descending:
+    """Wraps a key so that a later key in sort order compares lower."""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+class TopK:
+    """The ``k`` highest-scoring keys, in a min-heap whose root is the weakest.
+
+    :meth:`offer` ranks row-level entries whose score never changes, so
+    nothing outside the heap is kept.  :meth:`add` grows a key's running
+    total; every total is kept, since a key outside the top k can climb into
+    it.  A member whose score grows gets a new heap entry and its old one is
+    left in place as stale, skipped when it reaches the root (lazy
+    invalidation) and dropped when the heap is compacted.
+
+    Ties are broken the way a full sort of the source rows would: between
+    offered entries, the one offered first wins (``DataFrame.nlargest``
+    keeps the first row); between totals, the key that sorts first wins
+    (the order of a ``groupby`` before ``nlargest``).
+    """
+    __slots__ = ('k', 'heap', 'members', 'totals', 'seq', '_view')
+
+    def __init__(self, k=LEADERBOARD_SIZE):
+        self.k = k
+        # (score, tie rank, key) entries; members maps key -> its live entry
+        self.heap = []
+        self.members = {}
+        self.totals = {}
+        self.seq = 0
+        self._view = None
+
+    def __len__(self):
+        return len(self.members)
+
+    def _weakest(self):
+        heap, members = self.heap, self.members
+        while members.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _push(self, key, score, rank):
+        entry = (score, rank, key)
+        if key not in self.members and len(self.members) >= self.k:
+            weakest = self._weakest()
+            if entry[:2] <= weakest[:2]:
+                return
+            heapq.heappop(self.heap)
+            del self.members[weakest[2]]
+        self.members[key] = entry
+        heapq.heappush(self.heap, entry)
+        self._view = None
+        if len(self.heap) > STALE_FACTOR * self.k:
+            self.heap = list(self.members.values())
+            heapq.heapify(self.heap)
+
+    def offer(self, key, score):
+        """Rank a row-level entry with a fixed score."""
+        self.seq += 1
+        self._push(key, score, -self.seq)
+
+    def add(self, key, delta):
+        """Add ``delta`` (not negative) to ``key``'s total and re-rank it."""
+        total = self.totals.get(key, 0) + delta
+        self.totals[key] = total
+        self._push(key, total, _Descending(key))
+
+    def add_all(self, deltas):
+        """:meth:`add` each key of ``deltas``, a Series indexed by key in sorted order.
+
+        An empty board loads its totals and top k in one pass.
+        """
+        keys, values = deltas.index.tolist(), deltas.tolist()
+        if self.totals:
+            for key, delta in zip(keys, values):
+                self.add(key, delta)
+            return
+        self.totals = dict(zip(keys, values))
+        best = deltas.sort_values(ascending=False, kind='stable').head(self.k)
+        self.heap = [(total, _Descending(key), key) for key, total in zip(best.index.tolist(), best.tolist())]
+        heapq.heapify(self.heap)
+        self.members = {entry[2]: entry for entry in self.heap}
+        self._view = None
+
+    def top(self):
+        """(key, score) pairs, best first; cached until the board changes."""
+        if self._view is None:
+            self._view = tuple((key, score) for score, _, key in sorted(self.members.values(), reverse=True))
+        return self._view
+
+    def copy(self):
+        clone = TopK(self.k)
+        clone.heap = list(self.heap)
+        clone.members = dict(self.members)
+        clone.totals = dict(self.totals)
+        clone.seq = self.seq
+        clone._view = self._view
+        return clone
+
+
+def _pair_names(first, second):
+    """The two batsmen of each stand as (first, second) in name order."""
+    swap = first > second
+    return first.where(~swap, second), second.where(~swap, first)
+
+
+class Leaderboards:
+    def __init__(self, k=LEADERBOARD_SIZE):
+        self.k = k
+        # (metric, scope, scope value) -> TopK; the 'all' scope has value None
+        self.boards = {}
+        # Source table -> Match IDs already applied
+        self.seen = {}
+        # Per Match ID, digest of its rows across the source tables applied
+        self.digests = None
+
+    def board(self, metric, scope='all', value=None):
+        """The board for ``metric`` within ``scope``, or None if it has no entries."""
+        return self.boards.get((metric, scope, None if scope == 'all' else value))
+
+    def top(self, metric, scope='all', value=None, n=None):
+        """Up to ``n`` (key, score) pairs, best first."""
+        board = self.board(metric, scope, value)
+        return () if board is None else board.top()[:n]
+
+    def scope_values(self, metric, scope):
+        return sorted(value for m, s, value in self.boards if m == metric and s == scope)
+
+    def _board(self, metric, scope, value):
+        board = self.boards.get((metric, scope, value))
+        if board is None:
+            board = self.boards[metric, scope, value] = TopK(self.k)
+        return board
+
+    def _scoped(self, metric, rows):
+        """(scope, value, rows) for every scope of ``metric``; rows need a column per scope."""
+        for scope in METRIC_SCOPES[metric]:
+            if scope == 'all':
+                yield scope, None, rows
+            else:
+                for value, group in rows.groupby(scope, sort=False):
+                    yield scope, value, group
+
+    def _add_totals(self, metric, rows, key, score):
+        for scope, value, group in self._scoped(metric, rows):
+            self._board(metric, scope, value).add_all(group.groupby(key)[score].sum())
+
+    def _offer_rows(self, metric, rows, key, score):
+        rows = rows.sort_values(score, ascending=False, kind='stable')
+        for scope, value, group in self._scoped(metric, rows):
+            board = self._board(metric, scope, value)
+            # Rows outside the best k of their own batch cannot make the board
+            for name, points in zip(group[key].head(self.k).tolist(), group[score].head(self.k).tolist()):
+                board.offer(name, points)
+
+    def _new_rows(self, source, frame):
+        seen = self.seen.setdefault(source, set())
+        rows = frame[~frame['Match ID'].isin(seen)]
+        seen.update(rows['Match ID'].unique().tolist())
+        return rows
+
+    def extend(self, bundle):
+        """Apply the rows of every match not yet applied, per source table; returns how many rows."""
+        dates = bundle.match_dates if bundle.match_dates is not None else bundle.matches
+        years = {} if dates is None else dates.dropna(subset=['Match Date']).drop_duplicates('Match ID').set_index('Match ID')['Match Date'].dt.year
+        applied = 0
+
+        if bundle.bowling is not None:
+            rows = self._new_rows('bowling', bundle.bowling)
+            rows = rows[(rows['wickets'] > 0) & rows['player_name'].notna()]
+            self._add_totals('wickets', rows.assign(year=rows['Match ID'].map(years)), 'player_name', 'wickets')
+            applied += len(rows)
+
+        if bundle.partnership is not None:
+            rows = self._new_rows('partnership', bundle.partnership).dropna(subset=['partnership runs'])
+            rows = rows.assign(year=rows['Match ID'].map(years))
+            if bundle.bowling is not None:
+                # The side bowling at a batting team is its opposition
+                sides = bundle.bowling[['Match ID', 'opposition', 'team']].drop_duplicates(['Match ID', 'opposition'])
+                sides = sides.set_axis(['Match ID', 'team', 'opposition'], axis=1)
+                rows = rows.merge(sides, on=['Match ID', 'team'], how='left')
+            else:
+                rows = rows.assign(opposition=None)
+            # A stand is keyed by its batsmen in order plus where it happened.  Stands
+            # with an unknown batsman stay on the board, as in a full sort of the
+            # rows, and are left out when it is read
+            stands = rows.assign(entry=list(zip(rows['player1_name'] + " & " + rows['player2_name'], rows['team'],
+                                                rows['for wicket'], rows['Match ID'])))
+            self._offer_rows('partnerships', stands, 'entry', 'partnership runs')
+            named = rows.dropna(subset=['player1_name', 'player2_name'])
+            first, second = _pair_names(named['player1_name'], named['player2_name'])
+            self._add_totals('pairs', named.assign(first=first, second=second), ['first', 'second'], 'partnership runs')
+            applied += len(rows)
+
+        if bundle.matches is not None:
+            rows = self._new_rows('matches', bundle.matches)
+            sides = pd.concat([
+                pd.DataFrame({'team': rows['Team1 Name'], 'opposition': rows['Team2 Name'], 'runs': rows['Team1 Runs Scored'], 'year': rows['year']}),
+                pd.DataFrame({'team': rows['Team2 Name'], 'opposition': rows['Team1 Name'], 'runs': rows['Team2 Runs Scored'], 'year': rows['year']}),
+            ]).dropna(subset=['team', 'runs'])
+            self._add_totals('team_runs', sides, 'team', 'runs')
+            applied += len(rows)
+        return applied
+
+    def copy(self):
+        clone = Leaderboards(self.k)
+        clone.boards = {name: board.copy() for name, board in self.boards.items()}
+        clone.seen = {source: set(ids) for source, ids in self.seen.items()}
+        return clone
+
+
+# Last engine built per set of source tables, extended by the next version
+_latest = {}
+_latest_lock = threading.Lock()
+
+
+def _sources(bundle):
+    return tuple(name for name in SOURCE_COLUMNS if getattr(bundle, name) is not None)
+
+
+def source_digests(bundle: DatasetBundle) -> pd.Series:
+    """Per Match ID, one digest over that match's rows in every source table."""
+    return pd.concat([match_digests(getattr(bundle, name), SOURCE_COLUMNS[name])
+                      for name in _sources(bundle)]).groupby(level=0).sum()
+
+
+@memoize
+def leaderboards(bundle: DatasetBundle) -> Leaderboards:
+    """Every leaderboard for ``bundle``, extending the last engine built when possible.
+
+    The last engine is only extended while the rows of every match it applied
+    are unchanged; a corrected or removed match rebuilds it.
+    """
+    sources = _sources(bundle)
+    digests = source_digests(bundle)
+    with _latest_lock:
+        previous = _latest.get(sources)
+    if previous is not None and applied_unchanged(previous.digests, digests):
+        engine = previous.copy()
+    else:
+        engine = Leaderboards()
+    engine.extend(bundle)
+    engine.digests = digests
+    with _latest_lock:
+        current = _latest.get(sources)
+        if current is None or sum(map(len, engine.seen.values())) >= sum(map(len, current.seen.values())):
+            _latest[sources] = engine
+    return engine
+
+
+@memoize
+def scope_values(bundle: DatasetBundle, metric: str, scope: str) -> list:
+    """Teams, oppositions or years that ``metric`` has a board for."""
+    return leaderboards(bundle).scope_values(metric, scope)
+
+
+@memoize
+def leaderboard(bundle: DatasetBundle, metric: str, scope: str = 'all', value=None, n: int = 10) -> pd.DataFrame:
+    """The top ``n`` of ``metric`` within ``scope``, best first.
+
+    As in :func:`analytics.top_partnerships`, stands with an unknown batsman
+    count towards the ``n`` but are not listed.
+    """
+    key, score = VIEW_COLUMNS[metric]
+    rows = leaderboards(bundle).top(metric, scope, value, n)
+    if metric == 'partnerships':
+        rows = [(*entry[:3], points) for entry, points in rows if isinstance(entry[0], str)]
+        return pd.DataFrame(rows, columns=['pair', 'team', 'for wicket', 'partnership runs'])[['pair', 'partnership runs', 'team', 'for wicket']]
+    if metric == 'pairs':
+        rows = [(f"{first} & {second}", points) for (first, second), points in rows]
+    return pd.DataFrame(rows, columns=[key, score])
+
+
+def top_partnerships(bundle: DatasetBundle, n: int) -> pd.DataFrame:
+    """The ``n`` highest individual partnerships; past the board size, a full sort."""
+    if n > LEADERBOARD_SIZE:
+        return analytics.top_partnerships(bundle, n)
+    return leaderboard(bundle, 'partnerships', 'all', None, n)
+
+
+def prolific_pairs(bundle: DatasetBundle, n: int) -> pd.DataFrame:
+    """The ``n`` batting pairs with the most combined partnership runs."""
+    if n > LEADERBOARD_SIZE:
+        return analytics.prolific_pairs(bundle, n)
+    return leaderboard(bundle, 'pairs', 'all', None, n)
@@ -0,0 +1,183 @@
+"""Venue and toss outcome cube over the match summary.
+
+Every match is reduced once to integer-coded dimensions (venue, year, toss
+winner, toss decision and the two teams) and numeric measures (matches, toss
+winner wins, batting-first wins, decided matches and first-innings runs).
+Matches sharing all dimensions are merged into one cell.  City and country
+are attributes of the venue, looked up through the venue code.
+
+A roll-up or drill-down is then a boolean lookup per sidebar filter and one
+``np.bincount`` per measure over a few thousand cells, with no pandas
+grouping on the query path.
+
+The summaries do not record who batted first; Team 1 is assumed to have.
+Every wickets win in the data goes to Team 2 and about 98% of runs wins to
+Team 1, which fits the assumption, so ``bat_first_win_pct`` and
+``avg_first_innings`` are wrong only for the remaining few matches.  The toss
+decision is inferred the same way: ``bat`` when the toss winner is Team 1,
+``field`` when it is Team 2.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics import DatasetBundle, memoize
+
+DIMENSIONS = ('country', 'city', 'venue', 'year', 'toss_winner', 'toss_decision', 'batting_first')
+MEASURES = ('matches', 'toss_winner_wins', 'bat_first_wins', 'decided', 'first_innings_runs', 'first_innings')
+ROLLUP_COLUMNS = ['matches', 'toss_winner_wins', 'bat_first_wins', 'toss_win_pct', 'bat_first_win_pct', 'avg_first_innings']
+
+
+def _codes(values):
+    """Sorted labels plus the code of each value; missing values get their own label."""
+    codes, labels = pd.factorize(pd.Series(values), sort=True, use_na_sentinel=False)
+    return codes.astype(np.int32), np.asarray(labels, dtype=object)
+
+
+def _level(labels, codes):
+    """MultiIndex level and codes for ``labels[codes]``; a missing label becomes code -1."""
+    missing = pd.isna(labels)
+    remap = np.cumsum(~missing) - 1
+    remap[missing] = -1
+    return pd.Index(labels[~missing], dtype=object), remap[codes]
+
+
+@dataclass(frozen=True, eq=False)
+class MatchCube:
+    """Coded cells and measures; see the module docstring.
+
+    ``values`` holds one row per entry of :data:`MEASURES` and one column
+    per cell, and ``positions`` maps each dimension's labels back to codes.
+    """
+    codes: dict
+    labels: dict
+    positions: dict
+    values: np.ndarray
+    venue_city: np.ndarray
+    venue_country: np.ndarray
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def _dimension(self, name):
+        """Per-cell codes and labels for ``name``, resolving venue attributes."""
+        if name == 'city':
+            return self.venue_city[self.codes['venue']], self.labels['city']
+        if name == 'country':
+            return self.venue_country[self.codes['venue']], self.labels['country']
+        if name == 'batting_first':
+            return self.codes['team1'], self.labels['team']
+        return self.codes[name], self.labels[name]
+
+    def _allowed(self, name, selected):
+        """Boolean lookup by code: True for labels in ``selected``."""
+        positions = self.positions[name]
+        allowed = np.zeros(len(self.labels[name]), dtype=bool)
+        allowed[[positions[label] for label in selected if label in positions]] = True
+        return allowed
+
+    def mask(self, years=None, teams=None, venues=None):
+        """Cells matching the sidebar filters; None means no filter."""
+        keep = np.ones(len(self), dtype=bool)
+        if years is not None:
+            keep &= self._allowed('year', years)[self.codes['year']]
+        if venues is not None:
+            keep &= self._allowed('venue', venues)[self.codes['venue']]
+        if teams is not None:
+            involved = self._allowed('team', teams)
+            keep &= involved[self.codes['team1']] | involved[self.codes['team2']]
+        return keep
+
+    def rollup(self, by, years=None, teams=None, venues=None) -> pd.DataFrame:
+        """Measures grouped by the dimensions in ``by`` (one name or a sequence).
+
+        The result is indexed by those dimensions.  Rates are percentages of
+        decided matches; ``avg_first_innings`` is the mean first-innings total.
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        dims = [self._dimension(name) for name in by]
+        shape = tuple(len(labels) for _, labels in dims)
+        size = int(np.prod(shape))
+        # Filtered-out cells go to one extra bin instead of being copied out
+        group = np.ravel_multi_index(tuple(codes for codes, _ in dims), shape)
+        group = np.where(self.mask(years, teams, venues), group, size)
+        totals = [np.bincount(group, weights=column, minlength=size + 1)[:size] for column in self.values]
+
+        present = np.flatnonzero(totals[0])
+        matches, toss_wins, bat_first_wins, decided, runs, innings = (column[present] for column in totals)
+        decided = np.where(decided > 0, decided, np.nan)
+        innings = np.where(innings > 0, innings, np.nan)
+        block = np.column_stack([
+            matches, toss_wins, bat_first_wins,
+            np.round(toss_wins / decided * 100, 1),
+            np.round(bat_first_wins / decided * 100, 1),
+            np.round(runs / innings, 1),
+        ])
+        positions = np.unravel_index(present, shape)
+        if len(by) == 1:
+            index = pd.Index(dims[0][1][positions[0]], name=by[0], dtype=object)
+        else:
+            # Built from codes directly; factorising the labels again costs ~1ms
+            levels, codes = zip(*(_level(labels, i) for (_, labels), i in zip(dims, positions)))
+            index = pd.MultiIndex(levels=levels, codes=codes, names=by, verify_integrity=False)
+        return pd.DataFrame(block, index=index, columns=ROLLUP_COLUMNS)
+
+
+@memoize
+def match_cube(bundle: DatasetBundle) -> MatchCube:
+    """Build the cube from ``bundle.matches`` in one vectorised pass."""
+    matches = bundle.matches
+    team1, team2 = matches['Team1 Name'], matches['Team2 Name']
+    toss, winner = matches['Toss Winner'], matches['Match Winner']
+    decision = np.select([(toss == team1).to_numpy(), (toss == team2).to_numpy()], ['bat', 'field'], default=None)
+
+    # Teams share one code space so the involvement filter is a single lookup
+    team_codes, team_labels = _codes(pd.concat([team1, team2], ignore_index=True))
+    venue_codes, venue_labels = _codes(matches['Match Venue (Stadium)'])
+    keys = {
+        'venue': venue_codes,
+        'year': _codes(matches['year'])[0],
+        'toss_winner': _codes(toss)[0],
+        'toss_decision': _codes(decision)[0],
+        'team1': team_codes[:len(matches)],
+        'team2': team_codes[len(matches):],
+    }
+    labels = {
+        'venue': venue_labels,
+        'year': _codes(matches['year'])[1],
+        'toss_winner': _codes(toss)[1],
+        'toss_decision': _codes(decision)[1],
+        'team': team_labels,
+    }
+
+    runs = matches['Team1 Runs Scored']
+    facts = pd.DataFrame({
+        **keys,
+        'matches': 1,
+        'toss_winner_wins': (winner == toss).to_numpy(dtype=int),
+        'bat_first_wins': (winner == team1).to_numpy(dtype=int),
+        'decided': winner.notna().to_numpy(dtype=int),
+        'first_innings_runs': runs.fillna(0).to_numpy(),
+        'first_innings': runs.notna().to_numpy(dtype=int),
+    })
+    cells = facts.groupby(list(keys), sort=False).sum().reset_index()
+
+    # Venue -> city / country, taking the most common spelling per venue
+    places = pd.DataFrame({'venue': venue_codes,
+                           'city': matches['Match Venue (City)'].to_numpy(),
+                           'country': matches['Match Venue (Country)'].to_numpy()})
+    per_venue = places.groupby('venue').agg(lambda s: s.mode().iat[0] if s.notna().any() else np.nan)
+    per_venue = per_venue.reindex(range(len(venue_labels)))
+    city_codes, city_labels = _codes(per_venue['city'])
+    country_codes, country_labels = _codes(per_venue['country'])
+    labels.update(city=city_labels, country=country_labels)
+
+    return MatchCube(
+        codes={name: cells[name].to_numpy(dtype=np.int32) for name in keys},
+        labels=labels,
+        positions={name: {label: i for i, label in enumerate(values)} for name, values in labels.items()},
+        values=np.ascontiguousarray(cells[list(MEASURES)].to_numpy(dtype=float).T),
+        venue_city=city_codes,
+        venue_country=country_codes,
+    )
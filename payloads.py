@@ -0,0 +1,118 @@
+"""ECharts option builders for the dashboard views.
+
+Each builder turns an analytics result table straight into a compact option
+dict: chart data goes into a column-keyed ``dataset`` converted with
+``tolist()``, and per-item colours go into a palette array applied with
+``colorBy: 'data'`` rather than a dict per bar.  Builders are memoised like
+the analytics queries, per (view, parameters, dataset version).
+"""
+import numpy as np
+
+import analytics
+from analytics import memoize
+
+PALETTE = [
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
+]
+GRID = {"left": "3%", "right": "4%", "bottom": "15%", "containLabel": True}
+
+
+def team_colors(teams):
+    """Assign palette colours to ``teams`` in order, cycling after ten."""
+    return dict(zip(teams, np.resize(PALETTE, len(teams)).tolist()))
+
+
+def _title(text):
+    return {"text": text, "left": "center", "textStyle": {"fontSize": 16, "fontWeight": "bold"}}
+
+
+def bar_chart(names, values, title, series_name, y_name, colors=None):
+    """Category bar chart with value labels; ``colors`` is one colour per bar."""
+    option = {
+        "title": _title(title),
+        "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
+        "dataset": {"source": {"name": list(names), "value": list(values)}},
+        "xAxis": {"type": "category", "axisLabel": {"rotate": 45}},
+        "yAxis": {"type": "value", "name": y_name},
+        "series": [{
+            "name": series_name,
+            "type": "bar",
+            "encode": {"x": "name", "y": "value"},
+            "label": {"show": True, "position": "top", "formatter": "{@value}"},
+        }],
+        "grid": GRID,
+    }
+    if colors is not None:
+        option["color"] = list(colors)
+        option["series"][0]["colorBy"] = "data"
+    return option
+
+
+@memoize
+def wickets_chart(bundle, teams):
+    """Total wickets for the selected teams, one colour per team."""
+    table = analytics.wickets_by_team(bundle, teams)
+    names = table['team'].tolist()
+    colors = team_colors(names)
+    return bar_chart(names, table['wickets'].tolist(), "Total Wickets Taken (Selected Teams)",
+                     "Wickets", "Wickets", [colors[t] for t in names])
+
+
+@memoize
+def average_partnership_chart(bundle, teams):
+    """Mean partnership runs, coloured to match the wickets chart."""
+    colors = team_colors(analytics.wickets_by_team(bundle, teams)['team'].tolist())
+    table = analytics.average_partnership(bundle, teams)
+    names = table['team'].tolist()
+    return bar_chart(names, table['partnership runs'].tolist(), "Average Partnership Runs by Team",
+                     "Average Partnership Runs", "Average Runs", [colors.get(t, PALETTE[0]) for t in names])
+
+
+@memoize
+def h2h_chart(bundle, team1, team2):
+    """Side-by-side wickets for a head-to-head pairing."""
+    team1_wickets, team2_wickets = analytics.h2h(bundle, team1, team2)['wickets'].tolist()
+    label = {"show": True, "position": "top", "formatter": "{c}"}
+    return {
+        "title": _title(f"Head-to-Head: {team1} vs {team2}"),
+        "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
+        "legend": {"data": [team1, team2], "top": "bottom"},
+        "xAxis": {"type": "category", "data": ["Wickets"]},
+        "yAxis": {"type": "value", "name": "Wickets"},
+        "series": [
+            {"name": team1, "type": "bar", "data": [team1_wickets], "itemStyle": {"color": PALETTE[0]}, "label": label},
+            {"name": team2, "type": "bar", "data": [team2_wickets], "itemStyle": {"color": PALETTE[1]}, "label": label},
+        ],
+        "grid": GRID,
+    }
+
+
+@memoize
+def dismissal_donut(bundle, batsman):
+    """Donut of the wicket positions at which ``batsman`` was dismissed."""
+    counts = analytics.dismissal_positions(bundle, batsman)
+    return {
+        "title": _title(f"Dismissal Position for {batsman}"),
+        "tooltip": {
+            "trigger": "item",
+            "formatter": "<b>Wicket Position:</b> {b}<br><b>Times Dismissed:</b> {@value}<br><b>Percentage:</b> {d}%"
+        },
+        "legend": {"orient": "vertical", "left": "left", "top": "middle"},
+        "dataset": {"source": {
+            "name": counts['wicket_label'].tolist(),
+            "value": counts['count'].astype(int).tolist(),
+        }},
+        "series": [{
+            "name": "Dismissal Position",
+            "type": "pie",
+            "radius": ["40%", "70%"],
+            "avoidLabelOverlap": False,
+            "encode": {"itemName": "name", "value": "value"},
+            "itemStyle": {"borderRadius": 10, "borderColor": "#fff", "borderWidth": 2},
+            "label": {"show": True, "formatter": "{b}: {@value} ({d}%)"},
+            "emphasis": {"label": {"show": True, "fontSize": "16", "fontWeight": "bold"}},
+            "labelLine": {"show": True},
+        }],
+        "color": PALETTE,
+    }
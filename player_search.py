@@ -0,0 +1,186 @@
+"""Search-as-you-type index over player names for the dashboard selectors.
+
+Names come from ``player_info`` and are restricted to the players the
+selector covers: bowlers with a wicket, or batsmen seen in a partnership or
+dismissal.  Ids are ranks, most wickets (or stand runs) first.  Names are
+normalised (accents stripped, lower case, punctuation to spaces).  Every
+suffix that starts at a word goes into a prefix trie, so "tendul" and
+"sachin t" both find Sachin Tendulkar.  Each trie node keeps the ids of its
+best ``MAX_MATCHES`` names, so a prefix query is one walk down the trie,
+with no scan of the names below the node.  When the prefix finds too few
+names, a trigram index fills in typo-tolerant matches, scored by the share
+of the query's trigrams a name contains.
+
+The trie and the trigram postings are flat numpy arrays, so an index
+restored from a snapshot is memory-mapped like the tables.
+"""
+import re
+import unicodedata
+
+import numpy as np
+
+import analytics
+from analytics import DatasetBundle, memoize
+
+ROLES = ('bowler', 'batsman')
+MAX_MATCHES = 10
+# Share of the query's trigrams a fuzzy match must contain
+MIN_TRIGRAM_SHARE = 0.5
+
+
+def normalise(text):
+    """Lower case ASCII words: accents stripped, punctuation and runs of spaces collapsed."""
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', text.lower()).split())
+
+
+def trigrams(term):
+    """Trigrams of each word, padded so that word starts carry more weight."""
+    grams = set()
+    for word in term.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _keys(term):
+    words = term.split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class SearchIndex:
+    """Prefix trie plus trigram index over ranked names, stored as flat arrays."""
+
+    def __init__(self, names, limit=MAX_MATCHES):
+        # ``names`` in rank order; a name's id is its rank
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.limit = limit
+        terms = [normalise(name) for name in self.names]
+
+        # Nested-dict trie first; ids arrive in rank order, so each node's list is best-first
+        root = {}
+        for rank, term in enumerate(terms):
+            for key in _keys(term):
+                node = root
+                for ch in key:
+                    node = node.setdefault(ch, {})
+                    top = node.setdefault(None, [])
+                    if len(top) < limit and (not top or top[-1] != rank):
+                        top.append(rank)
+
+        # Flattened breadth first: a node's children are contiguous and sorted by character
+        nodes, chars, firsts, counts = [root], [0], [], []
+        for node in nodes:
+            children = sorted((ch, child) for ch, child in node.items() if ch is not None)
+            firsts.append(len(nodes))
+            counts.append(len(children))
+            for ch, child in children:
+                nodes.append(child)
+                chars.append(ord(ch))
+        self.node_char = np.array(chars, dtype=np.int32)
+        self.node_first = np.array(firsts, dtype=np.int32)
+        self.node_count = np.array(counts, dtype=np.int32)
+        tops = [node.get(None, ()) for node in nodes]
+        lengths = np.array([len(top) for top in tops])
+        rows = np.repeat(np.arange(len(nodes)), lengths)
+        columns = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.node_top = np.full((len(nodes), limit), -1, dtype=np.int32)
+        self.node_top[rows, columns] = [rank for top in tops for rank in top]
+
+        # Trigram postings: ids of every name containing each trigram
+        postings = {}
+        grams = [trigrams(term) for term in terms]
+        for rank, term_grams in enumerate(grams):
+            for gram in term_grams:
+                postings.setdefault(gram, []).append(rank)
+        self.gram_slot = {gram: i for i, gram in enumerate(postings)}
+        self.gram_start = np.cumsum([0] + [len(ids) for ids in postings.values()]).astype(np.int32)
+        self.gram_ids = np.array([rank for ids in postings.values() for rank in ids], dtype=np.int32)
+        self.gram_count = np.array([len(term_grams) for term_grams in grams], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    @property
+    def default(self):
+        """The first name alphabetically, as in the sorted selector lists, or None for an empty index."""
+        return min(self.names) if self.names else None
+
+    def _node(self, term):
+        """Trie node reached by ``term``, or -1 if no name has that prefix."""
+        node = 0
+        for ch in term:
+            first = self.node_first[node]
+            last = first + self.node_count[node]
+            child = first + np.searchsorted(self.node_char[first:last], ord(ch))
+            if child >= last or self.node_char[child] != ord(ch):
+                return -1
+            node = child
+        return node
+
+    def prefix(self, term):
+        """Ids of the best names with a word-start prefix of ``term``, best first."""
+        node = self._node(term)
+        if node < 0:
+            return []
+        top = self.node_top[node]
+        return top[top >= 0].tolist()
+
+    def fuzzy(self, term, limit, exclude=()):
+        """Ids of names sharing most of ``term``'s trigrams, best match first."""
+        grams = trigrams(term)
+        slots = [self.gram_slot[gram] for gram in grams if gram in self.gram_slot]
+        needed = int(np.ceil(MIN_TRIGRAM_SHARE * len(grams)))
+        if not slots or len(slots) < needed:
+            return []
+        hits = np.concatenate([self.gram_ids[self.gram_start[s]:self.gram_start[s + 1]] for s in slots])
+        shared = np.bincount(hits, minlength=len(self.names))
+        candidates = np.flatnonzero(shared >= max(needed, 1))
+        candidates = candidates[~np.isin(candidates, list(exclude))]
+        # Most shared trigrams first, then the closest length, then rank
+        extra = self.gram_count[candidates] - shared[candidates]
+        order = np.lexsort((candidates, extra, -shared[candidates]))
+        return candidates[order[:limit]].tolist()
+
+    def search(self, query, limit=None):
+        """Up to ``limit`` names matching ``query``: prefix matches, then fuzzy ones."""
+        limit = min(limit or self.limit, self.limit)
+        term = normalise(query or '')
+        if not term:
+            return self.names[:limit]
+        ids = self.prefix(term)[:limit]
+        if len(ids) < limit:
+            ids += self.fuzzy(term, limit - len(ids), ids)
+        return [self.names[i] for i in ids]
+
+
+def _ranked(names, weights, known):
+    names = [name for name in names if name in known]
+    return sorted(names, key=lambda name: (-weights.get(name, 0), name))
+
+
+@memoize
+def search_indexes(bundle: DatasetBundle) -> dict:
+    """role -> SearchIndex for the bowler and batsman selectors."""
+    known = set(bundle.player_info['player_name'].dropna())
+    wickets = bundle.bowling.groupby('player_name')['wickets'].sum().to_dict()
+    partnership = bundle.partnership
+    stand_runs = (partnership.groupby('player1_name')['partnership runs'].sum()
+                  .add(partnership.groupby('player2_name')['partnership runs'].sum(), fill_value=0)).to_dict()
+    return {
+        'bowler': SearchIndex(_ranked(analytics.bowler_list(bundle), wickets, known)),
+        'batsman': SearchIndex(_ranked(analytics.batsman_list(bundle), stand_runs, known)),
+    }
+
+
+def search_index(bundle: DatasetBundle, role: str) -> SearchIndex:
+    return search_indexes(bundle)[role]
+
+
+def search(bundle: DatasetBundle, role: str, query: str, limit: int = MAX_MATCHES) -> list:
+    """Best ``role`` names for ``query``, most relevant first."""
+    return search_indexes(bundle)[role].search(query, limit)
@@ -0,0 +1,132 @@
+"""Background prefetch of the selections a user is likely to pick next.
+
+While a chart is on screen, the dashboard hands the :class:`Prefetcher` in
+its session state the memoised calls behind the next few options, such as
+the other opponents of the chosen Team 1 or the bowlers next to the chosen
+one.  They run on a small shared thread pool and land in the analytics
+memo caches, so the next click renders from cache.
+
+Each view schedules on its own channel.  A new batch on a channel cancels the
+previous one: queued calls are dropped and calls not yet started are
+skipped.  A batch runs at most ``PREFETCH_CALLS`` calls within
+``PREFETCH_SECONDS``, and the pool has ``PREFETCH_WORKERS`` threads however
+many sessions are open.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PREFETCH_WORKERS = 2
+PREFETCH_CALLS = 12
+PREFETCH_SECONDS = 3.0
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(PREFETCH_WORKERS, thread_name_prefix='prefetch')
+        return _executor
+
+
+def neighbours(items, current, n):
+    """Up to ``n`` entries of ``items`` nearest to ``current``: next, previous, next but one, ..."""
+    try:
+        i = items.index(current)
+    except ValueError:
+        return list(items[:n])
+    found = []
+    for step in range(1, len(items)):
+        found.extend(items[j] for j in (i + step, i - step) if 0 <= j < len(items))
+        if len(found) >= n:
+            break
+    return found[:n]
+
+
+def following(items, current, n):
+    """Up to ``n`` entries after ``current`` in ``items``, wrapping round and skipping it."""
+    start = items.index(current) + 1 if current in items else 0
+    rotated = list(items[start:]) + list(items[:start])
+    return [item for item in rotated if item != current][:n]
+
+
+class _Batch:
+    def __init__(self, key, deadline):
+        self.key = key
+        self.deadline = deadline
+        self.cancelled = threading.Event()
+        self.futures = []
+
+    def done(self):
+        return all(future.done() for future in self.futures)
+
+    def cancel(self):
+        self.cancelled.set()
+        for future in self.futures:
+            future.cancel()
+
+
+class Prefetcher:
+    """Per-session handle on the shared prefetch pool; one live batch per channel."""
+
+    def __init__(self, calls=PREFETCH_CALLS, seconds=PREFETCH_SECONDS):
+        self.calls = calls
+        self.seconds = seconds
+        self.batches = {}
+        self.completed = 0
+        self.lock = threading.Lock()
+
+    def schedule(self, channel, bundle, calls):
+        """Run ``calls`` (``(function, args)`` pairs) for ``bundle`` in the background.
+
+        Replaces any earlier batch on ``channel``.  Scheduling the same calls
+        again, as every Streamlit rerun does, keeps the running batch.
+        """
+        calls = list(calls)[:self.calls]
+        key = (bundle.version, tuple((func.__qualname__, args) for func, args in calls))
+        with self.lock:
+            previous = self.batches.get(channel)
+            if previous is not None and previous.key == key and not previous.cancelled.is_set():
+                return previous
+            if previous is not None:
+                previous.cancel()
+            batch = self.batches[channel] = _Batch(key, time.monotonic() + self.seconds)
+            pool = _pool()
+            batch.futures = [pool.submit(self._run, batch, func, bundle, args) for func, args in calls]
+        return batch
+
+    def _run(self, batch, func, bundle, args):
+        if batch.cancelled.is_set() or time.monotonic() > batch.deadline:
+            return
+        try:
+            func(bundle, *args)
+        except Exception:
+            # Best effort: the foreground call will raise it properly if it matters
+            return
+        with self.lock:
+            self.completed += 1
+
+    def cancel(self, channel=None):
+        """Cancel the batch on ``channel``, or every batch."""
+        with self.lock:
+            channels = list(self.batches) if channel is None else [channel]
+            for name in channels:
+                batch = self.batches.pop(name, None)
+                if batch is not None:
+                    batch.cancel()
+
+    def pending(self):
+        """Channels whose latest batch is still running."""
+        with self.lock:
+            return [name for name, batch in self.batches.items() if not batch.done()]
+
+
+def for_session(state):
+    """The :class:`Prefetcher` stored in a Streamlit ``session_state``."""
+    prefetcher = state.get('prefetcher')
+    if prefetcher is None:
+        prefetcher = state['prefetcher'] = Prefetcher()
+    return prefetcher
@@ -0,0 +1,192 @@
+"""Incremental Elo ratings for ODI teams with point-in-time lookups.
+
+Matches are rated in date order, each one an O(1) update of the two teams'
+ratings.  Every rated match keeps both teams' post-match ratings, and every
+``CHECKPOINT_EVERY`` matches the whole table is copied into a checkpoint.  The
+table as of any date is then a binary search for the last match on or before
+it, plus a replay from the nearest earlier checkpoint that only copies the
+stored ratings back.  New matches extend an existing engine without
+re-rating history, as long as every match it already rated is unchanged.
+"""
+import threading
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+from analytics import DatasetBundle, applied_unchanged, match_digests, memoize
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+CHECKPOINT_EVERY = 100
+
+MATCH_COLUMNS = ['Match ID', 'Match Date', 'Team1 Name', 'Team2 Name', 'Match Winner', 'Match Result Text']
+
+
+def match_score(team1, team2, winner, result_text):
+    """Team 1's score (1, 0.5 or 0), or None for a match that is not rated.
+
+    Ties count as draws even when decided by boundaries or an eliminator;
+    no-results are skipped.
+    """
+    if winner == team1:
+        return 1.0
+    if winner == team2:
+        return 0.0
+    if isinstance(result_text, str) and 'tied' in result_text.lower():
+        return 0.5
+    return None
+
+
+class EloRatings:
+    def __init__(self, k=K_FACTOR, initial=INITIAL_RATING, checkpoint_every=CHECKPOINT_EVERY):
+        self.k = k
+        self.initial = initial
+        self.checkpoint_every = checkpoint_every
+        self.teams = {}
+        self.ratings = []
+        self.played = []
+        self.match_ids = set()
+        # Per Match ID, digest of the rows this engine was extended with
+        self.digests = None
+        # One entry per rated match, in date order
+        self.dates = []
+        self.pairs = []
+        self.after = []
+        # (matches applied, ratings, played) every checkpoint_every matches
+        self.checkpoints = [(0, np.empty(0), np.empty(0, dtype=int))]
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def last_date(self):
+        return pd.Timestamp.fromordinal(self.dates[-1]) if self.dates else None
+
+    def _team(self, name):
+        column = self.teams.get(name)
+        if column is None:
+            column = self.teams[name] = len(self.ratings)
+            self.ratings.append(self.initial)
+            self.played.append(0)
+        return column
+
+    def rate(self, match_id, date, team1, team2, winner=None, result_text=None):
+        """Apply one match; returns False if it is already rated or has no result.
+
+        Raises ValueError for a match dated before the last rated one, since
+        rating it would change every later rating; rebuild instead.
+        """
+        score = match_score(team1, team2, winner, result_text)
+        if match_id in self.match_ids or score is None:
+            return False
+        day = pd.Timestamp(date).toordinal()
+        if self.dates and day < self.dates[-1]:
+            raise ValueError(f"match {match_id} on {pd.Timestamp(date).date()} is before the last rated match")
+
+        a, b = self._team(team1), self._team(team2)
+        expected = 1 / (1 + 10 ** ((self.ratings[b] - self.ratings[a]) / 400))
+        change = self.k * (score - expected)
+        self.ratings[a] += change
+        self.ratings[b] -= change
+        self.played[a] += 1
+        self.played[b] += 1
+
+        self.match_ids.add(match_id)
+        self.dates.append(day)
+        self.pairs.append((a, b))
+        self.after.append((self.ratings[a], self.ratings[b]))
+        if len(self.dates) % self.checkpoint_every == 0:
+            self.checkpoints.append((len(self.dates), np.array(self.ratings), np.array(self.played)))
+        return True
+
+    def extend(self, matches):
+        """Rate the matches in ``matches`` not yet seen, in date order; returns how many."""
+        new = matches.loc[~matches['Match ID'].isin(self.match_ids), MATCH_COLUMNS].dropna(subset=['Match Date'])
+        new = new.sort_values(['Match Date', 'Match ID'], kind='stable')
+        rated = 0
+        for row in new.itertuples(index=False):
+            rated += self.rate(*row)
+        return rated
+
+    def copy(self):
+        """An independent engine sharing the (immutable) checkpoints so far."""
+        clone = EloRatings(self.k, self.initial, self.checkpoint_every)
+        clone.teams = dict(self.teams)
+        clone.ratings = list(self.ratings)
+        clone.played = list(self.played)
+        clone.match_ids = set(self.match_ids)
+        clone.dates = list(self.dates)
+        clone.pairs = list(self.pairs)
+        clone.after = list(self.after)
+        clone.checkpoints = list(self.checkpoints)
+        return clone
+
+    def _state_at(self, n):
+        """Ratings and match counts after the first ``n`` rated matches."""
+        positions = [position for position, _, _ in self.checkpoints]
+        position, ratings, played = self.checkpoints[bisect_right(positions, n) - 1]
+        size = len(self.teams)
+        ratings = np.concatenate([ratings, np.full(size - len(ratings), self.initial)])
+        played = np.concatenate([played, np.zeros(size - len(played), dtype=int)])
+        for (a, b), (rating_a, rating_b) in zip(self.pairs[position:n], self.after[position:n]):
+            ratings[a], ratings[b] = rating_a, rating_b
+            played[a] += 1
+            played[b] += 1
+        return ratings, played
+
+    def table(self, as_of=None):
+        """Ratings of every team that had played by ``as_of`` (default: now), best first."""
+        n = len(self.dates) if as_of is None else bisect_right(self.dates, pd.Timestamp(as_of).toordinal())
+        ratings, played = self._state_at(n)
+        table = pd.DataFrame({'team': list(self.teams), 'rating': ratings.round(1), 'matches': played})
+        table = table[table['matches'] > 0].sort_values('rating', ascending=False, kind='stable')
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        return table.reset_index(drop=True)
+
+    def history(self, teams):
+        """Post-match rating of each of ``teams`` after every match it played."""
+        wanted = {self.teams[team]: team for team in teams if team in self.teams}
+        rows = []
+        for day, (a, b), (rating_a, rating_b) in zip(self.dates, self.pairs, self.after):
+            if a in wanted:
+                rows.append((day, wanted[a], rating_a))
+            if b in wanted:
+                rows.append((day, wanted[b], rating_b))
+        history = pd.DataFrame(rows, columns=['date', 'team', 'rating'])
+        history['date'] = [pd.Timestamp.fromordinal(day) for day in history['date']]
+        return history
+
+
+_latest = None
+_latest_lock = threading.Lock()
+
+
+@memoize
+def team_ratings(bundle: DatasetBundle) -> EloRatings:
+    """Ratings over ``bundle.matches``, extending the last engine built when possible.
+
+    A newer dataset version that leaves every rated match's row unchanged and
+    only adds matches dated on or after the last rated one reuses a copy of
+    the previous engine and rates just those.  A corrected or removed match
+    means history has to be re-rated, so the engine is rebuilt.
+    """
+    global _latest
+    digests = match_digests(bundle.matches, MATCH_COLUMNS)
+    with _latest_lock:
+        previous = _latest
+    engine = None
+    if previous is not None and applied_unchanged(previous.digests, digests):
+        engine = previous.copy()
+        try:
+            engine.extend(bundle.matches)
+        except ValueError:
+            engine = None
+    if engine is None:
+        engine = EloRatings()
+        engine.extend(bundle.matches)
+    engine.digests = digests
+    with _latest_lock:
+        if _latest is None or len(engine) >= len(_latest):
+            _latest = engine
+    return engine
@@ -0,0 +1,329 @@
+"""Batch export of standalone per-team and per-player briefing reports.
+
+Each report is one HTML file holding the charts the dashboards show for that
+team or player: the wickets map and phase charts plus head-to-head charts
+against every opponent for a team, and wickets vs opposition, the dismissal
+donut and top partners for a player.  Plotly.js is written once next to the
+reports so they open offline.  ECharts is loaded from
+:data:`crossfilter.ECHARTS_URL` unless ``--echarts-js`` names a local copy.
+With ``--format png`` every Plotly chart is also written as a PNG (needs the
+optional ``kaleido`` package).  ECharts charts are HTML only.
+
+Reports are rendered in a process pool.  Each worker maps the warm-up
+snapshot once (see :func:`warmup.load_or_build`) and reuses it for every
+report it renders.  A report is skipped when the digest of the tables it is
+drawn from matches the last export recorded in ``.reports_manifest.json``
+and its files still exist, so re-running after new matches only re-renders
+the teams and players those matches changed.
+
+Usage::
+
+    python reports.py                          # every team and the top 25 run scorers and wicket takers
+    python reports.py teams --workers 4
+    python reports.py players --top 50 --format html png
+    python reports.py --only India Australia --force
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+import pandas as pd
+
+import analytics
+import crossfilter
+import figures
+import payloads
+import warmup
+
+MANIFEST = '.reports_manifest.json'
+# Bump when the report layout changes, so every report is re-rendered
+REPORT_FORMAT = 1
+TOP_PLAYERS = 25
+PLOTLY_JS = 'plotly.min.js'
+ECHARTS_JS = 'echarts.min.js'
+ECHARTS_HEIGHT = 400
+KINDS = ('teams', 'players')
+FORMATS = ('html', 'png')
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<script src="../{plotly}"></script><script src="{echarts}"></script>
+<style>body{{font-family:sans-serif;margin:2rem auto;max-width:1200px;color:#222}}
+h1{{color:#2E86C1}}h2{{color:#17A589;margin-top:2.5rem}}.meta{{color:#777}}</style>
+</head><body><h1>{title}</h1><p class="meta">Dataset version {version}</p>
+{sections}
+</body></html>
+"""
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    kind: str       # 'plotly' or 'echarts'
+    build: object
+    args: tuple
+
+
+@dataclass(frozen=True)
+class Report:
+    kind: str
+    name: str
+    sections: tuple
+    # (query, args) for every analytics table the sections are drawn from
+    inputs: tuple
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'report'
+
+
+def file_stems(names):
+    """name -> report file stem: its slug, plus a digest of the name when slugs collide.
+
+    "A. B. Smith" and "A B Smith" share a slug; each gets its own files
+    instead of the second overwriting the first.
+    """
+    groups = {}
+    for name in dict.fromkeys(names):
+        groups.setdefault(slug(name), []).append(name)
+    return {
+        name: stem if len(group) == 1 else f"{stem}-{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+        for stem, group in groups.items() for name in group
+    }
+
+
+def team_report(bundle, team):
+    opponents = analytics.h2h_opponents(bundle, team)
+    sections = (
+        Section('Global Wicket Takers Distribution', 'plotly', figures.wickets_map, ()),
+        Section('Match Phase Performance', 'plotly', figures.create_death_overs_analysis, ()),
+        Section('Wickets by Match Phase', 'plotly', figures.wickets_by_phase, ()),
+        Section('Wickets by Phase', 'plotly', figures.team_phase_wickets, (team,)),
+        Section('Economy by Phase', 'plotly', figures.team_phase_economy, (team,)),
+        *(Section(f'Head-to-Head vs {opponent}', 'echarts', payloads.h2h_chart, (team, opponent)) for opponent in opponents),
+    )
+    inputs = (
+        (analytics.wickets_by_team, ()),
+        (analytics.phase_stats, (analytics.DEATH_OVERS_PHASES,)),
+        (analytics.phase_stats, (analytics.MATCH_PHASES,)),
+        (analytics.team_phase_stats, (team,)),
+        *((analytics.h2h, (team, opponent)) for opponent in opponents),
+    )
+    return Report('teams', team, sections, inputs)
+
+
+def player_report(bundle, player):
+    sections, inputs = [], []
+    if player in analytics.bowler_list(bundle):
+        sections.append(Section('Wickets vs Opposition', 'plotly', figures.bowler_vs_opposition, (player,)))
+        inputs.append((analytics.bowler_vs_opposition, (player,)))
+    if player in analytics.batsman_list(bundle):
+        sections.append(Section('Dismissal Analysis', 'echarts', payloads.dismissal_donut, (player,)))
+        sections.append(Section('Top 10 Partners', 'plotly', figures.top_partners, (player, 10)))
+        inputs.append((analytics.dismissal_positions, (player,)))
+        inputs.append((analytics.top_partners, (player, 10)))
+    return Report('players', player, tuple(sections), tuple(inputs))
+
+
+REPORTS = {'teams': team_report, 'players': player_report}
+
+
+def top_players(bundle, n=TOP_PLAYERS):
+    """The top ``n`` career run scorers and the top ``n`` wicket takers with charts to show."""
+    batting = bundle.players.dropna(subset=['player_name', 'runs'])
+    bowling = bundle.bowling_summary.dropna(subset=['player_name', 'wickets'])
+    charted = set(analytics.bowler_list(bundle)) | set(analytics.batsman_list(bundle))
+    names = [*batting.nlargest(n, 'runs')['player_name'], *bowling.nlargest(n, 'wickets')['player_name']]
+    return [name for name in dict.fromkeys(names) if name in charted]
+
+
+def targets(bundle, kinds, top=TOP_PLAYERS, only=None):
+    """(kind, name, file stem) for every report to export.
+
+    Stems are assigned over every name of a kind before ``only`` filters
+    them, so a report keeps its files whichever subset is exported.
+    """
+    names = {'teams': lambda: analytics.team_list(bundle), 'players': lambda: top_players(bundle, top)}
+    jobs = [(kind, name, stem) for kind in kinds for name, stem in file_stems(names[kind]()).items()]
+    if only:
+        jobs = [job for job in jobs if job[1] in only]
+    return jobs
+
+
+def _digest_value(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+
+def fingerprint(bundle, report):
+    """Digest of the report layout and every table its charts are drawn from."""
+    digest = hashlib.sha1(f"{REPORT_FORMAT}:{report.kind}:{report.name}".encode())
+    for section in report.sections:
+        digest.update(f"{section.title}:{section.build.__name__}{section.args!r};".encode())
+    for query, args in report.inputs:
+        digest.update(f"{query.__name__}{args!r};".encode())
+        _digest_value(digest, query(bundle, *args))
+    return digest.hexdigest()
+
+
+def output_paths(base, report, formats):
+    """Files written for ``report`` under the path prefix ``base``."""
+    paths = [base + '.html'] if 'html' in formats else []
+    if 'png' in formats:
+        paths += [f"{base}-{slug(s.title)}.png" for s in report.sections if s.kind == 'plotly']
+    return paths
+
+
+def render(bundle, report, base, formats, echarts_src):
+    """Write the report's HTML and PNG files under the path prefix ``base``."""
+    blocks = []
+    for i, section in enumerate(report.sections):
+        figure = section.build(bundle, *section.args)
+        if section.kind == 'plotly':
+            if 'png' in formats:
+                figure.write_image(f"{base}-{slug(section.title)}.png", width=1200, height=600)
+            chart = figure.to_html(full_html=False, include_plotlyjs=False)
+        else:
+            chart = (f"<div id='chart{i}' style='height:{ECHARTS_HEIGHT}px'></div><script>"
+                     f"echarts.init(document.getElementById('chart{i}')).setOption({crossfilter._json(figure)});</script>")
+        blocks.append(f"<h2>{html.escape(section.title)}</h2>\n{chart}")
+    if 'html' in formats:
+        page = _PAGE.format(title=html.escape(f"{report.name} briefing"), version=bundle.version,
+                            plotly=PLOTLY_JS, echarts=echarts_src, sections='\n'.join(blocks))
+        tmp = f"{base}.html.tmp"
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            fh.write(page)
+        os.replace(tmp, base + '.html')
+
+
+# --- Worker processes ---
+_bundle = None
+
+
+def _init_worker(data_dir):
+    """Map the shared snapshot once per worker; every report it renders reuses it."""
+    global _bundle
+    _bundle = warmup.load_or_build('app', data_dir)
+
+
+def _export(kind, name, stem, out_dir, formats, echarts_src, previous, force):
+    """Render one report unless its inputs are unchanged; returns (digest, status)."""
+    start = time.perf_counter()
+    report = REPORTS[kind](_bundle, name)
+    digest = fingerprint(_bundle, report)
+    base = os.path.join(out_dir, kind, stem)
+    paths = output_paths(base, report, formats)
+    if not force and digest == previous and all(os.path.exists(path) for path in paths):
+        return digest, "up to date"
+    render(_bundle, report, base, formats, echarts_src)
+    return digest, f"built in {time.perf_counter() - start:.2f}s"
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(out_dir, manifest):
+    tmp = os.path.join(out_dir, MANIFEST + '.tmp')
+    with open(tmp, 'w') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+
+
+def write_assets(out_dir, echarts_js=None):
+    """Write plotly.js (and a local ECharts if given) once; returns the ECharts src for the pages."""
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(out_dir, PLOTLY_JS)
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(get_plotlyjs())
+    if echarts_js is None:
+        return crossfilter.ECHARTS_URL
+    shutil.copyfile(echarts_js, os.path.join(out_dir, ECHARTS_JS))
+    return f"../{ECHARTS_JS}"
+
+
+def export(jobs, data_dir='.', out_dir='reports', formats=('html',), workers=None, force=False, echarts_js=None):
+    """Export every (kind, name, file stem) in ``jobs`` and return ``{(kind, name): status}``.
+
+    Raises ValueError if two jobs of a kind would write the same files.
+    """
+    for kind in {kind for kind, _, _ in jobs}:
+        stems = [stem for job_kind, _, stem in jobs if job_kind == kind]
+        if len(set(stems)) < len(stems):
+            raise ValueError(f"{kind} reports share a file name; build the jobs with targets()")
+        os.makedirs(os.path.join(out_dir, kind), exist_ok=True)
+    echarts_src = write_assets(out_dir, echarts_js)
+    manifest = _load_manifest(out_dir)
+    status = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+        running = {
+            pool.submit(_export, kind, name, stem, out_dir, tuple(formats), echarts_src,
+                        manifest.get(f"{kind}/{name}"), force): (kind, name)
+            for kind, name, stem in jobs
+        }
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, name = running.pop(future)
+                try:
+                    digest, status[kind, name] = future.result()
+                except Exception as exc:
+                    status[kind, name] = f"failed ({exc})"
+                    continue
+                manifest[f"{kind}/{name}"] = digest
+            _save_manifest(out_dir, manifest)
+    return {(kind, name): status[kind, name] for kind, name, _ in jobs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export standalone per-team and per-player briefing reports.")
+    parser.add_argument('which', nargs='?', default='all', choices=['all', *KINDS])
+    parser.add_argument('--out', default='reports', help="output directory")
+    parser.add_argument('--data-dir', default='.', help="directory holding the dashboard CSVs")
+    parser.add_argument('--format', nargs='+', default=['html'], choices=FORMATS, dest='formats')
+    parser.add_argument('--top', type=int, default=TOP_PLAYERS, help="top run scorers and wicket takers to export")
+    parser.add_argument('--only', nargs='+', metavar='NAME', help="export only these teams or players")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="re-render even if inputs are unchanged")
+    parser.add_argument('--echarts-js', help="local echarts.min.js to ship with the reports instead of the CDN copy")
+    args = parser.parse_args()
+
+    if 'png' in args.formats:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            raise SystemExit("PNG export needs the kaleido package: pip install kaleido")
+
+    # Load (or build) the snapshot once here, so the workers only map it
+    start = time.perf_counter()
+    try:
+        bundle = warmup.load_or_build('app', args.data_dir)
+    except FileNotFoundError as exc:
+        raise SystemExit(f"{exc.filename} not found")
+    jobs = targets(bundle, KINDS if args.which == 'all' else (args.which,), args.top, args.only)
+
+    status = export(jobs, args.data_dir, args.out, args.formats, args.workers, args.force, args.echarts_js)
+    for (kind, name), result in status.items():
+        print(f"{kind:8s} {name:30s} {result}")
+    built = sum(result.startswith('built') for result in status.values())
+    print(f"{built} of {len(status)} reports rendered in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
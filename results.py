@@ -0,0 +1,94 @@
+"""Structured match results parsed from the free-text ``Match Result Text``.
+
+One compiled pattern covers every result phrasing in the match summaries
+("Australia won by 6 runs", "Sri Lanka won by 4 wickets (with 21 balls
+remaining) (D/L method)", "Match tied (England won on boundary count)",
+"No result", ...).  :func:`parse_results` applies it to a whole column at
+once with ``Series.str.extract`` and returns typed columns; rows it cannot
+parse are left with a null ``result_type`` and listed by :func:`unparsed`.
+
+    python results.py [cleaned_odi_match_summary.csv]
+"""
+import argparse
+import re
+
+import numpy as np
+import pandas as pd
+
+RESULT_PATTERN = re.compile(r"""
+    ^(?:
+        (?P<winner>.+?)\ won
+        (?:
+            \ by\ (?P<margin>\d+)\ (?P<unit>run|wicket)s?
+            (?:\ \(with\ (?P<balls>\d+)\ balls?\ remaining\))?
+          | \ \(lost\ fewer\ wickets\)
+          | \ by\ default
+        )
+      | (?P<awarded>.+?)\ awarded\ the\ match(?:\ \(.*\))?
+      | (?P<tied>Match\ tied)
+        (?:\ \((?P<tie_winner>.+?)\ won\ (?:the\ one-over\ eliminator|on\ boundary\ count)\))?
+      | (?P<no_result>No\ result)(?:\ \(abandoned.*\))?
+    )
+    (?:\ \((?P<method>D/L\ method|DLS\ method|revised\ target)\))?$
+""", re.VERBOSE)
+
+RESULT_TYPES = ['runs', 'wickets', 'tie', 'no result', 'awarded', 'other win']
+RESULT_COLUMNS = ['result_type', 'result_winner', 'margin_runs', 'margin_wickets',
+                  'balls_remaining', 'dls', 'revised_target']
+
+
+def parse_results(text: pd.Series) -> pd.DataFrame:
+    """Typed result columns for each entry of ``text``, on the same index.
+
+    ``result_winner`` is the winning side, including the winner of a tie
+    decided by boundaries or an eliminator; ``dls`` marks D/L and DLS
+    results and ``revised_target`` the other rain-reduced chases.
+    """
+    parts = text.astype(object).str.extract(RESULT_PATTERN)
+    margin = pd.to_numeric(parts['margin'])
+    unit = parts['unit'].fillna('').to_numpy()
+    method = parts['method'].fillna('').to_numpy()
+    matched = {name: parts[name].notna().to_numpy() for name in ('winner', 'awarded', 'tied', 'no_result')}
+
+    result_type = np.select(
+        [unit == 'run', unit == 'wicket', matched['winner'],
+         matched['awarded'], matched['tied'], matched['no_result']],
+        ['runs', 'wickets', 'other win', 'awarded', 'tie', 'no result'],
+        default=None,
+    )
+    return pd.DataFrame({
+        'result_type': pd.Categorical(result_type, categories=RESULT_TYPES),
+        'result_winner': parts['winner'].fillna(parts['awarded']).fillna(parts['tie_winner']).to_numpy(dtype=object),
+        'margin_runs': margin.where(unit == 'run').to_numpy(),
+        'margin_wickets': margin.where(unit == 'wicket').to_numpy(),
+        'balls_remaining': pd.to_numeric(parts['balls']).to_numpy(),
+        'dls': np.isin(method, ['D/L method', 'DLS method']),
+        'revised_target': method == 'revised target',
+    }, index=text.index)
+
+
+def unparsed(text: pd.Series) -> pd.Series:
+    """The non-empty entries of ``text`` that :data:`RESULT_PATTERN` does not match."""
+    present = text.dropna()
+    return present[~present.astype(str).str.fullmatch(RESULT_PATTERN)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse match result text and list the rows that do not parse.")
+    parser.add_argument('path', nargs='?', default='cleaned_odi_match_summary.csv')
+    args = parser.parse_args()
+
+    matches = pd.read_csv(args.path, usecols=['Match ID', 'Match Result Text'])
+    parsed = parse_results(matches['Match Result Text'])
+    print(parsed['result_type'].value_counts(dropna=False).to_string())
+    print(f"D/L or DLS: {int(parsed['dls'].sum())}, revised target: {int(parsed['revised_target'].sum())}")
+
+    bad = unparsed(matches['Match Result Text'])
+    missing = matches['Match Result Text'].isna().sum()
+    print(f"\n{len(bad)} unparsed, {missing} without result text")
+    for match_id, text in zip(matches.loc[bad.index, 'Match ID'], bad):
+        print(f"  {match_id}: {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Hierarchical era → year → series → match rollups over the match summary.
+
+Every match is added once, walking from the root down to its own leaf and
+adding its contribution to each node on the way.  A node holds:
+
+* per-team totals (played, won, lost, tied, no result, runs for and against,
+  wickets taken and lost);
+* a count of result types;
+* player-of-the-match awards.
+
+A standings table, a drill-down into a node's children or a series-level
+view is therefore read from the stored nodes, never by regrouping match
+rows.  A series that runs across several years has one node under each of
+those years.  Series-wide views add up those nodes, found through a
+name → nodes index.
+
+New matches are added to a copy of the last rollup built, the way
+:func:`ratings.team_ratings` extends its engine.  Copies share nodes, and
+adding a match clones only the nodes on its path that are still shared.
+"""
+import threading
+from collections import Counter
+from typing import Optional
+
+import pandas as pd
+
+from analytics import DatasetBundle, applied_unchanged, match_digests, memoize
+
+LEVELS = ('era', 'year', 'series', 'match')
+STAT_COLUMNS = ['played', 'won', 'lost', 'tied', 'no_result', 'runs_for', 'runs_against', 'wickets_taken', 'wickets_lost']
+MATCH_COLUMNS = ['Match ID', 'Match Date', 'year', 'Series Name', 'Team1 Name', 'Team2 Name',
+                 'Team1 Runs Scored', 'Team2 Runs Scored', 'Team1 Wickets Fell', 'Team2 Wickets Fell',
+                 'Match Winner', 'result_type', 'MOM Player', 'mom_name']
+
+
+def era_of(year):
+    return f"{int(year) // 10 * 10}s"
+
+
+def _number(value):
+    return 0 if pd.isna(value) else value
+
+
+class Node:
+    """One level of the hierarchy with the totals of every match below it."""
+    __slots__ = ('level', 'key', 'owner', 'children', 'matches', 'teams', 'results', 'awards')
+
+    def __init__(self, level, key, owner=None):
+        self.level = level
+        self.key = key
+        self.owner = owner
+        self.children = {}
+        self.matches = 0
+        self.teams = {}
+        self.results = Counter()
+        self.awards = Counter()
+
+    def owned_by(self, owner):
+        """This node if ``owner`` may change it, else a copy it may (children stay shared)."""
+        if self.owner is owner:
+            return self
+        clone = Node(self.level, self.key, owner)
+        clone.children = dict(self.children)
+        clone.matches = self.matches
+        clone.teams = {team: list(stats) for team, stats in self.teams.items()}
+        clone.results = Counter(self.results)
+        clone.awards = Counter(self.awards)
+        return clone
+
+    def add(self, teams, result, award):
+        """Add one match: ``teams`` maps each side to its STAT_COLUMNS values."""
+        self.matches += 1
+        for team, stats in teams.items():
+            totals = self.teams.get(team)
+            if totals is None:
+                totals = self.teams[team] = [0] * len(STAT_COLUMNS)
+            for i, value in enumerate(stats):
+                totals[i] += value
+        self.results[result] += 1
+        if award:
+            self.awards[award] += 1
+
+    def summary(self):
+        """Headline totals for this node."""
+        runs = sum(stats[STAT_COLUMNS.index('runs_for')] for stats in self.teams.values())
+        wickets = sum(stats[STAT_COLUMNS.index('wickets_lost')] for stats in self.teams.values())
+        return {
+            'matches': self.matches,
+            'teams': len(self.teams),
+            'runs': runs,
+            'wickets': wickets,
+            'runs_per_match': round(runs / self.matches, 1) if self.matches else 0.0,
+            'ties': self.results['tie'],
+            'no_results': self.results['no result'],
+        }
+
+
+def _contribution(row):
+    """Per-team stats, result type and award for one match row."""
+    team1, team2, winner = row['Team1 Name'], row['Team2 Name'], row['Match Winner']
+    result = row['result_type'] if isinstance(row['result_type'], str) else 'unknown'
+    tied, no_result = result == 'tie', result == 'no result'
+    runs1, runs2 = _number(row['Team1 Runs Scored']), _number(row['Team2 Runs Scored'])
+    wickets1, wickets2 = _number(row['Team1 Wickets Fell']), _number(row['Team2 Wickets Fell'])
+    teams = {}
+    for team, opponent_won, scored, conceded, lost, taken in (
+            (team1, winner == team2, runs1, runs2, wickets1, wickets2),
+            (team2, winner == team1, runs2, runs1, wickets2, wickets1)):
+        if isinstance(team, str):
+            won = winner == team
+            teams[team] = [1, int(won), int(opponent_won), int(tied), int(no_result), scored, conceded, taken, lost]
+    award = row['mom_name'] if isinstance(row['mom_name'], str) else None
+    if award is None and not pd.isna(row['MOM Player']):
+        award = f"Player {int(row['MOM Player'])}"
+    return teams, result, award
+
+
+class SeriesRollup:
+    def __init__(self):
+        # Nodes carrying another owner are shared with a copy and are cloned
+        # before being changed
+        self.owner = object()
+        self.root = Node('all', None, self.owner)
+        self.match_ids = set()
+        # Series name -> {year: its node under that year}
+        self.series = {}
+        # Per Match ID, digest of the rows this rollup was extended with
+        self.digests = None
+
+    def __len__(self):
+        return len(self.match_ids)
+
+    def add(self, row):
+        """Add one match row (a mapping with MATCH_COLUMNS); False if already present or undated."""
+        match_id, year = row['Match ID'], row['year']
+        if match_id in self.match_ids or pd.isna(year):
+            return False
+        teams, result, award = _contribution(row)
+        name = row['Series Name'] if isinstance(row['Series Name'], str) else 'Unknown series'
+
+        node = self.root = self.root.owned_by(self.owner)
+        node.add(teams, result, award)
+        for level, key in zip(LEVELS, (era_of(year), int(year), name, match_id)):
+            child = node.children.get(key)
+            child = Node(level, key, self.owner) if child is None else child.owned_by(self.owner)
+            node.children[key] = node = child
+            node.add(teams, result, award)
+            if level == 'series':
+                self.series.setdefault(name, {})[int(year)] = node
+        self.match_ids.add(match_id)
+        return True
+
+    def extend(self, matches):
+        """Add the rows of ``matches`` not yet present, in date order; returns how many."""
+        new = matches.loc[~matches['Match ID'].isin(self.match_ids), MATCH_COLUMNS]
+        new = new.sort_values(['Match Date', 'Match ID'], kind='stable')
+        added = 0
+        for row in new.to_dict('records'):
+            added += self.add(row)
+        return added
+
+    def node(self, path=()):
+        """The node at ``path`` (era, year, series, match id), or None."""
+        node = self.root
+        for key in path:
+            node = node.children.get(key)
+            if node is None:
+                return None
+        return node
+
+    def children(self, path=()) -> pd.DataFrame:
+        """Headline totals of each child of the node at ``path``."""
+        node = self.node(path)
+        if node is None or not node.children:
+            return pd.DataFrame(columns=['key', 'matches', 'teams', 'runs', 'wickets', 'runs_per_match', 'ties', 'no_results'])
+        rows = [{'key': key, **child.summary()} for key, child in node.children.items()]
+        return pd.DataFrame(rows)
+
+    def standings(self, path=(), series: Optional[str] = None) -> pd.DataFrame:
+        """Team table for the node at ``path``, or for a whole series across its years."""
+        if series is not None:
+            nodes = self.series.get(series, {}).values()
+        else:
+            nodes = [node for node in [self.node(path)] if node is not None]
+        totals = {}
+        for node in nodes:
+            for team, stats in node.teams.items():
+                current = totals.setdefault(team, [0] * len(STAT_COLUMNS))
+                for i, value in enumerate(stats):
+                    current[i] += value
+        table = pd.DataFrame.from_dict(totals, orient='index', columns=STAT_COLUMNS).rename_axis('team').reset_index()
+        decided = table['won'] + table['lost']
+        table['win_pct'] = (table['won'] / decided.where(decided > 0) * 100).round(1)
+        table['runs_per_match'] = (table['runs_for'] / table['played'].where(table['played'] > 0)).round(1)
+        return table.sort_values(['won', 'win_pct', 'runs_for'], ascending=False, kind='stable').reset_index(drop=True)
+
+    def top_performers(self, series: str, n: int = 10) -> pd.DataFrame:
+        """Players with the most player-of-the-match awards across a series."""
+        awards = Counter()
+        for node in self.series.get(series, {}).values():
+            awards.update(node.awards)
+        return pd.DataFrame(awards.most_common(n), columns=['player', 'awards'])
+
+    def series_by_year(self) -> pd.DataFrame:
+        """Per year: series played, matches and runs per match, from the year nodes."""
+        rows = []
+        for era in self.root.children.values():
+            for year, node in era.children.items():
+                summary = node.summary()
+                rows.append({'era': era.key, 'year': year, 'series': len(node.children),
+                             'matches': summary['matches'], 'runs_per_match': summary['runs_per_match']})
+        return pd.DataFrame(rows).sort_values('year', kind='stable').reset_index(drop=True)
+
+    def copy(self):
+        """A rollup sharing every node with this one; either may then be extended.
+
+        Both sides give up ownership, so the first change to a shared node
+        copies just that node and the path above it.
+        """
+        clone = SeriesRollup()
+        clone.root = self.root
+        clone.match_ids = set(self.match_ids)
+        clone.series = {name: dict(years) for name, years in self.series.items()}
+        self.owner = object()
+        return clone
+
+
+_latest = None
+_latest_lock = threading.Lock()
+
+
+@memoize
+def series_rollup(bundle: DatasetBundle) -> SeriesRollup:
+    """The rollup over ``bundle.matches``, extending the last one built when possible.
+
+    The last rollup is only extended while the rows of every match it holds
+    are unchanged; a corrected or removed match rebuilds it.
+    """
+    global _latest
+    digests = match_digests(bundle.matches, MATCH_COLUMNS)
+    with _latest_lock:
+        previous = _latest
+    if previous is not None and applied_unchanged(previous.digests, digests):
+        rollup = previous.copy()
+    else:
+        rollup = SeriesRollup()
+    rollup.extend(bundle.matches)
+    rollup.digests = digests
+    with _latest_lock:
+        if _latest is None or len(rollup) >= len(_latest):
+            _latest = rollup
+    return rollup
+
+
+@memoize
+def series_names(bundle: DatasetBundle) -> list:
+    """Series names, most recently played first."""
+    series = series_rollup(bundle).series
+    return sorted(series, key=lambda name: (-max(series[name]), name))
+
+
+@memoize
+def drill_down(bundle: DatasetBundle, path=()) -> pd.DataFrame:
+    """Headline totals of the children of the node at ``path``."""
+    return series_rollup(bundle).children(tuple(path))
+
+
+@memoize
+def standings(bundle: DatasetBundle, path=(), series=None) -> pd.DataFrame:
+    """Team table at ``path``, or across every year of ``series`` when given."""
+    return series_rollup(bundle).standings(tuple(path), series)
+
+
+@memoize
+def top_performers(bundle: DatasetBundle, series: str, n: int = 10) -> pd.DataFrame:
+    return series_rollup(bundle).top_performers(series, n)
+
+
+@memoize
+def series_by_year(bundle: DatasetBundle) -> pd.DataFrame:
+    return series_rollup(bundle).series_by_year()
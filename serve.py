@@ -0,0 +1,166 @@
+"""Multi-worker serving: several dashboard processes behind nginx.
+
+One Streamlit process runs every session's script in threads that share a
+GIL, so one slow rerun holds up every user.  This runs ``--workers``
+separate Streamlit processes on consecutive ports behind an nginx reverse
+proxy::
+
+    python serve.py --workers 4                # app.py on 8511-8514, proxy on 8501
+    python serve.py --workers 4 --no-proxy     # workers only, behind your own proxy
+    python serve.py --workers 4 --print-nginx-conf > odi.conf
+
+The warm-up snapshots are written once before the workers start.  Each
+worker memory-maps them (see :mod:`store`), so the tables and indexes are
+held once per host rather than once per worker.  The proxy keeps each
+browser on one worker, because a Streamlit session lives in the process that
+owns its websocket.  It uses a consistent hash of an ``odi_worker`` cookie
+that nginx sets on the first response.  Workers that exit are restarted.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import warmup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROXY_PORT = 8501
+WORKER_BASE_PORT = 8511
+RESTART_DELAY_SECONDS = 2.0
+
+NGINX_CONF = """\
+worker_processes 1;
+pid nginx.pid;
+error_log stderr warn;
+events {{ worker_connections 1024; }}
+
+http {{
+    access_log off;
+    client_body_temp_path client_body_temp;
+    proxy_temp_path proxy_temp;
+    fastcgi_temp_path fastcgi_temp;
+    uwsgi_temp_path uwsgi_temp;
+    scgi_temp_path scgi_temp;
+
+    map $http_upgrade $connection_upgrade {{
+        default upgrade;
+        '' close;
+    }}
+    # Sticky sessions: reuse the browser's cookie, or start one from the request id
+    map $cookie_odi_worker $odi_worker {{
+        '' $request_id;
+        default $cookie_odi_worker;
+    }}
+
+    upstream odi_dashboard {{
+        hash $odi_worker consistent;
+{servers}
+    }}
+
+    server {{
+        listen {listen};
+        location / {{
+            proxy_pass http://odi_dashboard;
+            proxy_http_version 1.1;
+            proxy_set_header Upgrade $http_upgrade;
+            proxy_set_header Connection $connection_upgrade;
+            proxy_set_header Host $host;
+            proxy_read_timeout 86400;
+            add_header Set-Cookie "odi_worker=$odi_worker; Path=/; HttpOnly; SameSite=Lax" always;
+        }}
+    }}
+}}
+"""
+
+
+def worker_ports(workers, base=WORKER_BASE_PORT):
+    return [base + i for i in range(workers)]
+
+
+def nginx_config(ports, listen=f"127.0.0.1:{PROXY_PORT}"):
+    servers = '\n'.join(f"        server 127.0.0.1:{port};" for port in ports)
+    return NGINX_CONF.format(servers=servers, listen=listen)
+
+
+def start_worker(script, port):
+    return subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script,
+         '--server.port', str(port), '--server.address', '127.0.0.1', '--server.headless', 'true'],
+        cwd=ROOT,
+    )
+
+
+def start_proxy(ports, listen):
+    """Write the nginx config under ``.cache/nginx`` and run nginx in the foreground."""
+    nginx = shutil.which('nginx')
+    if nginx is None:
+        raise FileNotFoundError("nginx is not on PATH; install it or pass --no-proxy")
+    prefix = os.path.join(ROOT, warmup.SNAPSHOT_DIR, 'nginx')
+    os.makedirs(prefix, exist_ok=True)
+    with open(os.path.join(prefix, 'nginx.conf'), 'w') as fh:
+        fh.write(nginx_config(ports, listen))
+    return subprocess.Popen([nginx, '-p', prefix, '-c', 'nginx.conf', '-g', 'daemon off;'])
+
+
+def supervise(script, ports, proxy):
+    """Restart workers that exit until interrupted, then stop everything."""
+    workers = {port: start_worker(script, port) for port in ports}
+    try:
+        while True:
+            time.sleep(RESTART_DELAY_SECONDS)
+            if proxy is not None and proxy.poll() is not None:
+                raise SystemExit(f"nginx exited with status {proxy.returncode}")
+            for port, proc in workers.items():
+                if proc.poll() is not None:
+                    print(f"worker on port {port} exited with status {proc.returncode}; restarting", flush=True)
+                    workers[port] = start_worker(script, port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in [*workers.values(), proxy]:
+            if proc is not None and proc.poll() is None:
+                proc.terminate()
+        for proc in [*workers.values(), proxy]:
+            if proc is not None:
+                proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run dashboard workers behind a sticky-session nginx proxy.")
+    parser.add_argument('script', nargs='?', default='app.py', choices=['app.py', 'visuals.py'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--port', type=int, default=PROXY_PORT, help="port nginx listens on")
+    parser.add_argument('--host', default='127.0.0.1', help="address nginx listens on")
+    parser.add_argument('--worker-port', type=int, default=WORKER_BASE_PORT, help="port of the first worker")
+    parser.add_argument('--no-proxy', action='store_true', help="start the workers only")
+    parser.add_argument('--print-nginx-conf', action='store_true', help="print the proxy config and exit")
+    args = parser.parse_args()
+
+    ports = worker_ports(args.workers, args.worker_port)
+    listen = f"{args.host}:{args.port}"
+    if args.print_nginx_conf:
+        print(nginx_config(ports, listen), end='')
+        return
+
+    # Write the shared snapshot once so the workers only map it
+    dashboard = os.path.splitext(args.script)[0]
+    start = time.perf_counter()
+    try:
+        warmup.load_or_build(dashboard, ROOT)
+    except FileNotFoundError as exc:
+        raise SystemExit(f"{dashboard}: {exc.filename} not found")
+    print(f"{dashboard}: shared snapshot ready in {time.perf_counter() - start:.2f}s", flush=True)
+
+    try:
+        proxy = None if args.no_proxy else start_proxy(ports, listen)
+    except FileNotFoundError as exc:
+        raise SystemExit(str(exc))
+    print(f"{len(ports)} workers on ports {ports[0]}-{ports[-1]}"
+          + ("" if proxy is None else f", proxy on http://{listen}"), flush=True)
+    supervise(args.script, ports, proxy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Player similarity search over career batting and bowling vectors.
+
+Each player's career totals become one row of a normalised feature matrix:
+counts are log-scaled, then every feature is standardised, so distances are
+measured in standard deviations.  A k-d tree over the matrix
+(``scipy.spatial.cKDTree``, or a brute-force numpy scan when SciPy is not
+installed) is built once per dataset version and answers nearest-neighbour
+queries in well under a millisecond.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics import DatasetBundle, memoize
+
+FEATURES = ['runs', 'balls', 'strike_rate', 'bat_avg', 'wickets', 'runs_conceded', 'overs']
+LOG_FEATURES = ['runs', 'balls', 'wickets', 'runs_conceded', 'overs']
+BOWLING_FALLBACK = {'wickets': 'wickets', 'total_runs': 'runs_conceded', 'total_overs': 'overs'}
+
+# Role thresholds on career totals
+BATTER_AVERAGE = 20
+BOWLER_WICKETS_PER_INNINGS = 0.5
+ROLES = ('batter', 'bowler', 'all-rounder')
+
+
+def _kd_tree(matrix):
+    """A cKDTree over ``matrix``, or None when SciPy is unavailable."""
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree(matrix)
+
+
+@dataclass(eq=False)
+class PlayerIndex:
+    """Normalised feature matrix plus its nearest-neighbour index.
+
+    ``players`` holds one row per matrix row: name, role, batting and
+    bowling style, and the raw features.  The tree is built on the first
+    query and left out of pickles, so restoring a snapshot does not import
+    SciPy.
+    """
+    players: pd.DataFrame
+    matrix: np.ndarray
+    positions: dict
+    use_tree: bool = True
+    _tree: object = field(default=None, repr=False)
+
+    def __getstate__(self):
+        return {**self.__dict__, '_tree': None}
+
+    @property
+    def tree(self):
+        if self._tree is None and self.use_tree:
+            self._tree = _kd_tree(self.matrix)
+            self.use_tree = self._tree is not None
+        return self._tree
+
+    def nearest(self, i: int, k: int, mask: Optional[np.ndarray] = None):
+        """Distances and row numbers of the ``k`` players closest to row ``i``.
+
+        Row ``i`` itself is excluded, as is every row where ``mask`` is False.
+        """
+        allowed = np.ones(len(self.matrix), dtype=bool) if mask is None else mask.copy()
+        allowed[i] = False
+        k = min(k, int(allowed.sum()))
+        if k <= 0:
+            return np.empty(0), np.empty(0, dtype=int)
+        tree = self.tree
+        if tree is None:
+            distances = np.sqrt(((self.matrix - self.matrix[i]) ** 2).sum(axis=1))
+            rows = np.flatnonzero(allowed)
+            rows = rows[np.argsort(distances[rows], kind='stable')[:k]]
+            return distances[rows], rows
+
+        # Widen the tree query until enough neighbours survive the filter
+        want = k + 1
+        while True:
+            distances, rows = tree.query(self.matrix[i], k=min(want, len(self.matrix)))
+            keep = allowed[rows]
+            if keep.sum() >= k or want >= len(self.matrix):
+                return distances[keep][:k], rows[keep][:k]
+            want *= 4
+
+
+def _career_features(bundle):
+    """Player summary rows with bowling totals filled from the bowling summary."""
+    players = bundle.players.drop_duplicates('player_name').set_index('player_name')
+    bowling = (bundle.bowling_summary.drop_duplicates('player_name').set_index('player_name')
+               .rename(columns=BOWLING_FALLBACK)[list(BOWLING_FALLBACK.values())])
+    features = players[FEATURES].combine_first(bowling.reindex(players.index))
+    return features[FEATURES].fillna(0.0)
+
+
+def _roles(bundle, features):
+    """Batter, bowler or all-rounder from career average and wickets per innings."""
+    innings = bundle.players.drop_duplicates('player_name').set_index('player_name')['innings_batted']
+    innings = innings.reindex(features.index).fillna(1).clip(lower=1)
+    batter = features['bat_avg'] >= BATTER_AVERAGE
+    bowler = features['wickets'] >= BOWLER_WICKETS_PER_INNINGS * innings
+    return np.select([batter & bowler, bowler], ['all-rounder', 'bowler'], 'batter')
+
+
+@memoize
+def player_index(bundle: DatasetBundle) -> PlayerIndex:
+    """Build the normalised feature matrix and its k-d tree."""
+    features = _career_features(bundle)
+    values = features.to_numpy(dtype=float).copy()
+    log_columns = [FEATURES.index(name) for name in LOG_FEATURES]
+    values[:, log_columns] = np.log1p(np.clip(values[:, log_columns], 0, None))
+    spread = values.std(axis=0)
+    matrix = (values - values.mean(axis=0)) / np.where(spread > 0, spread, 1.0)
+
+    info = bundle.player_info.drop_duplicates('player_name').set_index('player_name')
+    players = pd.DataFrame({
+        'player_name': features.index,
+        'role': _roles(bundle, features),
+        'batting_style': info['batting_style'].reindex(features.index).fillna('Unknown').to_numpy(),
+        'bowling_style': info['bowling_style'].reindex(features.index).fillna('Unknown').to_numpy(),
+    }).join(features.reset_index(drop=True))
+    positions = {name: i for i, name in enumerate(players['player_name'])}
+    return PlayerIndex(players, matrix, positions)
+
+
+@memoize
+def filter_options(bundle: DatasetBundle) -> dict:
+    """Sorted player names, roles and styles for the similarity selectors."""
+    players = player_index(bundle).players
+    return {
+        'players': sorted(players['player_name']),
+        'roles': [role for role in ROLES if (players['role'] == role).any()],
+        'batting_styles': sorted(players['batting_style'].unique()),
+        'bowling_styles': sorted(players['bowling_style'].unique()),
+    }
+
+
+@memoize
+def similar_players(bundle: DatasetBundle, player: str, k: int = 10, role=None,
+                    batting_style=None, bowling_style=None) -> pd.DataFrame:
+    """The ``k`` players whose careers are closest to ``player``'s.
+
+    ``role``, ``batting_style`` and ``bowling_style`` restrict the candidates
+    when given.  ``similarity`` maps distance into (0, 1], 1 being identical.
+    """
+    index = player_index(bundle)
+    i = index.positions.get(player)
+    if i is None:
+        return index.players.iloc[:0].assign(distance=[], similarity=[])
+
+    players = index.players
+    mask = np.ones(len(players), dtype=bool)
+    for column, wanted in (('role', role), ('batting_style', batting_style), ('bowling_style', bowling_style)):
+        if wanted is not None:
+            mask &= (players[column] == wanted).to_numpy()
+
+    distances, rows = index.nearest(i, k, mask)
+    result = players.iloc[rows].reset_index(drop=True)
+    result['distance'] = distances.round(3)
+    result['similarity'] = (1 / (1 + distances)).round(3)
+    return result
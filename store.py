@@ -0,0 +1,69 @@
+"""Memory-mapped object store shared by every dashboard process.
+
+:func:`dump` pickles an object with protocol 5 and writes the large buffers
+(numpy arrays, including DataFrame blocks, and Arrow string columns) out of
+band into the same file, 64-byte aligned.  :func:`load` maps the file
+read-only and unpickles against views of the mapping, so those arrays are
+not copied.  Every process that loads the same file shares one copy in the
+page cache, and the arrays it gets back are read-only.
+
+Layout::
+
+    MAGIC | index offset (8 bytes) | buffers ... | pickle body | index pickle
+"""
+import mmap
+import os
+import pickle
+import struct
+
+MAGIC = b'ODISTOR1'
+ALIGN = 64
+_OFFSET = struct.Struct('<Q')
+
+
+def dump(obj, path):
+    """Write ``obj`` to ``path`` atomically (via a temporary file and rename)."""
+    buffers = []
+    body = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as fh:
+        fh.write(MAGIC + _OFFSET.pack(0))
+        spans = []
+        for buffer in buffers:
+            raw = buffer.raw()
+            fh.write(b'\0' * (-fh.tell() % ALIGN))
+            spans.append((fh.tell(), raw.nbytes))
+            fh.write(raw)
+        body_at = fh.tell()
+        fh.write(body)
+        index_at = fh.tell()
+        pickle.dump({'buffers': spans, 'body': (body_at, len(body))}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        fh.seek(len(MAGIC))
+        fh.write(_OFFSET.pack(index_at))
+    os.replace(tmp, path)
+    return path
+
+
+def load(path):
+    """Map ``path`` and unpickle its object without copying the out-of-band buffers.
+
+    Raises FileNotFoundError if ``path`` is missing and ValueError if it is
+    not a store file or its header and index are truncated or corrupt.
+    """
+    with open(path, 'rb') as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a store file")
+        # The mapping outlives the file handle; views of it keep it open
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        index_at, = _OFFSET.unpack_from(view, len(MAGIC))
+        index = pickle.loads(view[index_at:])
+        spans = [index['body'], *index['buffers']]
+    except (struct.error, pickle.UnpicklingError, EOFError, KeyError, TypeError, ValueError):
+        raise ValueError(f"{path} is truncated or corrupt") from None
+    if any(start + size > index_at for start, size in spans):
+        raise ValueError(f"{path} is truncated or corrupt")
+    (body_at, body_len), *buffers = spans
+    return pickle.loads(view[body_at:body_at + body_len],
+                        buffers=[view[start:start + size] for start, size in buffers])
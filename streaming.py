@@ -0,0 +1,105 @@
+"""Bounded-memory streaming over the large CSV tables.
+
+``stream_csv`` reads a file in chunks, keeping only the projected columns and
+the rows that pass every predicate.  Chunks are fed through a generator
+pipeline into aggregation builders, so peak memory is set by the chunk size
+rather than the file size::
+
+    chunks = stream_csv('bowling_clean.csv', ['team', 'wickets'], where=[non_numeric('team')])
+    wickets, = aggregate(chunks, GroupSum('team', ['wickets']))
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+CHUNK_ROWS = 100_000
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A row filter plus the columns it needs to read."""
+    columns: tuple
+    mask: Callable[[pd.DataFrame], pd.Series]
+
+
+def non_numeric(column):
+    """Rows whose ``column`` is not a number, e.g. team names mixed with ids."""
+    return Predicate((column,), lambda df: pd.to_numeric(df[column], errors='coerce').isna())
+
+
+def stream_csv(path, columns: Optional[Sequence[str]] = None, where: Sequence[Predicate] = (),
+               chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield projected, filtered chunks of ``path``.
+
+    Columns needed only by predicates are read, used for filtering and then
+    dropped, so each chunk holds exactly ``columns``.
+    """
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys([*columns, *(c for p in where for c in p.columns)]))
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize, low_memory=False):
+        for predicate in where:
+            chunk = chunk[predicate.mask(chunk)]
+        if columns is not None:
+            chunk = chunk[list(columns)]
+        if len(chunk):
+            yield chunk
+
+
+def read_csv(path, columns=None, where=(), chunksize=CHUNK_ROWS) -> pd.DataFrame:
+    """Materialise a projected, filtered table from its chunks."""
+    chunks = list(stream_csv(path, columns, where, chunksize))
+    if not chunks:
+        return pd.read_csv(path, usecols=columns, nrows=0)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# --- Aggregation builders ---
+class GroupSum:
+    """Sum ``values`` grouped by ``keys``, combining per-chunk partial sums."""
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = list(values)
+        self._partials = []
+
+    def update(self, chunk):
+        partial = chunk.groupby(self.keys)[self.values].sum()
+        # Re-reduce every so often so the partials list stays short
+        self._partials.append(partial)
+        if len(self._partials) >= 16:
+            self._partials = [self.result()]
+
+    def result(self):
+        if not self._partials:
+            return pd.DataFrame(columns=self.values)
+        return pd.concat(self._partials).groupby(level=list(range(self._partials[0].index.nlevels))).sum()
+
+
+class GroupNunique:
+    """Count distinct ``value`` combinations per ``keys`` across chunks."""
+
+    def __init__(self, keys, value):
+        self.keys = [keys] if isinstance(keys, str) else list(keys)
+        self.value = [value] if isinstance(value, str) else list(value)
+        self._seen = []
+
+    def update(self, chunk):
+        self._seen.append(chunk[self.keys + self.value].drop_duplicates())
+        if len(self._seen) >= 16:
+            self._seen = [pd.concat(self._seen).drop_duplicates()]
+
+    def result(self):
+        if not self._seen:
+            return pd.Series(dtype='int64')
+        seen = pd.concat(self._seen).drop_duplicates()
+        return seen.groupby(self.keys[0] if len(self.keys) == 1 else self.keys).size()
+
+
+def aggregate(chunks: Iterable[pd.DataFrame], *builders):
+    """Feed every chunk to every builder in one pass and return their results."""
+    for chunk in chunks:
+        for builder in builders:
+            builder.update(chunk)
+    return tuple(builder.result() for builder in builders)
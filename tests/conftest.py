@@ -0,0 +1,143 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import DatasetBundle  # noqa: E402
+
+
+@pytest.fixture
+def matches():
+    """Six dated match summaries across two series; the last is won by Team 1."""
+    rows = [
+        (1, '2019-01-05', 'Tri-Series', 'India', 'Australia', 280, 250, 6, 10, 'India', 'won', 11, 'Virat Kohli'),
+        (2, '2019-01-08', 'Tri-Series', 'Australia', 'England', 300, 301, 8, 4, 'England', 'won', 12, 'Joe Root'),
+        (3, '2019-01-12', 'Tri-Series', 'England', 'India', 240, 240, 9, 7, None, 'tie', None, None),
+        (4, '2020-02-01', 'Bilateral', 'India', 'England', 310, 200, 5, 10, 'India', 'won', 11, 'Virat Kohli'),
+        (5, '2020-02-04', 'Bilateral', 'England', 'India', 150, None, 3, None, None, 'no result', None, None),
+        (6, '2020-02-07', 'Bilateral', 'Australia', 'India', 270, 230, 7, 10, 'Australia', 'won', 13, 'Pat Cummins'),
+    ]
+    frame = pd.DataFrame(rows, columns=[
+        'Match ID', 'Match Date', 'Series Name', 'Team1 Name', 'Team2 Name', 'Team1 Runs Scored',
+        'Team2 Runs Scored', 'Team1 Wickets Fell', 'Team2 Wickets Fell', 'Match Winner', 'result_type',
+        'MOM Player', 'mom_name',
+    ])
+    frame['Match Date'] = pd.to_datetime(frame['Match Date'])
+    frame['year'] = frame['Match Date'].dt.year
+    frame['Match Result Text'] = frame['result_type'].map({'tie': 'Match tied'})
+    return frame
+
+
+@pytest.fixture
+def make_bundle():
+    """A DatasetBundle holding the given tables under ``version``."""
+    def make(version, **tables):
+        return DatasetBundle(version=version, **tables)
+    return make
+
+
+TEAMS = ['India', 'Australia', 'England', 'Pakistan']
+VENUES = [('Eden Gardens', 'Kolkata', 'India'), ('Melbourne Cricket Ground', 'Melbourne', 'Australia'),
+          ('Lord\'s', 'London', 'England'), ('Gaddafi Stadium', 'Lahore', 'Pakistan')]
+
+
+def write_dataset(data_dir, n_matches=16, seed=0):
+    """Small but complete copies of every CSV the dashboards read, under ``data_dir``."""
+    rng = np.random.default_rng(seed)
+    players = pd.DataFrame({
+        'player_id': np.arange(1, 6 * len(TEAMS) + 1),
+        'player_object_id': np.arange(1001, 1001 + 6 * len(TEAMS)),
+        'player_name': [f"{first} {team[:3]}{i}" for i, (team, first) in enumerate(
+            (team, first) for team in TEAMS for first in ['Arun', 'Ben', 'Carl', 'Dev', 'Eli', 'Fay'])],
+        'dob': '1990-01-01',
+        'gender': 'M',
+        'batting_style': ['right-hand bat', 'left-hand bat'] * (3 * len(TEAMS)),
+        'bowling_style': ['right-arm fast', 'right-arm offbreak', 'slow left-arm orthodox'] * (2 * len(TEAMS)),
+        'country_id': np.repeat(np.arange(len(TEAMS)), 6),
+    })
+    squads = {team: players['player_id'].to_numpy()[6 * i:6 * i + 6] for i, team in enumerate(TEAMS)}
+
+    matches, bowling, fow, partnership = [], [], [], []
+    for n in range(n_matches):
+        match_id = 5000 + n
+        team1, team2 = rng.choice(TEAMS, 2, replace=False)
+        venue = VENUES[n % len(VENUES)]
+        runs = [int(rng.integers(180, 320)), int(rng.integers(150, 320))]
+        fell = [int(rng.integers(4, 11)), int(rng.integers(3, 11))]
+        if runs[0] > runs[1]:
+            winner, text = team1, f"{team1} won by {runs[0] - runs[1]} runs"
+        elif runs[1] > runs[0]:
+            winner, text = team2, f"{team2} won by {10 - fell[1]} wickets (with 12 balls remaining)"
+        else:
+            winner, text = None, 'Match tied'
+        if n == n_matches - 1:
+            winner, text, runs[1], fell[1] = None, 'No result', None, None
+        matches.append((
+            match_id, f"{team1} Vs {team2} {n + 1}Th Match", f"{2015 + n // 6}-0{1 + n % 6}-1{n % 9}",
+            f"{'Tri-Series' if n % 2 else 'Bilateral'} {2015 + n // 6}", team1, runs[0], fell[0], team2, runs[1],
+            fell[1], *venue, rng.choice([team1, team2]), winner, text, squads[winner or team1][0],
+        ))
+        for innings, (batting, fielding) in enumerate([(team1, team2), (team2, team1)], start=1):
+            for bowler in squads[fielding][:5]:
+                overs = float(rng.integers(1, 11))
+                conceded = float(rng.integers(10, 70))
+                bowling.append((match_id, innings, fielding, batting, bowler, overs, conceded,
+                                float(rng.integers(0, 4)), conceded / overs))
+            batters = squads[batting]
+            total = 0
+            for wicket in range(1, 6):
+                stand = int(rng.integers(0, 60))
+                total += stand
+                partnership.append((match_id, innings, batting, batters[wicket - 1], batters[wicket], stand,
+                                    int(rng.integers(stand // 2, stand + 30)), wicket))
+                if innings == 1 or wicket < 5:
+                    fow.append((match_id, innings, batting, batters[wicket - 1], float(wicket),
+                                round(wicket * 7.3, 1), float(total)))
+
+    frames = {
+        'player_info_clean.csv': players,
+        'cleaned_odi_match_summary.csv': pd.DataFrame(matches, columns=[
+            'Match ID', 'Match Name', 'Match Date', 'Series Name', 'Team1 Name', 'Team1 Runs Scored',
+            'Team1 Wickets Fell', 'Team2 Name', 'Team2 Runs Scored', 'Team2 Wickets Fell', 'Match Venue (Stadium)',
+            'Match Venue (City)', 'Match Venue (Country)', 'Toss Winner', 'Match Winner', 'Match Result Text',
+            'MOM Player']),
+        'bowling_clean.csv': pd.DataFrame(bowling, columns=[
+            'Match ID', 'innings', 'team', 'opposition', 'bowler id', 'overs', 'conceded', 'wickets', 'economy']),
+        'fow_clean.csv': pd.DataFrame(fow, columns=[
+            'Match ID', 'innings', 'team', 'player', 'wicket', 'over', 'runs']),
+        'partnership_clean.csv': pd.DataFrame(partnership, columns=[
+            'Match ID', 'innings', 'team', 'player1', 'player2', 'partnership runs', 'partnership balls',
+            'for wicket']),
+    }
+    bowled = frames['bowling_clean.csv'].groupby('bowler id')
+    frames['cleaned_odi_player_summary.csv'] = pd.DataFrame({
+        'matches_bat': 10, 'innings_batted': 10, 'runs': rng.integers(50, 500, len(players)).astype(float),
+        'balls': rng.integers(80, 600, len(players)).astype(float), 'fours': 5.0, 'sixes': 1.0,
+        'bat_avg': rng.uniform(5, 50, len(players)), 'strike_rate': rng.uniform(50, 120, len(players)),
+        'matches_bowl': 10, 'innings_bowled': 10,
+        'wickets': bowled['wickets'].sum().reindex(players['player_id']).to_numpy(),
+        'runs_conceded': bowled['conceded'].sum().reindex(players['player_id']).to_numpy(),
+        'overs': bowled['overs'].sum().reindex(players['player_id']).to_numpy(),
+        'player_name': players['player_name'],
+    })
+    summary = bowled[['overs', 'conceded', 'wickets']].sum().reset_index()
+    frames['Final_bowling_summary_final.csv'] = pd.DataFrame({
+        'player_id': summary['bowler id'].astype(float),
+        'player_name': summary['bowler id'].map(players.set_index('player_id')['player_name']),
+        'bowling_style': 'right-arm fast', 'innings_bowled': 2, 'total_overs': summary['overs'],
+        'total_balls': summary['overs'] * 6, 'total_runs': summary['conceded'],
+        'economy': summary['conceded'] / summary['overs'], 'wickets': summary['wickets'],
+    })
+    for name, frame in frames.items():
+        frame.to_csv(os.path.join(data_dir, name), index=False)
+    return data_dir
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A directory holding a small generated copy of the dashboard CSVs."""
+    return str(write_dataset(tmp_path))
@@ -0,0 +1,50 @@
+import json
+
+import pandas as pd
+import pytest
+
+import analytics
+
+
+@pytest.fixture
+def bowling():
+    return pd.DataFrame({
+        'Match ID': [1, 1, 2, 2],
+        'team': ['India', 'Australia', 'India', 'England'],
+        'opposition': ['Australia', 'India', 'England', 'India'],
+        'wickets': [3, 2, 4, 1],
+        'conceded': [40, 55, 30, 62],
+    })
+
+
+@pytest.fixture
+def match_dates():
+    return pd.DataFrame({'Match ID': [1, 2], 'Match Date': pd.to_datetime(['2019-01-05', '2019-01-08'])})
+
+
+def write_aggregates(data_dir, bowling, matches):
+    h2h = bowling.groupby(['team', 'opposition'])[['wickets', 'conceded']].sum()
+    section = {f'{team}|{opposition}': {column: float(value) for column, value in row.items()}
+               for (team, opposition), row in h2h.iterrows()}
+    with open(data_dir / analytics.AGGREGATES_FILE, 'w') as fh:
+        json.dump({'h2h': section, 'matches': matches}, fh)
+
+
+def test_matching_aggregates_serve_the_same_views(tmp_path, bowling, match_dates, make_bundle):
+    write_aggregates(tmp_path, bowling, [1, 2])
+    totals = analytics._h2h_totals(str(tmp_path), bowling, match_dates)
+    assert totals is not None
+
+    served = make_bundle('agg', bowling=bowling, h2h_totals=totals)
+    rows = make_bundle('rows', bowling=bowling)
+    pd.testing.assert_frame_equal(analytics.wickets_by_team(served), analytics.wickets_by_team(rows))
+    assert analytics.h2h_opponents(served, 'India') == analytics.h2h_opponents(rows, 'India')
+    pd.testing.assert_frame_equal(analytics.h2h(served, 'India', 'England'), analytics.h2h(rows, 'India', 'England'))
+
+
+def test_stale_aggregates_fall_back_to_rows(tmp_path, bowling, match_dates):
+    write_aggregates(tmp_path, bowling[bowling['Match ID'] == 1], [1])
+    assert analytics._h2h_totals(str(tmp_path), bowling, match_dates) is None
+
+    write_aggregates(tmp_path, bowling.iloc[:-1], [1, 2])
+    assert analytics._h2h_totals(str(tmp_path), bowling, match_dates) is None
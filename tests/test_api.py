@@ -0,0 +1,79 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import api
+import ingest
+
+
+@pytest.fixture
+def server(data_dir, monkeypatch):
+    monkeypatch.setattr(api, 'VERSION_CHECK_SECONDS', 0.0)
+    api.response.cache_clear()
+    server = api.make_server(port=0, data_dir=data_dir)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, **headers):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        connection.request('GET', path, headers=headers)
+        reply = connection.getresponse()
+        return reply.status, dict(reply.getheaders()), reply.read()
+    finally:
+        connection.close()
+
+
+H2H = '/h2h?team1=India&team2=Australia'
+
+
+def test_etag_and_not_modified(server):
+    status, headers, body = get(server, H2H)
+    assert status == 200
+    etag = headers['ETag']
+    assert etag.startswith('"') and json.loads(body)
+
+    for tag in (etag, f"W/{etag}", '*', f'"other", {etag}'):
+        status, headers, body = get(server, H2H, **{'If-None-Match': tag})
+        assert (status, body) == (304, b''), tag
+        assert headers['ETag'] == etag
+
+    status, _, body = get(server, H2H, **{'If-None-Match': '"other"'})
+    assert status == 200 and body
+
+
+@pytest.mark.parametrize('path', [
+    '/h2h?team1=India',
+    '/bowler-vs-opposition',
+    '/top-partnerships?n=0',
+    f'/top-partnerships?n={api.MAX_ROWS + 1}',
+    '/top-partnerships?n=ten',
+])
+def test_bad_parameters(server, path):
+    status, _, body = get(server, path)
+    assert status == 400
+    assert 'error' in json.loads(body)
+
+
+def test_unknown_path(server):
+    status, _, body = get(server, '/nope')
+    assert status == 404
+    assert 'error' in json.loads(body)
+
+
+def test_etag_survives_unchanged_result(server, data_dir):
+    _, before, _ = get(server, H2H)
+    ingest.bump_version(data_dir)
+    _, after, _ = get(server, H2H)
+
+    assert after['X-Dataset-Version'] != before['X-Dataset-Version']
+    assert after['ETag'] == before['ETag']
+    status, _, _ = get(server, H2H, **{'If-None-Match': before['ETag']})
+    assert status == 304
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+
+
+@pytest.fixture
+def fow():
+    rows = [
+        (1, 1, 'Rohit', 1), (1, 1, 'Dhawan', 2), (1, 1, 'Kohli', 3), (1, 2, 'Warner', 1),
+        (1, 2, 'Smith', 4), (1, 2, 'Smith', 4), (2, 2, 'Kohli', 2), (2, 2, 'Rohit', 1),
+        # Invalid wicket numbers are ignored, so Root and Stokes have no dismissals
+        (2, 1, 'Root', 0), (2, 1, 'Buttler', 11), (2, 1, 'Stokes', 2.5), (2, 1, 'Buttler', 10),
+        (2, 1, None, 3),
+    ]
+    return pd.DataFrame(rows, columns=['Match ID', 'innings', 'player_name', 'wicket'])
+
+
+@pytest.fixture
+def bundle(fow, make_bundle):
+    # Gill only batted in stands and was never dismissed
+    partnership = pd.DataFrame({
+        'Match ID': [1, 3], 'player1_name': ['Rohit', 'Gill'], 'player2_name': ['Dhawan', 'Kohli'],
+    })
+    return make_bundle('dm1', fow=fow, partnership=partnership)
+
+
+def test_dismissal_matrix_matches_groupby(bundle, fow):
+    matrix = analytics.dismissal_matrix(bundle)
+
+    assert matrix.players == ['Buttler', 'Dhawan', 'Gill', 'Kohli', 'Rohit', 'Root', 'Smith', 'Stokes', 'Warner']
+    valid = fow[fow['wicket'].isin(range(1, 11))]
+    expected = (valid.groupby(['player_name', valid['wicket'].astype(int)]).size().unstack(fill_value=0)
+                .reindex(index=matrix.players, columns=range(1, 11), fill_value=0))
+    np.testing.assert_array_equal(matrix.counts, expected.to_numpy())
+    assert not matrix.row('Gill').any() and not matrix.row('Root').any()
+    assert not matrix.row('Nobody').any()
+
+
+def test_dismissal_positions(bundle):
+    positions = analytics.dismissal_positions(bundle, 'Rohit')
+    assert positions['wicket'].tolist() == [1]
+    assert positions['count'].tolist() == [2]
+    assert positions['percentage'].tolist() == [100.0]
+    assert analytics.dismissal_positions(bundle, 'Gill').empty
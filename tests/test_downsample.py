@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import downsample
+
+
+@pytest.fixture
+def bowling():
+    rng = np.random.default_rng(1)
+    economy = np.concatenate([rng.normal(5, 1, 60), [14.0, 0.5, np.nan]])
+    return pd.DataFrame({
+        'player_name': ['Bowler A'] * len(economy) + ['Bowler B'] * 4,
+        'economy': np.concatenate([economy, [np.nan] * 4]),
+    })
+
+
+@pytest.fixture
+def partnership():
+    rng = np.random.default_rng(2)
+    n = 300
+    return pd.DataFrame({
+        'team': rng.choice(['India', 'Australia', 'England'], n),
+        'partnership balls': rng.integers(0, 150, n),
+        'partnership runs': rng.integers(0, 180, n),
+    })
+
+
+def test_hexbin_counts_every_point():
+    rng = np.random.default_rng(3)
+    x, y = rng.normal(size=1000), rng.normal(size=1000)
+    cells = downsample.hexbin(x, y, gridsize=10)
+
+    assert cells['count'].sum() == 1000
+    assert len(cells) < 1000
+    assert not cells[['x', 'y']].duplicated().any()
+
+
+def test_hexbin_of_nothing():
+    cells = downsample.hexbin([], [])
+    assert cells.empty and list(cells.columns) == ['x', 'y', 'count']
+
+
+def test_box_summary_matches_quantiles(bowling):
+    values = bowling.loc[bowling['player_name'] == 'Bowler A', 'economy']
+    summary = downsample.box_summary(values)
+
+    assert summary['q1'] == pytest.approx(values.quantile(0.25))
+    assert summary['median'] == pytest.approx(values.quantile(0.5))
+    assert summary['q3'] == pytest.approx(values.quantile(0.75))
+    assert summary['mean'] == pytest.approx(values.mean())
+    assert summary['count'] == values.count()
+    assert set(summary['outliers']) >= {14.0, 0.5}
+    assert summary['lowerfence'] <= summary['q1'] <= summary['q3'] <= summary['upperfence']
+    inside = values[values.between(summary['lowerfence'], summary['upperfence'])]
+    assert len(inside) + len(summary['outliers']) == values.count()
+
+
+@pytest.mark.parametrize('values', [[], [np.nan, np.nan]])
+def test_box_summary_of_nothing(values):
+    assert downsample.box_summary(values) is None
+
+
+def test_economy_view_switches_on_budget(bowling, make_bundle):
+    bundle = make_bundle('e1', bowling=bowling)
+    mode, rows = downsample.economy_view(bundle, 'Bowler A', 1000)
+    assert mode == 'points' and len(rows) == 63
+
+    mode, summary = downsample.economy_view(bundle, 'Bowler A', 10)
+    assert mode == 'summary' and summary['count'] == 62
+    assert downsample.economy_view(bundle, 'Bowler B', 2) == ('summary', None)
+
+
+def test_partnership_pace_view_bins_over_budget(partnership, make_bundle):
+    bundle = make_bundle('p1', partnership=partnership)
+    teams = ('Australia', 'India')
+    mode, bins, total = downsample.partnership_pace_view(bundle, teams, None, None, 50)
+
+    expected = partnership[partnership['team'].isin(teams) & (partnership['partnership balls'] > 0)]
+    assert mode == 'bins'
+    assert total == len(expected)
+    assert bins['count'].sum() == total
+    assert bins.groupby('team')['count'].sum().to_dict() == expected['team'].value_counts().to_dict()
+
+
+def test_partnership_pace_view_zoomed_window_uses_points(partnership, make_bundle):
+    bundle = make_bundle('p2', partnership=partnership)
+    mode, rows, total = downsample.partnership_pace_view(bundle, ('India',), (1, 20), (0, 30), 50)
+
+    assert mode == 'points' and total == len(rows) <= 50
+    assert rows['partnership balls'].between(1, 20).all()
+    assert rows['partnership runs'].between(0, 30).all()
@@ -0,0 +1,113 @@
+import functools
+import os
+
+import pytest
+
+import etl
+
+
+def concat(inputs, output, data_dir):
+    """Stand-in stage: ``output`` is its inputs joined, and the run is logged."""
+    with open(os.path.join(data_dir, 'runs.log'), 'a') as log:
+        log.write(f"{output}\n")
+    parts = []
+    for name in inputs:
+        with open(os.path.join(data_dir, name)) as fh:
+            parts.append(fh.read())
+    with open(os.path.join(data_dir, output), 'w') as fh:
+        fh.write('|'.join(parts))
+
+
+def stage(name, inputs, output):
+    return etl.Stage(name, functools.partial(concat, inputs, output), inputs, (output,))
+
+
+# Declared out of order: report needs both summaries, which need the cleaned inputs
+STAGES = (
+    stage('report', ('a_summary.csv', 'b_summary.csv'), 'report.csv'),
+    stage('b_summary', ('b_clean.csv', 'a_clean.csv'), 'b_summary.csv'),
+    stage('a_summary', ('a_clean.csv',), 'a_summary.csv'),
+    stage('a_clean', ('a_raw.csv',), 'a_clean.csv'),
+    stage('b_clean', ('b_raw.csv',), 'b_clean.csv'),
+)
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(etl, 'STAGES', STAGES)
+    for name in ('a_raw.csv', 'b_raw.csv'):
+        (tmp_path / name).write_text(name)
+
+    def run(**kwargs):
+        log = tmp_path / 'runs.log'
+        log.unlink(missing_ok=True)
+        status = etl.run_pipeline(str(tmp_path), workers=2, **kwargs)
+        runs = log.read_text().split() if log.exists() else []
+        return status, [output.split('.')[0] for output in runs]
+    return tmp_path, run
+
+
+def built(status):
+    return {name for name, result in status.items() if result.startswith('built')}
+
+
+def test_stages_run_after_their_dependencies(pipeline):
+    _, run = pipeline
+    status, runs = run()
+
+    assert built(status) == {s.name for s in STAGES}
+    deps = etl.dependencies(STAGES)
+    for name in runs:
+        assert all(runs.index(dep) < runs.index(name) for dep in deps[name]), runs
+
+
+def test_second_run_skips_every_stage(pipeline):
+    _, run = pipeline
+    run()
+    status, runs = run()
+
+    assert runs == []
+    assert set(status.values()) == {'up to date'}
+
+
+def test_changed_input_reruns_only_downstream(pipeline):
+    data_dir, run = pipeline
+    run()
+    (data_dir / 'b_raw.csv').write_text('b_raw.csv, corrected')
+    status, runs = run()
+
+    assert built(status) == {'b_clean', 'b_summary', 'report'}
+    assert status['a_clean'] == status['a_summary'] == 'up to date'
+    assert runs.index('b_summary') < runs.index('report')
+
+
+def test_touched_but_unchanged_input_is_skipped(pipeline):
+    data_dir, run = pipeline
+    run()
+    os.utime(data_dir / 'a_raw.csv')
+    status, _ = run()
+    assert set(status.values()) == {'up to date'}
+
+
+def test_force_rebuilds_everything(pipeline):
+    _, run = pipeline
+    run()
+    status, runs = run(force=True)
+    assert built(status) == {s.name for s in STAGES}
+    assert sorted(runs) == sorted(s.name for s in STAGES)
+
+
+def test_missing_output_is_rebuilt(pipeline):
+    data_dir, run = pipeline
+    run()
+    (data_dir / 'a_summary.csv').unlink()
+    status, _ = run()
+    assert built(status) == {'a_summary'}
+
+
+def test_declared_stages_follow_their_producers():
+    order = [s.name for s in etl.topological_order(etl.STAGES)]
+    for name, deps in etl.dependencies(etl.STAGES).items():
+        assert all(order.index(dep) < order.index(name) for dep in deps)
+    assert order.index('player_info_clean') < order.index('match_summary')
+    assert order.index('batting_summary') < order.index('player_summary')
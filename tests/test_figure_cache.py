@@ -0,0 +1,104 @@
+import json
+
+import pandas as pd
+import pytest
+
+import analytics
+import figures
+from figure_cache import FigureCache
+
+
+def option(size):
+    """An ECharts option whose JSON text is exactly ``size`` bytes."""
+    text = json.dumps({'pad': ''})
+    return {'pad': 'x' * (size - len(text))}
+
+
+def test_entries_are_keyed_by_version():
+    cache = FigureCache()
+    cache.put('chart', 'v1', option(100))
+    cache.put('chart', 'v2', option(200))
+
+    assert cache.get('chart', 'v1') == option(100)
+    assert cache.get('chart', 'v2') == option(200)
+    assert cache.get('chart', 'v3') is None
+    assert cache.get('other', 'v1') is None
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.bytes == 300
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = FigureCache()
+    cache.put('chart', 'v1', option(100))
+    cache.put('chart', 'v1', option(40))
+    assert len(cache) == 1 and cache.bytes == 40
+    assert cache.get_json('chart', 'v1') == json.dumps(option(40))
+
+
+def test_least_recently_used_is_evicted_over_budget():
+    cache = FigureCache(max_bytes=300)
+    for name in ('a', 'b', 'c'):
+        cache.put(name, 'v1', option(100))
+    cache.get('a', 'v1')
+    cache.put('d', 'v1', option(100))
+
+    assert ('b', 'v1') not in cache
+    assert all((name, 'v1') in cache for name in ('a', 'c', 'd'))
+    assert cache.bytes == 300 <= cache.max_bytes
+
+
+def test_oversized_entry_evicts_everything_else():
+    cache = FigureCache(max_bytes=300)
+    cache.put('a', 'v1', option(100))
+    cache.put('big', 'v1', option(1000))
+    assert len(cache) == 1 and ('big', 'v1') in cache
+    assert cache.bytes == 1000
+
+
+def test_json_entries_decode_on_first_get():
+    cache = FigureCache()
+    cache.put_json('chart', 'v1', json.dumps(option(50)), 'echarts')
+    assert cache.items() == [('chart', 'v1', 'echarts', json.dumps(option(50)))]
+    assert cache.get('chart', 'v1') == option(50)
+
+
+def test_get_or_build_builds_once_per_version():
+    cache = FigureCache()
+    calls = []
+
+    def build(version):
+        calls.append(version)
+        return option(80)
+
+    for version in ('v1', 'v1', 'v2'):
+        cache.get_or_build('chart', version, build, version)
+    assert calls == ['v1', 'v2']
+
+
+@pytest.fixture
+def bundle(matches, make_bundle):
+    venues = [f"Ground {i}" for i in range(12)]
+    many = pd.concat([matches.assign(**{'Match ID': matches['Match ID'] + 10 * i}) for i in range(2)],
+                     ignore_index=True)
+    many['Match Venue (Stadium)'] = venues
+    return make_bundle('fc1', matches=many)
+
+
+def test_default_selection_is_the_static_figure(bundle):
+    cache = FigureCache()
+    years, teams, venues = figures.match_filter_defaults(bundle)
+    assert len(venues) == 10
+
+    figure = figures.filtered_matches_per_year(bundle, list(years), list(reversed(teams)), list(venues), cache=cache)
+    assert list(cache._entries) == [('matches_per_year', 'fc1')]
+    assert figures.static_figure('matches_per_year', bundle, cache) is figure
+
+
+def test_other_selections_share_an_entry_in_any_order(bundle):
+    cache = FigureCache()
+    first = figures.filtered_matches_per_year(bundle, [2020, 2019], ['India'], ['Ground 3', 'Ground 1'], cache=cache)
+    again = figures.filtered_matches_per_year(bundle, [2019, 2020], ['India'], ['Ground 1', 'Ground 3'], cache=cache)
+
+    assert again is first and len(cache) == 1
+    expected = analytics.matches_per_year(bundle, (2019, 2020), ('India',), ('Ground 1', 'Ground 3'))
+    assert list(first.data[0].y) == expected['Match ID'].tolist()
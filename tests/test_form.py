@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+import form
+
+
+@pytest.fixture
+def spells():
+    rng = np.random.default_rng(5)
+    n = 60
+    dates = pd.Timestamp('2019-01-31') + pd.to_timedelta(np.sort(rng.integers(0, 900, n)), unit='D')
+    return pd.DataFrame({
+        'Match ID': np.arange(n),
+        'player': rng.choice(['A', 'B', 'C'], n),
+        'date': dates,
+        'innings': 1,
+        'balls': rng.integers(6, 60, n).astype(float),
+        'conceded': rng.integers(0, 70, n).astype(float),
+        'wickets': rng.integers(0, 5, n).astype(float),
+    })
+
+
+def expected_innings(rows, n):
+    rolled = rows[form.MEASURES['bowling']].rolling(n, min_periods=1).sum()
+    return rolled.reset_index(drop=True)
+
+
+def expected_months(rows, n):
+    dates = rows['date'].reset_index(drop=True)
+    values = rows[form.MEASURES['bowling']].reset_index(drop=True)
+    return pd.DataFrame([values[(dates > date - pd.DateOffset(months=n)) & (dates <= date)].sum()
+                         for date in dates]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('window', [form.DEFAULT_WINDOW, ('innings', 3), ('innings', 1), ('innings', 100)])
+def test_innings_windows_match_rolling_sums(spells, window):
+    series = form.FormSeries('bowling', spells)
+    for player, rows in spells.groupby('player'):
+        table = series.player(player, *window)
+        expected = expected_innings(rows, window[1])
+        pd.testing.assert_frame_equal(table[form.MEASURES['bowling']], expected, check_dtype=False)
+        economy = (expected['conceded'] * 6 / expected['balls']).round(2)
+        pd.testing.assert_series_equal(table['economy'], economy, check_names=False)
+
+
+@pytest.mark.parametrize('n', [1, 3, 12])
+def test_month_windows_match_calendar_months(spells, n):
+    series = form.FormSeries('bowling', spells)
+    for player, rows in spells.groupby('player'):
+        table = series.player(player, 'months', n)
+        pd.testing.assert_frame_equal(table[form.MEASURES['bowling']], expected_months(rows, n), check_dtype=False)
+
+
+def test_precomputed_window_matches_sliced_windows(spells):
+    # A months window as the build-time default, served from the precomputed sums
+    series = form.FormSeries('bowling', spells, window=('months', 3))
+    for player, rows in spells.groupby('player'):
+        table = series.player(player, 'months', 3)
+        pd.testing.assert_frame_equal(table[form.MEASURES['bowling']], expected_months(rows, 3), check_dtype=False)
+
+
+def test_unknown_player_is_empty(spells):
+    assert form.FormSeries('bowling', spells).player('Nobody').empty
+
+
+def test_batting_form_is_rolling_mean_of_stand_runs(data_dir):
+    bundle = analytics.load_bundle(data_dir)
+    appearances = form.batting_appearances(bundle).sort_values(['player', 'date', 'Match ID'], kind='stable')
+    for player in form.form_players(bundle, 'batting')[:5]:
+        rows = appearances[appearances['player'] == player]
+        table = form.player_form(bundle, 'batting', player, 'innings', 4)
+        expected = rows['stand_runs'].fillna(0).rolling(4, min_periods=1).mean().round(2)
+        np.testing.assert_allclose(table['runs_per_innings'], expected)
+        assert table['date'].is_monotonic_increasing
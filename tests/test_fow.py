@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+
+
+@pytest.fixture
+def fow():
+    rows = [
+        # Match 1, innings 1: wickets 1-6 in order
+        (1, 1, 'India', 'Rohit', 1, 5.2, 30), (1, 1, 'India', 'Dhawan', 2, 9.0, 41),
+        (1, 1, 'India', 'Kohli', 3, 20.4, 120), (1, 1, 'India', 'Rahul', 4, 21.1, 126),
+        (1, 1, 'India', 'Pant', 5, 22.0, 130), (1, 1, 'India', 'Jadeja', 6, 30.3, 180),
+        # Match 1, innings 2: third wicket missing, a repeated wicket and a placeholder over
+        (1, 2, 'Australia', 'Warner', 1, 0.4, 0), (1, 2, 'Australia', 'Finch', 2, 3.3, 12),
+        (1, 2, 'Australia', 'Smith', 4, 12.0, 60), (1, 2, 'Australia', 'Smith', 4, 12.1, 61),
+        (1, 2, 'Australia', 'Maxwell', 5, 55.0, 70), (1, 2, 'Australia', 'Carey', 6, 16.2, 75),
+        # Match 2, innings 1: only rows with invalid wicket numbers, so no wickets
+        (2, 1, 'England', 'Root', 0, 10.0, 50), (2, 1, 'England', 'Buttler', 11, 49.0, 290),
+        (2, 1, 'England', 'Stokes', 2.5, 30.0, 150),
+        # Match 2, innings 2: listed out of order
+        (2, 2, 'India', 'Kohli', 2, 15.0, 80), (2, 2, 'India', 'Rohit', 1, 2.1, 10),
+    ]
+    return pd.DataFrame(rows, columns=['Match ID', 'innings', 'team', 'player_name', 'wicket', 'over', 'runs'])
+
+
+@pytest.fixture
+def bundle(fow, make_bundle):
+    return make_bundle('fow1', fow=fow)
+
+
+def expected_metrics(fow, k):
+    """Per-innings loop over the wickets recorded once with a whole number from 1 to 10."""
+    rows = []
+    for _, innings in fow.groupby(['Match ID', 'innings']):
+        valid = innings[innings['wicket'].isin(range(1, 11))].drop_duplicates('wicket')
+        runs = dict(zip(valid['wicket'], valid['runs']))
+        overs = dict(zip(valid['wicket'], valid['over']))
+
+        def at(values, wicket):
+            return 0.0 if wicket == 0 else values.get(wicket, np.nan)
+
+        for index, row in valid.iterrows():
+            w = row['wicket']
+            ball = lambda over: np.nan if over > 50 else int(over) * 6 + round((over - int(over)) * 10)
+            balls = ball(row['over'])
+            earlier_balls = 0.0 if w == 1 else ball(overs[w - 1]) if w - 1 in overs else np.nan
+            runs_added = row['runs'] - at(runs, w - 1)
+            consumed = balls - earlier_balls
+            rows.append({
+                'index': index,
+                'balls': balls,
+                'runs_added': runs_added,
+                'overs_consumed': consumed / 6,
+                'stand_rate': runs_added * 6 / consumed if consumed > 0 else np.nan,
+                'collapse_runs': row['runs'] - at(runs, w - k) if w >= k else np.nan,
+            })
+    return pd.DataFrame(rows).set_index('index').sort_index()
+
+
+@pytest.mark.parametrize('k', [1, 2, 4])
+def test_fow_metrics_match_per_innings_loop(bundle, fow, k):
+    metrics = analytics.fow_metrics(bundle, k, 30)
+    assert metrics[['Match ID', 'innings', 'wicket']].apply(tuple, axis=1).is_monotonic_increasing
+    assert sorted(metrics.index) == list(fow.index)
+
+    expected = expected_metrics(fow, k)
+    computed = metrics.loc[expected.index, expected.columns]
+    pd.testing.assert_frame_equal(computed.astype(float), expected.astype(float))
+    # Invalid and repeated wicket numbers keep NaN metrics
+    others = metrics.drop(expected.index)
+    assert sorted(others.index) == [9, 12, 13, 14]
+    assert others[expected.columns].isna().all().all()
+    assert (metrics['collapse'] == (metrics['collapse_runs'] <= 30)).all()
+
+
+def test_collapse_and_stand_views(bundle):
+    collapses = analytics.biggest_collapses(bundle, 10, 4)
+    assert collapses.to_dict('records') == [
+        # Wicket 3 is missing, but the innings start and wicket 4 bound the collapse
+        {'Match ID': 1, 'team': 'Australia', 'innings': 2, 'wickets': '1-4', 'from': '0/0', 'to': '60/4', 'runs': 60},
+        {'Match ID': 1, 'team': 'India', 'innings': 1, 'wickets': '2-5', 'from': '30/1', 'to': '130/5', 'runs': 100},
+    ]
+
+    stands = analytics.average_stand_by_wicket(bundle, ('India',))
+    first = stands[stands['wicket'] == 1].iloc[0]
+    assert first['stands'] == 2 and first['average_stand'] == 20.0
+    assert 'England' not in set(analytics.average_stand_by_wicket(bundle, ('England', 'India'))['team'])
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+import analytics
+import leaderboards
+
+
+@pytest.fixture(autouse=True)
+def no_previous_engine(monkeypatch):
+    monkeypatch.setattr(leaderboards, '_latest', {})
+    leaderboards.leaderboards.cache_clear()
+
+
+@pytest.fixture
+def bowling():
+    rows = [
+        (1, 'Pat Cummins', 3, 'Australia', 'India'), (1, 'Jasprit Bumrah', 2, 'India', 'Australia'),
+        (2, 'Jofra Archer', 4, 'England', 'Australia'), (2, 'Pat Cummins', 1, 'Australia', 'England'),
+        (3, 'Jasprit Bumrah', 3, 'India', 'England'), (4, 'Jofra Archer', 2, 'England', 'India'),
+        (6, 'Jasprit Bumrah', 5, 'India', 'Australia'), (6, 'Pat Cummins', 2, 'Australia', 'India'),
+    ]
+    return pd.DataFrame(rows, columns=['Match ID', 'player_name', 'wickets', 'team', 'opposition'])
+
+
+@pytest.fixture
+def partnership():
+    rows = [
+        (1, 'Rohit Sharma', 'Virat Kohli', 120, 'India', 2), (1, 'David Warner', 'Steve Smith', 80, 'Australia', 1),
+        (2, 'Joe Root', 'Jos Buttler', 120, 'England', 4), (3, 'Virat Kohli', 'Rohit Sharma', 45, 'India', 1),
+        (4, 'Virat Kohli', None, 150, 'India', 3), (6, 'Steve Smith', 'David Warner', 85, 'Australia', 2),
+        (6, 'Joe Root', 'Ben Stokes', 40, 'England', 5),
+    ]
+    return pd.DataFrame(rows, columns=['Match ID', 'player1_name', 'player2_name', 'partnership runs', 'team', 'for wicket'])
+
+
+def app_bundle(make_bundle, version, matches, bowling, partnership, upto=None):
+    ids = matches['Match ID'] if upto is None else matches['Match ID'][matches['Match ID'] <= upto]
+    return make_bundle(version, bowling=bowling[bowling['Match ID'].isin(ids)],
+                       partnership=partnership[partnership['Match ID'].isin(ids)],
+                       match_dates=matches.loc[matches['Match ID'].isin(ids), ['Match ID', 'Match Date']])
+
+
+def fresh(bundle):
+    engine = leaderboards.Leaderboards()
+    engine.extend(bundle)
+    return engine
+
+
+def boards(engine):
+    return {name: board.top() for name, board in engine.boards.items()}
+
+
+@pytest.fixture
+def copies(monkeypatch):
+    """Engines copied to be extended."""
+    copied = []
+    copy = leaderboards.Leaderboards.copy
+    monkeypatch.setattr(leaderboards.Leaderboards, 'copy', lambda engine: copied.append(engine) or copy(engine))
+    return copied
+
+
+def test_appended_matches_extend_previous_engine(matches, bowling, partnership, make_bundle, copies):
+    previous = leaderboards.leaderboards(app_bundle(make_bundle, 'v1', matches, bowling, partnership, upto=4))
+    bundle = app_bundle(make_bundle, 'v2', matches, bowling, partnership)
+    extended = leaderboards.leaderboards(bundle)
+
+    assert copies == [previous]
+    assert boards(extended) == boards(fresh(bundle))
+
+
+def test_corrected_rows_rebuild_engine(matches, bowling, partnership, make_bundle, copies):
+    leaderboards.leaderboards(app_bundle(make_bundle, 'v1', matches, bowling, partnership))
+    leaderboards.leaderboards(make_bundle('m1', matches=matches))
+    corrected_bowling = bowling.copy()
+    corrected_bowling.loc[corrected_bowling.index[-1], 'wickets'] = 0
+    corrected_matches = matches.copy()
+    corrected_matches.loc[corrected_matches.index[0], 'Team1 Runs Scored'] -= 100
+
+    bundle = app_bundle(make_bundle, 'v2', matches, corrected_bowling, partnership)
+    assert boards(leaderboards.leaderboards(bundle)) == boards(fresh(bundle))
+    bundle = make_bundle('m2', matches=corrected_matches)
+    assert boards(leaderboards.leaderboards(bundle)) == boards(fresh(bundle))
+    assert copies == []
+
+
+def test_views_break_ties_like_a_full_sort(matches, bowling, partnership, make_bundle):
+    bundle = app_bundle(make_bundle, 'v1', matches, bowling, partnership)
+    for n in range(1, len(partnership) + 1):
+        pd.testing.assert_frame_equal(leaderboards.prolific_pairs(bundle, n), analytics.prolific_pairs(bundle, n))
+        pd.testing.assert_frame_equal(leaderboards.top_partnerships(bundle, n),
+                                      analytics.top_partnerships(bundle, n).reset_index(drop=True), check_dtype=False)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import match_cube
+
+
+@pytest.fixture
+def bundle(make_bundle):
+    # Team 1 bats first; the toss decision follows from who won the toss
+    rows = [
+        (2019, 'Ground A', 'City A', 'Country X', 'India', 'Australia', 'India', 'India', 250),
+        (2019, 'Ground A', 'City A', 'Country X', 'Australia', 'India', 'India', 'India', 200),
+        (2020, 'Ground B', 'City B', 'Country Y', 'England', 'India', 'England', None, 180),
+        (2020, 'Ground B', 'City B', 'Country Y', 'India', 'England', 'England', 'England', np.nan),
+        (2020, 'Ground A', 'City A', 'Country X', 'Australia', 'England', 'Australia', 'Australia', 300),
+    ]
+    matches = pd.DataFrame(rows, columns=[
+        'year', 'Match Venue (Stadium)', 'Match Venue (City)', 'Match Venue (Country)', 'Team1 Name',
+        'Team2 Name', 'Toss Winner', 'Match Winner', 'Team1 Runs Scored'])
+    return make_bundle('cube1', matches=matches)
+
+
+def expected(index, name, rows):
+    return pd.DataFrame(rows, index=pd.Index(index, name=name, dtype=object),
+                        columns=match_cube.ROLLUP_COLUMNS, dtype=float)
+
+
+def test_rollup_by_venue(bundle):
+    cube = match_cube.match_cube(bundle)
+    pd.testing.assert_frame_equal(cube.rollup('venue'), expected(['Ground A', 'Ground B'], 'venue', [
+        [3, 3, 2, 100.0, 66.7, 250.0],
+        # One undecided match, and one first innings without a total
+        [2, 1, 0, 100.0, 0.0, 180.0],
+    ]))
+    city = cube.rollup('city')
+    assert city.index.tolist() == ['City A', 'City B']
+    np.testing.assert_array_equal(city.to_numpy(), cube.rollup('venue').to_numpy())
+
+
+def test_rollup_by_toss_decision(bundle):
+    cube = match_cube.match_cube(bundle)
+    pd.testing.assert_frame_equal(cube.rollup('toss_decision'), expected(['bat', 'field'], 'toss_decision', [
+        [3, 2, 2, 100.0, 100.0, 243.3],
+        [2, 2, 0, 100.0, 0.0, 200.0],
+    ]))
+
+
+def test_filtered_rollup(bundle):
+    cube = match_cube.match_cube(bundle)
+    pd.testing.assert_frame_equal(cube.rollup('year', teams=('England',)), expected([2020], 'year', [
+        [3, 2, 1, 100.0, 50.0, 240.0],
+    ]))
+    assert cube.rollup('year', years=(2019,), venues=('Ground B',)).empty
+
+
+def test_drill_down(bundle):
+    cells = match_cube.match_cube(bundle).rollup(['country', 'batting_first'])
+    assert cells.index.names == ['country', 'batting_first']
+    assert cells['matches'].to_dict() == {
+        ('Country X', 'Australia'): 2, ('Country X', 'India'): 1,
+        ('Country Y', 'England'): 1, ('Country Y', 'India'): 1,
+    }
+    assert cells.loc[('Country X', 'Australia'), 'bat_first_win_pct'] == 50.0
@@ -0,0 +1,66 @@
+import pytest
+
+import analytics
+import player_search
+from player_search import SearchIndex
+
+# Rank order: most wickets first
+NAMES = ['Muttiah Muralidaran', 'Wasim Akram', 'Waqar Younis', 'Mohammad Yousuf', 'Yusuf Pathan',
+         'Sachin Tendulkar', 'Shane Warne', 'Brian Lara', 'Jacques Kallis', 'José Ángel Pérez']
+
+
+@pytest.fixture
+def index():
+    return SearchIndex(NAMES)
+
+
+def test_prefix_matches_at_any_word_start(index):
+    assert index.search('tendul') == ['Sachin Tendulkar']
+    assert index.search('sachin t')[0] == 'Sachin Tendulkar'
+    assert index.search('wa')[:3] == ['Wasim Akram', 'Waqar Younis', 'Shane Warne']
+
+
+def test_prefix_matches_rank_ahead_of_trigram_matches(index):
+    # Mohammad Yousuf ranks higher but only matches "yusuf" by trigrams
+    assert index.search('yusuf')[:2] == ['Yusuf Pathan', 'Mohammad Yousuf']
+
+
+@pytest.mark.parametrize('query, name', [
+    ('tendulker', 'Sachin Tendulkar'),
+    ('waqar yunus', 'Waqar Younis'),
+    ('muralitharan', 'Muttiah Muralidaran'),
+    ('kalis', 'Jacques Kallis'),
+])
+def test_misspelt_queries_find_the_player(index, query, name):
+    assert name in index.search(query)
+
+
+def test_normalised_query(index):
+    assert index.search('  JOSE angel-perez ') == ['José Ángel Pérez']
+
+
+@pytest.mark.parametrize('query', ['', None, '   ', '--'])
+def test_empty_query_returns_rank_order(index, query):
+    assert index.search(query) == NAMES[:player_search.MAX_MATCHES]
+    assert index.search(query, 3) == NAMES[:3]
+
+
+def test_no_match(index):
+    assert index.search('zzzzzz') == []
+
+
+def test_default_is_first_alphabetically(index):
+    assert index.default == 'Brian Lara'
+    assert SearchIndex([]).default is None
+
+
+def test_indexes_rank_by_wickets_and_stand_runs(data_dir):
+    bundle = analytics.load_bundle(data_dir)
+    indexes = player_search.search_indexes(bundle)
+
+    wickets = bundle.bowling.groupby('player_name')['wickets'].sum()
+    bowlers = indexes['bowler'].names
+    assert set(bowlers) == set(analytics.bowler_list(bundle))
+    assert [wickets[name] for name in bowlers] == sorted(wickets[bowlers], reverse=True)
+    assert indexes['bowler'].default == analytics.bowler_list(bundle)[0]
+    assert set(indexes['batsman'].names) == set(analytics.batsman_list(bundle))
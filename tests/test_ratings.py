@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+import ratings
+
+
+@pytest.fixture(autouse=True)
+def no_previous_engine(monkeypatch):
+    monkeypatch.setattr(ratings, '_latest', None)
+    ratings.team_ratings.cache_clear()
+
+
+def fresh(matches):
+    engine = ratings.EloRatings()
+    engine.extend(matches)
+    return engine
+
+
+def test_appended_matches_extend_previous_engine(matches, make_bundle):
+    previous = ratings.team_ratings(make_bundle('v1', matches=matches.iloc[:-1]))
+    extended = ratings.team_ratings(make_bundle('v2', matches=matches))
+
+    assert extended is not previous
+    assert extended.checkpoints[0] is previous.checkpoints[0]
+    pd.testing.assert_frame_equal(extended.table(), fresh(matches).table())
+
+
+def test_corrected_match_is_rerated(matches, make_bundle):
+    stale = ratings.team_ratings(make_bundle('v1', matches=matches))
+    corrected = matches.copy()
+    corrected.loc[corrected.index[-1], 'Match Winner'] = corrected['Team2 Name'].iloc[-1]
+    rebuilt = ratings.team_ratings(make_bundle('v2', matches=corrected))
+
+    expected = fresh(corrected).table()
+    pd.testing.assert_frame_equal(rebuilt.table(), expected)
+    assert not stale.table().equals(expected)
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import analytics
+import reports
+import warmup
+
+
+@pytest.fixture
+def bundle(data_dir):
+    return warmup.load_or_build('app', data_dir)
+
+
+def test_colliding_slugs_get_distinct_stems():
+    stems = reports.file_stems(['A. B. Smith', 'A B Smith', 'India', 'A-B Smith'])
+    assert stems['India'] == 'india'
+    colliding = [stems[name] for name in ('A. B. Smith', 'A B Smith', 'A-B Smith')]
+    assert len(set(colliding)) == 3
+    assert all(stem.startswith('a-b-smith-') for stem in colliding)
+    assert reports.file_stems(['A B Smith']) == {'A B Smith': 'a-b-smith'}
+
+
+def test_targets_assign_stems_before_only(bundle, monkeypatch):
+    monkeypatch.setattr(reports, 'top_players', lambda bundle, n: ['A. B. Smith', 'A B Smith'])
+    jobs = reports.targets(bundle, ('players',), only=['A B Smith'])
+    assert jobs == [('players', 'A B Smith', reports.file_stems(['A. B. Smith', 'A B Smith'])['A B Smith'])]
+    assert jobs[0][2] != 'a-b-smith'
+
+
+def test_export_rejects_shared_file_names(tmp_path):
+    jobs = [('players', 'A. B. Smith', 'a-b-smith'), ('players', 'A B Smith', 'a-b-smith')]
+    with pytest.raises(ValueError):
+        reports.export(jobs, out_dir=str(tmp_path), workers=1)
+
+
+def test_second_export_is_up_to_date(data_dir, bundle, tmp_path):
+    team = analytics.team_list(bundle)[0]
+    bowler = analytics.bowler_list(bundle)[0]
+    jobs = reports.targets(bundle, reports.KINDS, only=[team, bowler])
+    out_dir = str(tmp_path / 'out')
+    assert {name for _, name, _ in jobs} == {team, bowler}
+
+    first = reports.export(jobs, data_dir, out_dir, workers=1)
+    assert all(status.startswith('built') for status in first.values()), first
+    for kind, name, stem in jobs:
+        with open(os.path.join(out_dir, kind, f"{stem}.html"), encoding='utf-8') as fh:
+            assert f"{name} briefing" in fh.read()
+
+    second = reports.export(jobs, data_dir, out_dir, workers=1)
+    assert set(second.values()) == {'up to date'}
+    assert list(second) == [(kind, name) for kind, name, _ in jobs]
+
+    os.remove(os.path.join(out_dir, jobs[0][0], f"{jobs[0][2]}.html"))
+    third = reports.export(jobs, data_dir, out_dir, workers=1)
+    assert third[jobs[0][:2]].startswith('built') and third[jobs[1][:2]] == 'up to date'
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import results
+
+CASES = [
+    # text, result_type, winner, margin_runs, margin_wickets, balls_remaining, dls, revised_target
+    ('Australia won by 6 runs', 'runs', 'Australia', 6, None, None, False, False),
+    ('India won by 1 run', 'runs', 'India', 1, None, None, False, False),
+    ('Pakistan won by 1 wicket (with 1 ball remaining)', 'wickets', 'Pakistan', None, 1, 1, False, False),
+    ('England won by 6 wickets (with 29 balls remaining)', 'wickets', 'England', None, 6, 29, False, False),
+    ('South Africa won by 92 runs (D/L method)', 'runs', 'South Africa', 92, None, None, True, False),
+    ('Sri Lanka won by 4 wickets (with 21 balls remaining) (DLS method)',
+     'wickets', 'Sri Lanka', None, 4, 21, True, False),
+    ('West Indies won by 3 wickets (with 2 balls remaining) (revised target)',
+     'wickets', 'West Indies', None, 3, 2, False, True),
+    ('Match tied', 'tie', None, None, None, None, False, False),
+    ('Match tied (D/L method)', 'tie', None, None, None, None, True, False),
+    ('Match tied (England won on boundary count)', 'tie', 'England', None, None, None, False, False),
+    ('Match tied (New Zealand won the one-over eliminator)', 'tie', 'New Zealand', None, None, None, False, False),
+    ('No result', 'no result', None, None, None, None, False, False),
+    ('No result (abandoned with a toss)', 'no result', None, None, None, None, False, False),
+    ('England awarded the match (opposition conceded)', 'awarded', 'England', None, None, None, False, False),
+    ('Kenya won (lost fewer wickets)', 'other win', 'Kenya', None, None, None, False, False),
+    ('Scotland won by default', 'other win', 'Scotland', None, None, None, False, False),
+    (np.nan, None, None, None, None, None, False, False),
+]
+
+
+@pytest.fixture
+def parsed():
+    text = pd.Series([case[0] for case in CASES], index=range(10, 10 + len(CASES)))
+    return text, results.parse_results(text)
+
+
+@pytest.mark.parametrize('position, case', list(enumerate(CASES)), ids=[str(case[0]) for case in CASES])
+def test_parse_results(parsed, position, case):
+    _, frame = parsed
+    row = frame.iloc[position]
+    text, result_type, winner, runs, wickets, balls, dls, revised = case
+
+    assert (row['result_type'] if pd.notna(row['result_type']) else None) == result_type
+    assert (row['result_winner'] if pd.notna(row['result_winner']) else None) == winner
+    for column, expected in [('margin_runs', runs), ('margin_wickets', wickets), ('balls_remaining', balls)]:
+        assert (row[column] if pd.notna(row[column]) else None) == expected, column
+    assert row['dls'] == dls
+    assert row['revised_target'] == revised
+
+
+def test_every_case_parses(parsed):
+    text, frame = parsed
+    assert frame.index.equals(text.index)
+    assert list(frame.columns) == results.RESULT_COLUMNS
+    assert results.unparsed(text).empty
+
+
+def test_unparsed_lists_unknown_phrasings():
+    text = pd.Series(['India won by 5 runs', 'Match postponed', np.nan])
+    assert results.unparsed(text).tolist() == ['Match postponed']
+    assert pd.isna(results.parse_results(text)['result_type'].iloc[1])
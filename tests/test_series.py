@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+import series
+
+
+@pytest.fixture(autouse=True)
+def no_previous_rollup(monkeypatch):
+    monkeypatch.setattr(series, '_latest', None)
+    series.series_rollup.cache_clear()
+
+
+def fresh(matches):
+    rollup = series.SeriesRollup()
+    rollup.extend(matches)
+    return rollup
+
+
+def assert_same_rollup(rollup, expected):
+    assert sorted(rollup.series) == sorted(expected.series)
+    for name in expected.series:
+        pd.testing.assert_frame_equal(rollup.standings(series=name), expected.standings(series=name))
+        pd.testing.assert_frame_equal(rollup.top_performers(name), expected.top_performers(name))
+    pd.testing.assert_frame_equal(rollup.series_by_year(), expected.series_by_year())
+
+
+def test_appended_matches_extend_previous_rollup(matches, make_bundle):
+    previous = series.series_rollup(make_bundle('v1', matches=matches.iloc[:-1]))
+    before = previous.standings(series='Bilateral')
+    extended = series.series_rollup(make_bundle('v2', matches=matches))
+
+    assert extended.root.children['2010s'] is previous.root.children['2010s']
+    assert_same_rollup(extended, fresh(matches))
+    pd.testing.assert_frame_equal(previous.standings(series='Bilateral'), before)
+
+
+def test_corrected_match_rebuilds_rollup(matches, make_bundle):
+    series.series_rollup(make_bundle('v1', matches=matches))
+    corrected = matches.copy()
+    corrected.loc[corrected.index[-1], 'Team1 Runs Scored'] += 1000
+    rebuilt = series.series_rollup(make_bundle('v2', matches=corrected))
+
+    assert_same_rollup(rebuilt, fresh(corrected))
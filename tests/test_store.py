@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import store
+
+
+@pytest.fixture
+def frame():
+    n = 500
+    return pd.DataFrame({
+        'ints': np.arange(n, dtype='int64'),
+        'small': np.arange(n, dtype='int16'),
+        'floats': np.linspace(0, 1, n),
+        'flags': np.arange(n) % 3 == 0,
+        'dates': pd.date_range('2020-01-01', periods=n, freq='D'),
+        'text': [f"player {i}" for i in range(n)],
+        'objects': pd.Series([f"o{i}" if i % 7 else None for i in range(n)], dtype=object),
+        'teams': pd.Categorical(np.array(['India', 'Australia', 'England'])[np.arange(n) % 3]),
+        'nullable': pd.array([i if i % 5 else None for i in range(n)], dtype='Int64'),
+    }, index=pd.RangeIndex(100, 100 + n))
+
+
+def test_round_trip(tmp_path, frame):
+    path = store.dump({'frame': frame, 'array': np.arange(10.0), 'label': 'v1'}, str(tmp_path / 'x.store'))
+    loaded = store.load(path)
+
+    pd.testing.assert_frame_equal(loaded['frame'], frame)
+    np.testing.assert_array_equal(loaded['array'], np.arange(10.0))
+    assert loaded['label'] == 'v1'
+    # Out-of-band arrays are views of the read-only mapping
+    assert not loaded['array'].flags.writeable
+
+
+@pytest.mark.parametrize('damage', [
+    lambda raw: raw[:10],
+    lambda raw: raw[:len(raw) // 2],
+    lambda raw: raw[:-5],
+    lambda raw: raw[:8] + bytes(8) + raw[16:],
+])
+def test_damaged_file_raises_value_error(tmp_path, frame, damage):
+    path = store.dump({'frame': frame}, str(tmp_path / 'x.store'))
+    with open(path, 'rb') as fh:
+        raw = fh.read()
+    with open(path, 'wb') as fh:
+        fh.write(damage(raw))
+    with pytest.raises(ValueError):
+        store.load(path)
+
+
+def test_not_a_store_file(tmp_path):
+    path = tmp_path / 'x.store'
+    path.write_bytes(b'not a store')
+    with pytest.raises(ValueError):
+        store.load(str(path))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming import GroupNunique, GroupSum, aggregate, non_numeric, read_csv, stream_csv
+
+
+@pytest.fixture
+def bowling_csv(tmp_path):
+    rng = np.random.default_rng(4)
+    n = 1000
+    teams = np.array(['India', 'Australia', 'England', '12345'])
+    frame = pd.DataFrame({
+        'Match ID': rng.integers(1, 60, n),
+        'innings': rng.integers(1, 3, n),
+        'team': teams[rng.integers(0, 4, n)],
+        'bowler id': rng.integers(1, 40, n),
+        'wickets': rng.integers(0, 5, n).astype(float),
+        'conceded': rng.integers(0, 80, n).astype(float),
+    })
+    path = tmp_path / 'bowling.csv'
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def test_read_csv_matches_pandas(bowling_csv):
+    expected = pd.read_csv(bowling_csv)
+    expected = expected.loc[pd.to_numeric(expected['team'], errors='coerce').isna(), ['bowler id', 'wickets']]
+
+    chunked = read_csv(bowling_csv, ['bowler id', 'wickets'], [non_numeric('team')], chunksize=37)
+    pd.testing.assert_frame_equal(chunked, expected.reset_index(drop=True))
+
+
+def test_stream_csv_projects_after_filtering(bowling_csv):
+    chunks = list(stream_csv(bowling_csv, ['wickets'], [non_numeric('team')], chunksize=100))
+    assert len(chunks) > 1
+    assert all(list(chunk.columns) == ['wickets'] for chunk in chunks)
+
+
+def test_read_csv_of_no_matching_rows(bowling_csv):
+    empty = read_csv(bowling_csv, ['team', 'wickets'], [non_numeric('bowler id')])
+    assert empty.empty and list(empty.columns) == ['team', 'wickets']
+
+
+def test_builders_match_whole_table_groupby(bowling_csv):
+    frame = pd.read_csv(bowling_csv)
+    totals, matches, innings = aggregate(
+        stream_csv(bowling_csv, chunksize=29),
+        GroupSum('bowler id', ['wickets', 'conceded']),
+        GroupNunique('bowler id', 'Match ID'),
+        GroupNunique('bowler id', ['Match ID', 'innings']),
+    )
+
+    grouped = frame.groupby('bowler id')
+    pd.testing.assert_frame_equal(totals, grouped[['wickets', 'conceded']].sum())
+    pd.testing.assert_series_equal(matches, grouped['Match ID'].nunique(), check_names=False)
+    pd.testing.assert_series_equal(
+        innings, frame.drop_duplicates(['bowler id', 'Match ID', 'innings']).groupby('bowler id').size())
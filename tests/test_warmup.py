@@ -0,0 +1,60 @@
+import glob
+import os
+
+import pytest
+
+import analytics
+import warmup
+
+
+@pytest.fixture
+def snapshot(data_dir):
+    bundle = warmup.load_or_build('visuals', data_dir)
+    return bundle, warmup.snapshot_path('visuals', bundle.version, data_dir)
+
+
+def test_current_snapshot_is_loaded(data_dir, snapshot):
+    bundle, path = snapshot
+    assert os.path.exists(path)
+    loaded = warmup.load_snapshot('visuals', data_dir)
+    assert loaded is not None and loaded.version == bundle.version
+
+
+@pytest.mark.parametrize('keep', [0.5, 0.01])
+def test_truncated_snapshot_is_ignored(data_dir, snapshot, keep):
+    _, path = snapshot
+    with open(path, 'rb') as fh:
+        raw = fh.read()
+    with open(path, 'wb') as fh:
+        fh.write(raw[:int(len(raw) * keep)])
+    assert warmup.load_snapshot('visuals', data_dir) is None
+
+
+def test_corrupt_snapshot_is_ignored(data_dir, snapshot):
+    _, path = snapshot
+    with open(path, 'r+b') as fh:
+        fh.seek(-64, os.SEEK_END)
+        fh.write(bytes(64))
+    assert warmup.load_snapshot('visuals', data_dir) is None
+
+
+def test_other_format_is_ignored(data_dir, snapshot, monkeypatch):
+    monkeypatch.setattr(warmup, 'SNAPSHOT_FORMAT', warmup.SNAPSHOT_FORMAT + 1)
+    assert warmup.load_snapshot('visuals', data_dir) is None
+
+
+def test_changed_csv_invalidates_snapshot(data_dir, snapshot):
+    bundle, path = snapshot
+    csv = os.path.join(data_dir, analytics.DATA_FILES['matches'])
+    with open(csv, 'a') as fh:
+        fh.write('\n')
+
+    version = analytics.current_version(data_dir, analytics.MATCH_TABLES)
+    assert version != bundle.version
+    assert os.path.exists(path)
+    assert warmup.load_snapshot('visuals', data_dir) is None
+
+    rebuilt = warmup.load_or_build('visuals', data_dir)
+    assert rebuilt.version == version
+    assert glob.glob(warmup.snapshot_path('visuals', '*', data_dir)) == [
+        warmup.snapshot_path('visuals', version, data_dir)]
@@ -1,10 +1,14 @@
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import numpy as np
-import os
-import matplotlib.pyplot as plt 
-import seaborn as sns 
+
+import analytics
+import crossfilter
+import figures
+import leaderboards
+import match_cube
+import ratings
+import series
+import warmup
 
 
 # print("Hello World")
@@ -72,6 +76,11 @@ def load_dataset():
 #         # 
 # # load_dataset()
 
+# Match summary bundle shared by the Team Analysis and Visualizations pages
+@st.cache_resource(max_entries=1)
+def load_match_data(version):
+    return warmup.load_or_build("visuals")
+
 # Sidebar Navigation 
 # selected = option_menu("Main Menu", options=['Home','Upload Data','Player Analysis','Team Analysis','Visualizations'],menu_icon="trophy",icons=['house','cloud-upload','person','people','bar-chart'],default_index=0,orientation="horizontal")
 # selected
@@ -181,7 +190,7 @@ elif selected == "Team Analysis":
 
 #         # Filter data for the selected team
 #         df = df[df["Team"] == selected_team]
-    tab1, tab2, tab3 = st.tabs(["📈 Overview", "🏏 Batting", "🎯 Bowling"])
+    tab1, tab_ratings, tab_series, tab2, tab3 = st.tabs(["📈 Overview", "🏆 Ratings", "🏟️ Series", "🏏 Batting", "🎯 Bowling"])
 
     # ---------------- Overview Tab ----------------#
     with tab1:
@@ -199,15 +208,79 @@ elif selected == "Team Analysis":
             # col2.metric("Wins", wins)
             # col3.metric("Losses", losses)
             # col4.metric("Win %", f"{win_percentage}%")
+
+    # ---------------- Ratings Tab ----------------#
+    with tab_ratings:
+            import plotly.express as px
+
+            st.subheader("🏆 Elo Team Ratings")
+            elo = ratings.team_ratings(load_match_data(analytics.current_version(tables=analytics.MATCH_TABLES)))
+            if len(elo):
+                first_day, last_day = elo.dates[0], elo.dates[-1]
+                as_of = st.date_input("Ratings as of", value=pd.Timestamp.fromordinal(last_day).date(),
+                                      min_value=pd.Timestamp.fromordinal(first_day).date(),
+                                      max_value=pd.Timestamp.fromordinal(last_day).date())
+                table = elo.table(as_of)
+                st.dataframe(table, hide_index=True, use_container_width=True)
+
+                rating_teams = st.multiselect("Rating history for", table["team"].tolist(), default=table["team"].head(5).tolist())
+                if rating_teams:
+                    history = elo.history(rating_teams)
+                    fig = px.line(history, x="date", y="rating", color="team", title="Rating after Each Match",
+                                  labels={"date": "Date", "rating": "Elo Rating", "team": "Team"})
+                    fig.add_vline(x=pd.Timestamp(as_of).timestamp() * 1000, line_dash="dot", line_color="grey")
+                    st.plotly_chart(fig, use_container_width=True)
+
+    # ---------------- Series Tab ----------------#
+    with tab_series:
+            import plotly.express as px
+
+            match_data = load_match_data(analytics.current_version(tables=analytics.MATCH_TABLES))
+            st.subheader("🏟️ Series by Year")
+            trend = series.series_by_year(match_data)
+            fig = px.bar(trend, x="year", y="series", color="era", hover_data=["matches", "runs_per_match"],
+                         labels={"year": "Year", "series": "Series Played", "era": "Era"}, title="Series Played per Year")
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Drill down era -> year -> series; every table is read from the stored rollup nodes
+            st.subheader("🔎 Drill Down")
+            path = []
+            c1, c2, c3 = st.columns(3)
+            for column, label in zip((c1, c2, c3), ("Era", "Year", "Series")):
+                keys = series.drill_down(match_data, tuple(path))["key"].tolist()
+                choice = column.selectbox(label, ["All"] + keys, key=f"series_drill_{label.lower()}")
+                if choice == "All":
+                    break
+                path.append(choice)
+            below = series.drill_down(match_data, tuple(path))
+            if len(path) < 3:
+                st.dataframe(below, hide_index=True, use_container_width=True)
+            st.dataframe(series.standings(match_data, tuple(path)), hide_index=True, use_container_width=True)
+
+            st.subheader("🏆 Series Standings")
+            series_name = st.selectbox("Series", series.series_names(match_data), key="series_name")
+            col1, col2 = st.columns([3, 2])
+            col1.dataframe(series.standings(match_data, (), series_name), hide_index=True, use_container_width=True)
+            col2.markdown("**Most Player-of-the-Match Awards**")
+            col2.dataframe(series.top_performers(match_data, series_name, 10), hide_index=True, use_container_width=True)
     with tab2:
+            import plotly.express as px
+
             st. subheader(" Batting")
-            # n=10
-            top_scorers=df1.groupby('batsman')['Runs'].sum().nlargest(10)
-            top_scorers.plot(kind='barh',color='skyblue')
-            plt.title(f"Top 10 Run Scorers")
-            plt.xlabel('Runs')
-            plt.ylabel('Batsman')
-            plt.show()
+            # Match summaries carry runs per side only, so teams are ranked, not batsmen
+            match_data = load_match_data(analytics.current_version(tables=analytics.MATCH_TABLES))
+            col1, col2 = st.columns(2)
+            runs_scope = col1.radio("Scope", leaderboards.METRIC_SCOPES["team_runs"], format_func=leaderboards.SCOPE_LABELS.get,
+                                    horizontal=True, key="runs_scope")
+            runs_value = None
+            if runs_scope != "all":
+                runs_value = col2.selectbox(leaderboards.SCOPE_LABELS[runs_scope],
+                                            leaderboards.scope_values(match_data, "team_runs", runs_scope), key="runs_scope_value")
+            top_teams = leaderboards.leaderboard(match_data, "team_runs", runs_scope, runs_value, 10)
+            fig = px.bar(top_teams, x="runs", y="team", orientation="h", title="Top 10 Teams by Runs",
+                         labels={"runs": "Runs", "team": "Team"}, color_discrete_sequence=["skyblue"])
+            fig.update_layout(yaxis={"categoryorder": "total ascending"})
+            st.plotly_chart(fig, use_container_width=True)
 
 
 
@@ -238,33 +311,38 @@ elif selected == "Visualizations":
     st.title("📊 Visualizations") 
     #  Load dataset
     df = pd.read_csv("cleaned_odi_match_summary.csv")
-    @st.cache_data
-    def load_match_data():
-        df = pd.read_csv("cleaned_odi_match_summary.csv")
-        df["Match Date"] = pd.to_datetime(df["Match Date"], errors="coerce")
-        df["year"] = df["Match Date"].dt.year
-        return df
-
-    matches = load_match_data()
+    bundle = load_match_data(analytics.current_version(tables=analytics.MATCH_TABLES))
     # SIDEBAR FILTERS
 # ==========================
     st.sidebar.header("🔍 Filters")
-
-    years = sorted(matches["year"].dropna().unique())
-    teams = sorted(pd.concat([matches["Team1 Name"], matches["Team2 Name"], matches["Match Winner"]]).dropna().unique())
-    venues = sorted(matches["Match Venue (Stadium)"].dropna().unique())
-
-    selected_years = st.sidebar.multiselect("Select Years", years, default=years)
-    selected_teams = st.sidebar.multiselect("Select Teams", teams, default=teams)
-    selected_venues = st.sidebar.multiselect("Select Venues", venues, default=venues[:10])  # top 10 for usability
+    if st.sidebar.toggle("Filter in the browser", key="browser_filters",
+                         help="Send the match table once and filter by clicking the charts, with no reruns."):
+        import streamlit.components.v1 as components
+
+        st.caption("Click a bar to filter the other charts by it; click it again to clear.")
+        components.html(crossfilter.match_explorer(bundle), height=crossfilter.EXPLORER_HEIGHT)
+        st.stop()
+
+    options = analytics.match_filter_options(bundle)
+    years = options["years"]
+    teams = options["teams"]
+    venues = options["venues"]
+
+    # Every year and team but only the first ten venues, for usability
+    default_years, default_teams, default_venues = figures.match_filter_defaults(bundle)
+    selected_years = st.sidebar.multiselect("Select Years", years, default=default_years)
+    selected_teams = st.sidebar.multiselect("Select Teams", teams, default=default_teams)
+    selected_venues = st.sidebar.multiselect("Select Venues", venues, default=default_venues)
     # Apply filters
-    filtered = matches[(matches["year"].isin(selected_years)) &((matches["Team1 Name"].isin(selected_teams)) | (matches["Team2 Name"].isin(selected_teams)) | (matches["Match Winner"].isin(selected_teams))) &(matches["Match Venue (Stadium)"].isin(selected_venues))]
+    filtered = analytics.filter_matches(bundle, selected_years, selected_teams, selected_venues)
     st.write(f"### Showing {len(filtered)} matches after filtering")
 
     # 1. Matches per year
 # ==========================
     st.subheader("📅 Matches per Year")
-    matches_per_year = filtered.groupby("year")["Match ID"].nunique()
+    matches_per_year = analytics.matches_per_year(bundle, selected_years, selected_teams, selected_venues).set_index("year")["Match ID"]
+
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
     matches_per_year.plot(kind="bar", ax=ax)
@@ -309,51 +387,78 @@ elif selected == "Visualizations":
     # ax.set_ylabel("Team")
     # st.pyplot(fig)
 
-# import plotly.express as px
-
-st.subheader("📅 Matches per Year")
-
-matches_per_year = filtered.groupby("year")["Match ID"].nunique().reset_index()
-
-fig = px.bar(
-    matches_per_year,
-    x="year",
-    y="Match ID",
-    labels={"year": "Year", "Match ID": "Number of Matches"},
-    title="Matches per Year",
-    color="Match ID",  # optional for a color scale
-    text="Match ID"    # show values on bars
-)
-
-fig.update_traces(textposition="outside")  # place labels outside bars
-fig.update_layout(
-    xaxis_title="Year",
-    yaxis_title="Number of Matches",
-    bargap=0.2
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
 # ==========================
-# 3. Toss Decision Impact
+# Winning Margins
 # ==========================
-    # st.subheader("🎲 Toss Decision vs Match Result")
-    # fig, ax = plt.subplots()
-    # sns.countplot(data=filtered, x="Toss Winner Choice", hue="Match Result Text", ax=ax)
-    # plt.xticks(rotation=45)
-    # st.pyplot(fig)
+    import plotly.express as px
+
+    st.subheader("📏 Winning Margins")
+    breakdown = analytics.result_breakdown(bundle, selected_years, selected_teams, selected_venues)
+    cols = st.columns(len(breakdown))
+    for col, row in zip(cols, breakdown.itertuples(index=False)):
+        col.metric(row.result_type.title(), row.matches, help=f"{row.dls} decided by D/L or DLS")
+
+    margin_by = st.radio("Group margins by", ["team", "venue", "era"], horizontal=True)
+    margin_unit = st.radio("Wins by", ["runs", "wickets"], horizontal=True)
+    margins = analytics.margin_summary(bundle, margin_by, margin_unit, selected_years, selected_teams, selected_venues)
+    if margin_by != "era":
+        margins = margins.head(15)
+    fig = px.bar(
+        margins,
+        x=margin_by,
+        y="median",
+        hover_data=["matches", "mean", "max", "dls"],
+        labels={margin_by: margin_by.title(), "median": f"Median Margin ({margin_unit})"},
+        title=f"Median Winning Margin by {margin_by.title()} (wins by {margin_unit})",
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
 # ==========================
-# 4. Match Venues
+# Venue & Toss
 # ==========================
-    # st.subheader("🌍 Top Match Venues")
-    # venue_counts = filtered["Match Venue (Stadium)"].value_counts().head(15)
+    st.subheader("🏟️ Venue & Toss")
+    cube = match_cube.match_cube(bundle)
+    dimension_names = {
+        "country": "Country", "city": "City", "venue": "Venue", "year": "Year",
+        "toss_winner": "Toss Winner", "toss_decision": "Toss Decision", "batting_first": "Batting First",
+    }
+    metric_names = {
+        "matches": "Matches", "toss_win_pct": "Toss Winner Win %",
+        "bat_first_win_pct": "Batting First Win %", "avg_first_innings": "Avg First-Innings Score",
+    }
+    c1, c2, c3 = st.columns(3)
+    roll_up = c1.selectbox("Group by", match_cube.DIMENSIONS, format_func=dimension_names.get)
+    drill_down = c2.selectbox("Drill down by", [None] + [d for d in match_cube.DIMENSIONS if d != roll_up],
+                              format_func=lambda d: "—" if d is None else dimension_names[d])
+    metric = c3.selectbox("Metric", list(metric_names), format_func=metric_names.get)
+
+    by = (roll_up,) if drill_down is None else (roll_up, drill_down)
+    cells = cube.rollup(by, selected_years, selected_teams, selected_venues).reset_index()
+    # Keep the busiest groups so the chart stays readable at venue level
+    top_groups = cells.groupby(roll_up, dropna=False)["matches"].sum().nlargest(20).index
+    cells = cells[cells[roll_up].isin(top_groups)]
+    fig = px.bar(
+        cells,
+        x=roll_up,
+        y=metric,
+        color=drill_down,
+        barmode="group",
+        hover_data=["matches", "toss_win_pct", "bat_first_win_pct", "avg_first_innings"],
+        labels={**dimension_names, **metric_names},
+        title=f"{metric_names[metric]} by {dimension_names[roll_up]}",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(cells, use_container_width=True, hide_index=True)
+
+    # import plotly.express as px
+
+    st.subheader("📅 Matches per Year")
+
+    # Served from the figure cache: the default selection is warmed at startup
+    fig = figures.filtered_matches_per_year(bundle, selected_years, selected_teams, selected_venues)
+
+    st.plotly_chart(fig, use_container_width=True)
 
-    # fig, ax = plt.subplots()
-    # sns.barplot(x=venue_counts.values, y=venue_counts.index, ax=ax)
-    # ax.set_xlabel("Matches Hosted")
-    # ax.set_ylabel("Stadium")
-    # st.pyplot(fig)
 # st.title("🏏 ODI Matches Analysis Dashboard")
 
 
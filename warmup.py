@@ -0,0 +1,172 @@
+"""Startup warm-up and the versioned on-disk derived-state snapshot.
+
+Run ``python warmup.py`` before starting the server to load every dataset
+bundle, compute the selector indexes and build the static figures, and save it
+all as one snapshot file per dashboard under ``.cache/``.  Later processes,
+and the dashboards themselves through :func:`load_or_build`, restore that
+state with a single read instead of parsing CSVs and re-aggregating.
+Snapshots are :mod:`store` files, memory-mapped on load, so every worker
+process on a host shares one copy of the tables and indexes.
+
+Time-to-first-interactive (process start until the first full script run)
+is printed once per process by :func:`report_first_interactive`.
+"""
+import argparse
+import glob
+import os
+import pickle
+import time
+
+import analytics
+import crossfilter
+import figures
+import form
+import leaderboards
+import match_cube
+import player_search
+import ratings
+import series
+import similarity
+import store
+from figure_cache import DEFAULT_CACHE
+
+SNAPSHOT_DIR = '.cache'
+SNAPSHOT_FORMAT = 4
+
+# Per dashboard: tables to load, memoised indexes to precompute, static figures
+DASHBOARDS = {
+    'app': (
+        analytics.APP_TABLES,
+        (analytics.overview, analytics.bowler_list, analytics.dismissal_matrix, analytics.team_list,
+         analytics.match_ids, analytics.fow_metrics, similarity.player_index, similarity.filter_options,
+         crossfilter.team_columns, form.form_engine, player_search.search_indexes,
+         leaderboards.leaderboards),
+        figures.APP_STATIC,
+    ),
+    'visuals': (
+        analytics.MATCH_TABLES,
+        (analytics.match_filter_options, ratings.team_ratings, match_cube.match_cube, crossfilter.match_explorer,
+         series.series_rollup, series.series_names, leaderboards.leaderboards),
+        figures.VISUALS_STATIC,
+    ),
+}
+
+
+def _process_age():
+    """Seconds since this process started, from /proc where available."""
+    try:
+        with open('/proc/self/stat') as fh:
+            start_ticks = int(fh.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as fh:
+            uptime = float(fh.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+PROCESS_START = time.perf_counter() - _process_age()
+_reported = set()
+_sources = {}
+
+
+def snapshot_path(dashboard, version, data_dir='.'):
+    return os.path.join(data_dir, SNAPSHOT_DIR, f"{dashboard}-{version}.store")
+
+
+def build(dashboard, data_dir='.'):
+    """Load the bundle and compute its indexes and static figures."""
+    tables, indexes, static = DASHBOARDS[dashboard]
+    bundle = analytics.load_bundle(data_dir, tables)
+    results = {func.__name__: func(bundle) for func in indexes}
+    figures.warm(bundle, static)
+    return bundle, results
+
+
+def save_snapshot(dashboard, bundle, results, data_dir='.'):
+    """Write the snapshot for ``bundle.version`` and drop older ones."""
+    _, _, static = DASHBOARDS[dashboard]
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'bundle': bundle,
+        'indexes': results,
+        'figures': [(name, DEFAULT_CACHE.get_json(name, bundle.version)) for name in static],
+    }
+    path = snapshot_path(dashboard, bundle.version, data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    store.dump(snapshot, path)
+    for old in glob.glob(snapshot_path(dashboard, '*', data_dir)):
+        if old != path:
+            os.remove(old)
+    return path
+
+
+def load_snapshot(dashboard, data_dir='.'):
+    """Restore the snapshot for the current dataset version, or return None."""
+    tables, indexes, _ = DASHBOARDS[dashboard]
+    path = snapshot_path(dashboard, analytics.current_version(data_dir, tables), data_dir)
+    try:
+        snapshot = store.load(path)
+    except (FileNotFoundError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+
+    bundle = snapshot['bundle']
+    by_name = {func.__name__: func for func in indexes}
+    for name, result in snapshot['indexes'].items():
+        if name in by_name:
+            by_name[name].prime(bundle, (), result)
+    for name, text in snapshot['figures']:
+        if text is not None and (name, bundle.version) not in DEFAULT_CACHE:
+            DEFAULT_CACHE.put_json(name, bundle.version, text, 'plotly')
+    return bundle
+
+
+def load_or_build(dashboard, data_dir='.'):
+    """Bundle for ``dashboard``: from the snapshot if current, else built and saved."""
+    start = time.perf_counter()
+    bundle = load_snapshot(dashboard, data_dir)
+    if bundle is None:
+        bundle, results = build(dashboard, data_dir)
+        save_snapshot(dashboard, bundle, results, data_dir)
+        # Switch to the mapped copy so this process shares it with the others
+        bundle = load_snapshot(dashboard, data_dir) or bundle
+        _sources[dashboard] = f"built in {(time.perf_counter() - start) * 1000:.0f} ms"
+    else:
+        _sources[dashboard] = f"snapshot loaded in {(time.perf_counter() - start) * 1000:.0f} ms"
+    return bundle
+
+
+def report_first_interactive(dashboard):
+    """Print time-to-first-interactive once per process; returns it in ms."""
+    if dashboard in _reported:
+        return None
+    _reported.add(dashboard)
+    elapsed = (time.perf_counter() - PROCESS_START) * 1000
+    source = _sources.get(dashboard, "data not loaded")
+    print(f"[{dashboard}] time to first interactive: {elapsed:.0f} ms ({source})", flush=True)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm up the dashboards and write their snapshots.")
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('dashboards', nargs='*', metavar='DASHBOARD', help=f"any of {', '.join(DASHBOARDS)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.dashboards) - set(DASHBOARDS)
+    if unknown:
+        parser.error(f"unknown dashboard(s): {', '.join(sorted(unknown))}")
+
+    for dashboard in args.dashboards or DASHBOARDS:
+        start = time.perf_counter()
+        try:
+            bundle, results = build(dashboard, args.data_dir)
+        except FileNotFoundError as exc:
+            print(f"{dashboard}: skipped ({exc.filename} not found)")
+            continue
+        path = save_snapshot(dashboard, bundle, results, args.data_dir)
+        print(f"{dashboard}: snapshot {path} written in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()